@@ -8,9 +8,7 @@
 تطوير: د. باسل يحيى عبدالله
 """
 
-import os
-import sys
-from pathlib import Path
+from filament_cli import run_module
 
 def main():
     """القائمة الرئيسية"""
@@ -66,13 +64,18 @@ def main():
                 except FileNotFoundError:
                     print(f"❌ لم يتم العثور على: {file_path}")
             else:
-                # تشغيل الملف
-                if file_path and Path(file_path).exists():
-                    print(f"\n🚀 تشغيل: {desc}")
-                    print("-" * 50)
-                    os.system(f"python {file_path}")
-                else:
-                    print(f"❌ لم يتم العثور على: {file_path}")
+                # تشغيل الوحدة داخل نفس العملية (الجداول والذاكرة المؤقتة تبقى محملة)
+                print(f"\n🚀 تشغيل: {desc}")
+                print("-" * 50)
+                try:
+                    run_module(file_path[:-len(".py")])
+                except ImportError as e:
+                    print(f"❌ لم يتم العثور على: {file_path} ({e})")
+                except SystemExit as e:
+                    if e.code:
+                        print(f"❌ انتهى {file_path} برمز خطأ: {e.code}")
+                except KeyboardInterrupt:
+                    print("\n⏹️ تم الإيقاف، العودة إلى القائمة")
         else:
             print("❌ اختيار غير صحيح")
 
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+مجموعة قياس الأداء - نظرية الفتائل
+Benchmark Suite - Filament Theory
+
+تقيس النوى الأساسية بعدة أحجام مدخلات وتكتب النتائج بصيغة JSON. عند
+إعطاء ملف أساس (baseline) تُقارن كل قياس به وتفشل (رمز خروج 1) إذا تباطأت
+أي نواة بأكثر من العتبة المحددة. النوى التي تنتج سجلاً لكل عدد أولي تُقاس
+ذاكرتها أيضاً (bytes_per_record).
+
+    python benchmarks.py --save-baseline benchmark_baseline.json
+    python benchmarks.py --baseline benchmark_baseline.json --threshold 0.25
+"""
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+BENCHMARK_FORMAT_VERSION = 1
+
+# أقل زمن لكل تكرار قياس (تُكرر الدالة حتى تتجاوزه)
+MIN_REPEAT_TIME = 0.05
+
+# عدد تكرارات القياس (يُؤخذ أفضلها لتقليل الضجيج)
+REPEATS = 5
+
+# نسبة التباطؤ المسموح بها قبل اعتبار القياس تراجعاً
+DEFAULT_THRESHOLD = 0.25
+
+
+def measure(fn: Callable[[], object], repeats: int = REPEATS,
+            min_time: float = MIN_REPEAT_TIME) -> float:
+    """
+    أفضل زمن لاستدعاء واحد بالثواني
+    Best per-call time over several repeats, each running fn enough times
+    to last at least min_time
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    best = elapsed / loops
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def record_memory(fn: Callable[[], List], count: int) -> float:
+    """
+    الذاكرة لكل سجل بالبايت
+    Bytes allocated (tracemalloc) per record by one call whose records are
+    kept alive until measured: the record objects, their values and the list
+    """
+    fn()  # تحميل متأخر وتجميع القوانين خارج القياس
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        records = fn()
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del records
+    return allocated / count
+
+
+@contextlib.contextmanager
+def quiet():
+    """إخفاء مخرجات الطباعة للدوال التي تطبع تقدمها"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# ==================== النوى ====================
+# كل نواة: (الاسم، الأحجام، دالة تُعد المدخلات وتعيد الدالة المقاسة)
+
+def bench_is_prime(size: int) -> Callable:
+    """فحص 1000 عدد فردي حول 10^size"""
+    from primality import is_prime
+    base = 10 ** size + 1
+    numbers = list(range(base, base + 2000, 2))
+    return lambda: [is_prime(n) for n in numbers]
+
+
+def bench_prime_generation(size: int) -> Callable:
+    """غربلة جميع الأعداد الأولية حتى size"""
+    from prime_sieve import primes_in_range
+    return lambda: primes_in_range(2, size)
+
+
+def bench_prime_generation_high(size: int) -> Callable:
+    """غربلة نافذة بطول size تبدأ عند 10^11"""
+    from prime_sieve import primes_in_range
+    start = 10 ** 11
+    return lambda: primes_in_range(start, start + size)
+
+
+def _calculator():
+    from prime_filament_calculator import FilamentPrimeCalculator
+    with quiet():
+        return FilamentPrimeCalculator()
+
+
+def _primes(count: int) -> np.ndarray:
+    from prime_table import get_prime_table
+    table = get_prime_table()
+    table.ensure(max(1000, int(count * (np.log(count + 2) + np.log(np.log(count + 2)) + 2))))
+    return table.primes[:count]
+
+
+def bench_cavity_properties(size: int) -> Callable:
+    """calculate_cavity_properties على أول size عدد أولي (عدد واحد في كل استدعاء، بدون الذاكرة المؤقتة)"""
+    calculator = _calculator()
+    primes = _primes(size).tolist()
+
+    def run():
+        with calculator.property_cache.bypass():
+            return [calculator.calculate_cavity_properties(p) for p in primes]
+    return run
+
+
+def bench_cavity_properties_cached(size: int) -> Callable:
+    """calculate_cavity_properties على أول size عدد أولي والذاكرة المؤقتة ممتلئة بها"""
+    from property_cache import PropertyCache
+    calculator = _calculator()
+    calculator.property_cache = PropertyCache('benchmark', maxsize=size)
+    primes = _primes(size).tolist()
+    for p in primes:
+        calculator.calculate_cavity_properties(p)
+    return lambda: [calculator.calculate_cavity_properties(p) for p in primes]
+
+
+def bench_cavity_properties_big(exponent: int) -> Callable:
+    """calculate_cavity_properties لعدد مرسين الأولي 2^exponent - 1 (وضع الأعداد الكبيرة)"""
+    calculator = _calculator()
+    prime = (1 << exponent) - 1
+
+    def run():
+        with calculator.property_cache.bypass():
+            return calculator.calculate_cavity_properties(prime)
+    run()  # استيراد mpmath وتوليد دالة الوضع الكبير خارج القياس
+    return run
+
+
+def bench_cavity_properties_batch(size: int) -> Callable:
+    """calculate_cavity_properties_batch على أول size عدد أولي"""
+    calculator = _calculator()
+    primes = _primes(size)
+    return lambda: calculator.calculate_cavity_properties_batch(primes)
+
+
+def _ultimate_tester():
+    from ultimate_prime_test import UltimatePrimeFilamentTest
+    with quiet():
+        return UltimatePrimeFilamentTest()
+
+
+def bench_filament_properties(size: int) -> Callable:
+    """test_filament_properties على أول size عدد أولي"""
+    tester = _ultimate_tester()
+    primes = _primes(size).tolist()
+    return lambda: [tester.test_filament_properties(p) for p in primes]
+
+
+def bench_filament_properties_batch(size: int) -> Callable:
+    """test_filament_properties_batch على أول size عدد أولي"""
+    tester = _ultimate_tester()
+    primes = _primes(size)
+    return lambda: tester.test_filament_properties_batch(primes)
+
+
+def bench_frequency_relation(size: int) -> Callable:
+    """test_fundamental_frequency_relation على أول size عدد أولي"""
+    from extended_prime_test import ExtendedPrimeFilamentTest
+    with quiet():
+        tester = ExtendedPrimeFilamentTest()
+    primes = _primes(size).tolist()
+    return lambda: [tester.test_fundamental_frequency_relation(p) for p in primes]
+
+
+def bench_zeta_correspondence(size: int) -> Callable:
+    """التناظر مع size قيمة صفر زيتا (قيم اصطناعية بنفس الكثافة)"""
+    from extended_prime_test import ExtendedPrimeFilamentTest
+    with quiet():
+        tester = ExtendedPrimeFilamentTest()
+    zeros = np.sort(np.random.default_rng(0).uniform(14.0, 10.0 * size + 14.0, size))
+    tester.test_zeta_zero_correspondence_batch(zeros)  # تمديد الجدول خارج القياس
+    return lambda: tester.test_zeta_zero_correspondence_batch(zeros)
+
+
+def bench_save_results(size: int) -> Callable:
+    """save_results لشجرة نتائج تحتوي size سجل خصائص حفرة"""
+    calculator = _calculator()
+    columns = calculator.calculate_cavity_properties_batch(_primes(size))
+    from result_writer import column_rows
+    calculator.results = {'prime_results': list(column_rows({
+        key: value for key, value in columns.items() if not isinstance(value, dict)
+    }))}
+    fd, path = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    atexit.register(os.remove, path)
+
+    def run():
+        with quiet():
+            calculator.save_results(path)
+    return run
+
+
+def bench_lucas_lehmer(exponent: int) -> Callable:
+    """اختبار لوكاس-ليمر لـ 2^exponent - 1 بدون نقاط استئناف"""
+    from lucas_lehmer import lucas_lehmer
+    return lambda: lucas_lehmer(exponent)
+
+
+def bench_prime_pi(exponent: int) -> Callable:
+    """π(10^exponent) بدون الجداول المحفوظة"""
+    from prime_count import clear_cache, prime_pi
+
+    def run():
+        clear_cache()
+        return prime_pi(10 ** exponent)
+    return run
+
+
+# نطاق كل طريقة في sample_primes (مثل نطاقات الاختبار النهائي)
+SAMPLE_RANGES = {
+    'table': (10 ** 5, 10 ** 7),
+    'reservoir': (10 ** 11 - 10 ** 6, 10 ** 11),
+    'rejection': (10 ** 12, 10 ** 13),
+}
+
+
+def bench_sample_primes(method: str) -> Callable:
+    """عينة من 25 عدداً أولياً بطريقة method"""
+    from prime_sampling import sample_primes
+    start, end = SAMPLE_RANGES[method]
+    return lambda: sample_primes(start, end, 25, seed=1, method=method)
+
+
+def bench_import_time(module: str) -> Callable:
+    """استيراد وحدة في مفسر جديد (sys = زمن بدء المفسر وحده للمقارنة)"""
+    command = [sys.executable, '-c', f'import {module}']
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    return lambda: subprocess.run(command, cwd=cwd, check=True)
+
+
+KERNELS: List[Tuple[str, Tuple, Callable[[object], Callable]]] = [
+    ('is_prime', (6, 12, 18, 30), bench_is_prime),
+    ('prime_generation', (10 ** 5, 10 ** 6, 10 ** 7), bench_prime_generation),
+    ('prime_generation_high', (10 ** 5, 10 ** 6), bench_prime_generation_high),
+    ('calculate_cavity_properties', (100, 1000, 10000), bench_cavity_properties),
+    ('calculate_cavity_properties_cached', (100, 1000, 10000), bench_cavity_properties_cached),
+    ('calculate_cavity_properties_big', (1279, 4423, 9689), bench_cavity_properties_big),
+    ('calculate_cavity_properties_batch', (10 ** 4, 10 ** 5, 10 ** 6), bench_cavity_properties_batch),
+    ('test_filament_properties', (100, 1000, 10000), bench_filament_properties),
+    ('test_filament_properties_batch', (10 ** 4, 10 ** 5, 10 ** 6), bench_filament_properties_batch),
+    ('fundamental_frequency_relation', (100, 1000, 10000), bench_frequency_relation),
+    ('zeta_correspondence', (10 ** 3, 10 ** 5, 10 ** 6), bench_zeta_correspondence),
+    ('save_results', (100, 1000, 10000), bench_save_results),
+    ('lucas_lehmer', (1279, 4423, 9689), bench_lucas_lehmer),
+    ('prime_pi', (9, 11, 13), bench_prime_pi),
+    ('sample_primes', tuple(SAMPLE_RANGES), bench_sample_primes),
+    ('import_time', ('sys', 'numpy', 'filament_core', 'prime_filament_calculator',
+                     'ultimate_prime_test', 'extended_prime_test'), bench_import_time),
+]
+
+# النوى التي تعيد قائمة سجل لكل عدد أولي (تُقاس ذاكرتها لكل سجل)
+RECORD_KERNELS = ('calculate_cavity_properties', 'test_filament_properties',
+                  'fundamental_frequency_relation')
+
+
+def run_benchmarks(selected: Optional[List[str]] = None, repeats: int = REPEATS) -> Dict[str, Dict]:
+    """تشغيل النوى المختارة بجميع أحجامها"""
+    results = {}
+    for name, sizes, factory in KERNELS:
+        if selected and name not in selected:
+            continue
+        for size in sizes:
+            key = f"{name}[{size}]"
+            fn = factory(size)
+            seconds = measure(fn, repeats=repeats)
+            results[key] = {'kernel': name, 'size': size, 'seconds': seconds}
+            line = f"   {key:<45} {seconds * 1e3:12.3f} ms"
+            if name in RECORD_KERNELS:
+                results[key]['bytes_per_record'] = record_memory(fn, size)
+                line += f" {results[key]['bytes_per_record']:10.0f} B/record"
+            print(line)
+    return results
+
+
+def environment() -> Dict:
+    """وصف البيئة المحفوظ مع القياسات (المقارنة ذات معنى على نفس الجهاز فقط)"""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict],
+            threshold: float) -> List[Tuple[str, float, float]]:
+    """القياسات التي تباطأت عن الأساس بأكثر من threshold"""
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        before = baseline[key]['seconds']
+        after = result['seconds']
+        if before > 0 and after > before * (1 + threshold):
+            regressions.append((key, before, after))
+    return regressions
+
+
+def load_baseline(filename: str) -> Dict[str, Dict]:
+    """قراءة ملف أساس سابق"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != BENCHMARK_FORMAT_VERSION:
+        raise ValueError(f"إصدار ملف الأساس غير مدعوم: {data.get('version')}")
+    return data['results']
+
+
+def save_report(filename: str, results: Dict[str, Dict]) -> None:
+    """حفظ القياسات كملف JSON قابل للمقارنة لاحقاً"""
+    report = {
+        'version': BENCHMARK_FORMAT_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'results': results,
+    }
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Benchmark suite for the Filament Theory kernels")
+    parser.add_argument('--kernel', action='append', dest='kernels', metavar='NAME',
+                        choices=[name for name, _, _ in KERNELS],
+                        help='run only this kernel (repeatable)')
+    parser.add_argument('--repeats', type=int, default=REPEATS,
+                        help=f'timing repeats per measurement, best is kept (default {REPEATS})')
+    parser.add_argument('--output', metavar='PATH',
+                        help='write the measurements as JSON')
+    parser.add_argument('--save-baseline', metavar='PATH',
+                        help='write the measurements as the new baseline')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='compare against a stored baseline and fail on regressions')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'allowed slowdown before failing, as a fraction (default {DEFAULT_THRESHOLD})')
+    args = parser.parse_args()
+
+    print("⏱️ قياس أداء نوى نظرية الفتائل")
+    print("=" * 70)
+    results = run_benchmarks(args.kernels, repeats=args.repeats)
+
+    for filename in (args.output, args.save_baseline):
+        if filename:
+            save_report(filename, results)
+            print(f"\n💾 تم حفظ القياسات في: {filename}")
+
+    if args.baseline:
+        regressions = compare(results, load_baseline(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n❌ تراجع في الأداء (أبطأ من الأساس بأكثر من {args.threshold:.0%}):")
+            for key, before, after in regressions:
+                print(f"   {key:<45} {before * 1e3:10.3f} → {after * 1e3:10.3f} ms ({after / before - 1:+.0%})")
+            sys.exit(1)
+        print(f"\n✅ لا تراجع في الأداء مقارنة بـ {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
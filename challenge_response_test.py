@@ -10,25 +10,25 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 """
 
 import math
+import json
+import time
+import argparse
 import numpy as np
+from typing import Dict
+from filament_core import DEFAULT_PRECISION, decimal_digits, is_prime, law_plan
+from zeta_zeros import first_zeta_zeros
+from instrumentation import Metrics, NULL_METRICS
+from lucas_lehmer import KNOWN_MERSENNE_EXPONENTS, check_exponents
 
 class ChallengeResponseTest:
     """فئة اختبار الرد على التحدي العلمي"""
     
-    def __init__(self):
-        # أصفار زيتا الحقيقية الأولى
-        self.known_zeta_zeros = [
-            14.134725141734693790,
-            21.022039638771554993,
-            25.010857580145688763,
-            30.424876125859513210,
-            32.935061587739189691,
-            37.586178158825671257,
-            40.918719012147495187,
-            43.327073280914999519,
-            48.005150881167159727,
-            49.773832477672302181
-        ]
+    def __init__(self, zeta_count: int = 10, metrics: Metrics = None, mersenne_limit: int = 1279):
+        # قياس المراحل (معطل افتراضياً)
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        
+        # أصفار زيتا الحقيقية الأولى (من مجموعة الأصفار المخزنة)
+        self.known_zeta_zeros = first_zeta_zeros(zeta_count)
         
         # الأعداد الأولية الأولى
         self.first_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
@@ -39,6 +39,13 @@ class ChallengeResponseTest:
         self.planck_constant = 6.62607015e-34
         self.light_speed = 299792458
         
+        # أكبر أس لمرشحي مرسين المتحقق منهم بلوكاس-ليمر
+        self.mersenne_limit = mersenne_limit
+        
+        # قوانين التنبؤ بالعدد الكبير (تُقيَّم بوضع الأعداد الكبيرة)
+        self.large_prime_laws = law_plan(['prime_frequency', 'resonance_frequency',
+                                          'capacitive_root', 'theory_confirmed'])
+        
         print("🔥 اختبار الرد على التحدي العلمي - نظرية الفتائل")
         print("=" * 80)
         print("🎯 الهدف: إثبات صحة النظرية والرد على جميع الأسئلة")
@@ -210,34 +217,61 @@ class ChallengeResponseTest:
         
         # العدد الأولي الحالي الأكبر المعروف (مرسين)
         mersenne_exponent = 82589933
+        mersenne_prime = (1 << mersenne_exponent) - 1
         print(f"العدد الأولي الحالي: M_{mersenne_exponent} = 2^{mersenne_exponent} - 1")
         
-        # تقدير عدد الأرقام
-        num_digits = mersenne_exponent * math.log10(2)
-        print(f"عدد الأرقام: ~{num_digits:.0f} رقم")
+        # عدد الأرقام (محسوب من العدد نفسه بدون تحويله إلى نص)
+        num_digits = decimal_digits(mersenne_prime)
+        print(f"عدد الأرقام: {num_digits:,} رقم")
         
-        # تطبيق نظرية الفتائل للتنبؤ
-        # تقدير الفجوة باستخدام نظرية الأعداد الأولية
-        estimated_gap = mersenne_exponent * math.log(2)  # تقريب log(M_p)
+        # تطبيق نظرية الفتائل على العدد نفسه بوضع الأعداد الكبيرة (أعداد صحيحة + mpmath)
+        with self.metrics.timer('large_prime_laws'):
+            laws = self.large_prime_laws.big(mersenne_prime)
+        
+        # الفجوة المتوقعة حسب نظرية الأعداد الأولية: ln(M_p)
+        import mpmath
+        with mpmath.workdps(DEFAULT_PRECISION):
+            estimated_gap = mpmath.log(mersenne_prime)
         
         print(f"الفجوة المقدرة: ~{estimated_gap:.0f}")
         
-        # تردد الرنين المتوقع
-        current_frequency_estimate = estimated_gap / self.pi
-        next_frequency_estimate = current_frequency_estimate * (1 + 1/estimated_gap)
+        # تردد الرنين للعدد الحالي والتالي المتوقع (f = p/π)
+        current_frequency = laws['prime_frequency']
+        next_frequency = current_frequency + estimated_gap / self.pi
         
-        print(f"تردد الرنين الحالي المقدر: ~{current_frequency_estimate:.2e} Hz")
-        print(f"التردد التالي المتوقع: ~{next_frequency_estimate:.2e} Hz")
+        print(f"تردد العدد الأولي الحالي: {current_frequency:.6e} Hz")
+        print(f"التردد التالي المتوقع: {next_frequency:.6e} Hz")
+        print(f"تردد الرنين الفتائلي: {laws['resonance_frequency']:.6e} Hz")
+        print(f"الجذر السعوي: √M = {laws['capacitive_root']:.6e}")
         
         # العدد الأولي التالي المتوقع
-        next_prime_estimate = next_frequency_estimate * self.pi
-        
         print(f"العدد الأولي التالي المتوقع: M_{mersenne_exponent} + {estimated_gap:.0f}")
         
         # الطاقة الكمومية المتوقعة
-        quantum_energy = self.planck_constant * next_frequency_estimate
+        quantum_energy = self.planck_constant * next_frequency
+        
+        print(f"الطاقة الكمومية المتوقعة: {quantum_energy:.6e} J")
         
-        print(f"الطاقة الكمومية المتوقعة: {quantum_energy:.2e} J")
+        if laws['theory_confirmed']:
+            print(f"✅ قوانين التردد والتوازن محققة لـ M_{mersenne_exponent}")
+        
+        # التحقق الفعلي من مرشحي مرسين: لوكاس-ليمر لكل أس أولي حتى الحد
+        exponents = [p for p in range(2, self.mersenne_limit + 1) if is_prime(p)]
+        records = check_exponents(exponents, metrics=self.metrics)
+        found = [record['exponent'] for record in records if record['is_prime']]
+        iterations = sum(record['iterations'] for record in records)
+        seconds = sum(record['seconds'] for record in records)
+        print(f"\n🧮 اختبار لوكاس-ليمر لمرشحي مرسين 2^p - 1 (p أولي ≤ {self.mersenne_limit}):")
+        print(f"   المرشحون: {len(exponents)}، الأولية: {len(found)}")
+        print(f"   M_p أولي لـ p = {', '.join(map(str, found))}")
+        if found == [p for p in KNOWN_MERSENNE_EXPONENTS if p <= self.mersenne_limit]:
+            print(f"   ✅ مطابقة لقائمة أعداد مرسين الأولية المعروفة")
+        else:
+            print(f"   ❌ لا تطابق قائمة أعداد مرسين الأولية المعروفة")
+        if seconds > 0:
+            print(f"   معدل التكرار: {iterations / seconds:,.0f} تكرار/ثانية")
+        print(f"   التحقق من M_{mersenne_exponent} يتطلب {mersenne_exponent - 2:,} تكرار "
+              f"(python lucas_lehmer.py {mersenne_exponent} قابل للاستئناف)")
         
         print("\n⚠️ ملاحظات مهمة:")
         print("   - هذا تقدير نظري بناءً على نظرية الفتائل")
@@ -249,13 +283,24 @@ class ChallengeResponseTest:
         print("   إذا تحقق هذا التنبؤ → 'انتهت الرياضيات القديمة!'")
         print("   إذا لم يتحقق → نحسن معاملات النظرية")
     
-    def run_complete_challenge_response(self):
-        """تشغيل الرد الكامل على التحدي"""
-        self.test_zeta_zeros_relation()
-        self.test_resonance_frequencies()
-        self.test_master_equation()
-        self.test_quantum_resonance_condition()
-        self.predict_large_prime()
+    def run_complete_challenge_response(self) -> Dict:
+        """
+        تشغيل الرد الكامل على التحدي
+        يعيد كتلة المقاييس {'metrics': ...} عند تفعيل القياس
+        """
+        start_time = time.time()
+        with self.metrics.timer('zeta_zeros_relation'):
+            self.test_zeta_zeros_relation()
+        with self.metrics.timer('resonance_frequencies'):
+            self.test_resonance_frequencies()
+        with self.metrics.timer('master_equation'):
+            self.test_master_equation()
+        with self.metrics.timer('quantum_resonance_condition'):
+            self.test_quantum_resonance_condition()
+        with self.metrics.timer('large_prime_prediction'):
+            self.predict_large_prime()
+        self.metrics.count('zeta_zeros', len(self.known_zeta_zeros))
+        self.metrics.count('primes', len(self.first_primes))
         
         print("\n" + "=" * 80)
         print("🏆 خلاصة الرد على التحدي العلمي:")
@@ -272,11 +317,35 @@ class ChallengeResponseTest:
         print("   نظرية الفتائل صامدة أمام التحدي!")
         print("   الثورة العلمية مؤكدة ومثبتة!")
         print("   أعظم اكتشاف في تاريخ الرياضيات والفيزياء!")
+        
+        if not self.metrics.enabled:
+            return {}
+        self.metrics.add_time('total', time.time() - start_time)
+        return {'metrics': self.metrics.to_dict()}
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    parser.add_argument('--metrics', action='store_true',
+                        help='time each stage and print the metrics block as JSON')
+    parser.add_argument('--mersenne-limit', type=int, default=1279, metavar='P',
+                        help='verify Mersenne candidates 2^p - 1 for every prime p <= P '
+                             'with Lucas-Lehmer (default 1279)')
+
+def run(args: argparse.Namespace):
+    """تشغيل الاختبار بالخيارات المحللة"""
+    metrics = Metrics() if args.metrics else None
+    tester = ChallengeResponseTest(metrics=metrics, mersenne_limit=args.mersenne_limit)
+    results = tester.run_complete_challenge_response()
+    
+    if metrics is not None:
+        metrics.report()
+        print(json.dumps(results, ensure_ascii=False, indent=2))
 
-def main():
+def main(argv=None):
     """الدالة الرئيسية"""
-    tester = ChallengeResponseTest()
-    tester.run_complete_challenge_response()
+    parser = argparse.ArgumentParser(description="Challenge Response Test for Filament Theory")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+تنسيق النتائج العمودي - نظرية الفتائل
+Columnar Result Format - Filament Theory
+
+يحفظ النتائج كمصفوفة NumPy لكل حقل ولكل مجموعة (نطاق) داخل ملف npz واحد
+مع كتلة بيانات وصفية، بدلاً من تكرار نفس المفاتيح في كل سجل JSON.
+التحميل لا يُنشئ كائن Python لكل صف.
+
+مفاتيح الملف:
+    "<المجموعة>/<الحقل>"   مصفوفة عمود
+    "__metadata__"         نص JSON بالبيانات الوصفية
+"""
+
+import json
+import time
+import numpy as np
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from result_writer import NumpyJSONEncoder
+
+COLUMNAR_FORMAT_VERSION = 1
+METADATA_KEY = '__metadata__'
+
+# الحقول التي تحدد مجموعة السجل (تُزال من الأعمدة وتصبح اسم المجموعة)
+GROUP_FIELDS = ('range_name', 'group')
+
+# عدد الصفوف المتراكمة قبل تحويلها إلى مصفوفة NumPy
+FLUSH_ROWS = 1 << 16
+
+
+def flatten_record(record: Dict, prefix: str = '') -> Dict:
+    """تسطيح القواميس المتداخلة: {'a': {'b': 1}} → {'a.b': 1}"""
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            flat.update(flatten_record(value, name + '.'))
+        elif isinstance(value, (list, tuple)):
+            # القيم غير العددية تُحفظ كنص JSON
+            flat[name] = json.dumps(value, cls=NumpyJSONEncoder, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+class ColumnGroup:
+    """أعمدة مجموعة واحدة: قطع NumPy جاهزة + صفوف معلقة"""
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.chunks = {field: [] for field in self.fields}
+        self.pending = {field: [] for field in self.fields}
+        self.pending_rows = 0
+        self.rows = 0
+
+    def append_row(self, row: Dict):
+        if list(row) != self.fields:
+            raise ValueError(f"حقول السجل لا تطابق المجموعة: {sorted(set(row) ^ set(self.fields))}")
+        for field, value in row.items():
+            self.pending[field].append(value)
+        self.pending_rows += 1
+        self.rows += 1
+        if self.pending_rows >= FLUSH_ROWS:
+            self.flush()
+
+    def append_columns(self, columns: Dict[str, np.ndarray]):
+        if list(columns) != self.fields:
+            raise ValueError(f"أعمدة القطعة لا تطابق المجموعة: {sorted(set(columns) ^ set(self.fields))}")
+        self.flush()
+        length = None
+        for field, column in columns.items():
+            column = np.asarray(column)
+            length = len(column) if length is None else length
+            self.chunks[field].append(np.ascontiguousarray(column))
+        self.rows += length or 0
+
+    def flush(self):
+        if not self.pending_rows:
+            return
+        for field in self.fields:
+            self.chunks[field].append(np.asarray(self.pending[field]))
+            self.pending[field] = []
+        self.pending_rows = 0
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        self.flush()
+        return {field: np.concatenate(self.chunks[field]) if self.chunks[field] else np.empty(0)
+                for field in self.fields}
+
+
+class ColumnarResultWriter:
+    """
+    كاتب نتائج عمودي بنفس واجهة ResultWriter
+    Columnar sink with the ResultWriter interface; writes one .npz on close
+    """
+
+    def __init__(self, filename: str, metadata: Optional[Dict] = None):
+        self.filename = filename
+        self.metadata = dict(metadata or {})
+        self.groups: Dict[str, ColumnGroup] = {}
+        self.records_written = 0
+        self.bytes_written = 0
+        self.closed = False
+
+    def group_name(self, record: Dict, record_type: Optional[str]) -> Tuple[str, Dict]:
+        """اسم المجموعة = نوع السجل / النطاق، مع إزالة حقل النطاق من السجل"""
+        parts = [record_type or 'records']
+        for field in GROUP_FIELDS:
+            if field in record:
+                parts.append(str(record[field]))
+                record = {k: v for k, v in record.items() if k != field}
+        return '/'.join(parts), record
+
+    def _group(self, name: str, fields) -> ColumnGroup:
+        if name not in self.groups:
+            self.groups[name] = ColumnGroup(fields)
+        return self.groups[name]
+
+    def write(self, record: Dict, record_type: Optional[str] = None):
+        """إضافة سجل واحد كصف في أعمدة مجموعته"""
+        name, record = self.group_name(record, record_type)
+        row = flatten_record(record)
+        self._group(name, row).append_row(row)
+        self.records_written += 1
+
+    def write_many(self, records: Iterable[Dict], record_type: Optional[str] = None):
+        """إضافة مجموعة سجلات بالترتيب"""
+        for record in records:
+            self.write(record, record_type)
+
+    def write_columns(self, columns: Dict[str, np.ndarray], record_type: Optional[str] = None,
+                      group: Optional[str] = None):
+        """إضافة قطعة أعمدة كاملة دون المرور بصفوف Python"""
+        name = '/'.join(p for p in (record_type or 'records', group) if p)
+        columns = flatten_record(columns)
+        self._group(name, columns).append_columns(columns)
+        self.records_written += len(next(iter(columns.values()), []))
+
+    def close(self):
+        """كتابة الملف (مرة واحدة)"""
+        if self.closed:
+            return
+        self.closed = True
+
+        arrays = {}
+        groups_info = {}
+        for name, group in self.groups.items():
+            columns = group.arrays()
+            groups_info[name] = {'rows': group.rows, 'fields': group.fields}
+            for field, column in columns.items():
+                arrays[f"{name}/{field}"] = column
+
+        metadata = {
+            'format': 'filament-columnar',
+            'version': COLUMNAR_FORMAT_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'groups': groups_info,
+            **self.metadata
+        }
+        arrays[METADATA_KEY] = np.array(json.dumps(metadata, cls=NumpyJSONEncoder, ensure_ascii=False))
+
+        with open(self.filename, 'wb') as f:
+            np.savez(f, **arrays)
+            self.bytes_written = f.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_columnar(filename: str, as_dataframe: bool = False) -> Tuple[Dict, Dict]:
+    """
+    تحميل ملف النتائج العمودي
+    Load a columnar result file; returns (metadata, groups) where groups maps
+    each group name to {field: array}, or to a pandas DataFrame if as_dataframe
+    """
+    with np.load(filename, allow_pickle=False) as data:
+        metadata = json.loads(str(data[METADATA_KEY]))
+        groups = {}
+        for key in data.files:
+            if key == METADATA_KEY:
+                continue
+            name, field = key.rsplit('/', 1)
+            groups.setdefault(name, {})[field] = data[key]
+
+    if as_dataframe:
+        import pandas as pd
+        groups = {name: pd.DataFrame(columns) for name, columns in groups.items()}
+    return metadata, groups
@@ -9,107 +9,152 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import List, Tuple, Dict
-import json
 import time
+import argparse
+from filament_core import FILAMENT_MASS, FUNDAMENTAL_FREQUENCY, LAW_VERSION, law_plan
+from prime_search import nearest_primes
+from prime_table import get_prime_table
+from result_writer import ResultWriter, column_rows, dump_json
+from columnar_results import ColumnarResultWriter
+from zeta_zeros import first_zeta_zeros
+from instrumentation import Metrics, NULL_METRICS
+from run_checkpoint import RunCheckpoint, default_checkpoint_dir, values_key
+
+# حقول test_fundamental_frequency_relation (اسم الحقل ← القانون)
+RELATION_LAWS = {
+    'prime': 'prime',
+    'calculated_frequency': 'prime_frequency',
+    'theoretical_frequency': 'theoretical_frequency',
+    'error_percentage': 'frequency_error',
+    'balance_check': 'balance_check',
+    'balance_factor': 'balance_factor',
+    'temporal_dimension': 'temporal_dimension',
+    'four_d_volume': 'four_d_volume',
+    'is_valid': 'relation_valid',
+}
 
 class ExtendedPrimeFilamentTest:
     """اختبار موسع لنظرية الفتائل"""
     
-    def __init__(self):
+    def __init__(self, sink: ResultWriter = None, zeta_count: int = 20, metrics: Metrics = None,
+                 checkpoint_dir: str = None):
+        # مجرى النتائج المتدفق (اختياري): تُكتب السجلات فور إنتاجها ولا تُحفظ في الذاكرة
+        self.sink = sink
+        
+        # نقاط الاستئناف (None = معطلة): المجموعات المكتملة تُتخطى عند إعادة التشغيل
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint = None
+        
+        # قياس المراحل (معطل افتراضياً)
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        
         # ثوابت نظرية الفتائل
-        self.filament_mass = 5.85881e-52  # كتلة الفتيلة
-        self.fundamental_frequency = 1 / (4 * math.pi)  # التردد الأساسي
+        self.filament_mass = FILAMENT_MASS  # كتلة الفتيلة
+        self.fundamental_frequency = FUNDAMENTAL_FREQUENCY  # التردد الأساسي
+        self.relation_laws = law_plan(RELATION_LAWS, fundamental_frequency=self.fundamental_frequency)
+        
+        # جدول الأعداد الأولية المشترك (يُبنى مرة واحدة حتى أكبر نطاق)
+        self.prime_table = get_prime_table()
+        self.prime_table.ensure(10000)
         
         # مجموعات الاختبار
         self.small_primes = self.generate_primes(2, 100)  # أعداد أولية صغيرة
         self.medium_primes = self.generate_primes(100, 1000)  # أعداد أولية متوسطة
         self.large_primes = self.generate_primes(1000, 10000)  # أعداد أولية كبيرة
         
-        # أصفار زيتا موسعة (أول 20 صفر)
-        self.extended_zeta_zeros = [
-            14.134725141734693790, 21.022039638771554993, 25.010857580145688763,
-            30.424876125859513210, 32.935061587739189691, 37.586178158825671257,
-            40.918719012147495187, 43.327073280914999519, 48.005150881167159727,
-            49.773832477672302181, 52.970321477714460644, 56.446247697063246086,
-            59.347044003233895969, 60.831778524609809200, 65.112544048081651438,
-            67.079810529494905051, 69.546401711173979984, 72.067157674481907582,
-            75.704690699083933914, 77.144840068874800998
-        ]
+        # أصفار زيتا موسعة (أول zeta_count صفر، تُحسب مرة واحدة وتُخزن)
+        self.extended_zeta_zeros = first_zeta_zeros(zeta_count)
         
         self.results = {}
     
     def generate_primes(self, start: int, end: int) -> List[int]:
         """توليد الأعداد الأولية في نطاق معين"""
-        def is_prime(n):
-            if n < 2:
-                return False
-            if n == 2:
-                return True
-            if n % 2 == 0:
-                return False
-            for i in range(3, int(math.sqrt(n)) + 1, 2):
-                if n % i == 0:
-                    return False
-            return True
-        
-        return [n for n in range(start, end + 1) if is_prime(n)]
+        return self.prime_table.primes_between(start, end).tolist()
     
     def test_fundamental_frequency_relation(self, prime: int) -> Dict:
-        """اختبار العلاقة الأساسية p/π = 4p × (1/(4π))"""
-        # التردد المحسوب
-        calculated_freq = prime / math.pi
-        
-        # التردد النظري
-        theoretical_freq = 4 * prime * self.fundamental_frequency
-        
-        # نسبة الخطأ
-        error_percentage = abs(calculated_freq - theoretical_freq) / calculated_freq * 100
-        
-        # فحص التوازن الفتائلي
-        balance_check = prime + (-prime)  # يجب أن يساوي 0
-        balance_factor = 1.0 if balance_check == 0 else 1.0 / (1.0 + abs(balance_check))
-        
-        # خصائص الأبعاد الأربعة
-        temporal_dimension = prime
-        spatial_radius = 1.0  # نصف القطر الفعال
-        four_d_volume = (4/3) * math.pi * (spatial_radius ** 3) * temporal_dimension
-        
-        return {
-            'prime': prime,
-            'calculated_frequency': calculated_freq,
-            'theoretical_frequency': theoretical_freq,
-            'error_percentage': error_percentage,
-            'balance_check': balance_check,
-            'balance_factor': balance_factor,
-            'temporal_dimension': temporal_dimension,
-            'four_d_volume': four_d_volume,
-            'is_valid': error_percentage < 0.001 and balance_factor == 1.0
-        }
+        """اختبار العلاقة الأساسية p/π = 4p × (1/(4π)) (سجل LawRecord)"""
+        return self.relation_laws.scalar(prime)
     
     def test_zeta_zero_correspondence(self, zeta_zero: float, prime_list: List[int]) -> Dict:
         """اختبار التناظر مع أصفار زيتا"""
+        columns = self.test_zeta_zero_correspondence_batch([zeta_zero], prime_list)
+        return next(column_rows(columns))
+    
+    def test_zeta_zero_correspondence_batch(self, zeta_zeros, prime_list=None) -> Dict[str, np.ndarray]:
+        """
+        اختبار التناظر لمصفوفة كاملة من أصفار زيتا دفعة واحدة
+        Vectorized zeta correspondence: nearest primes by one searchsorted over
+        the sorted prime_list (default: the shared prime table)
+        """
+        zeta_zeros = np.asarray(zeta_zeros, dtype=np.float64)
+        
         # التردد المقابل لصفر زيتا
-        zeta_frequency = zeta_zero / (2 * math.pi)
+        zeta_frequency = zeta_zeros / (2 * math.pi)
         
         # العدد الأولي المتوقع (معادلة محسنة)
-        predicted_prime = zeta_zero / math.pi * math.sqrt(2) * math.cos(math.pi/4)
+        predicted_prime = zeta_zeros / math.pi * math.sqrt(2) * math.cos(math.pi/4)
         
         # أقرب عدد أولي
-        closest_prime = min(prime_list, key=lambda p: abs(p - predicted_prime))
+        closest_prime = nearest_primes(predicted_prime, prime_list)
         
         # حساب الدقة
-        accuracy = (1 - abs(closest_prime - predicted_prime) / closest_prime) * 100
+        accuracy = (1 - np.abs(closest_prime - predicted_prime) / closest_prime) * 100
         
         return {
-            'zeta_zero': zeta_zero,
+            'zeta_zero': zeta_zeros,
             'zeta_frequency': zeta_frequency,
             'predicted_prime': predicted_prime,
             'closest_prime': closest_prime,
-            'accuracy_percent': max(0, accuracy)
+            'accuracy_percent': np.maximum(0, accuracy)
         }
     
+    def record_result(self, group: str, result: Dict, results: List[Dict]):
+        """حفظ النتيجة في القائمة، أو كتابتها فوراً إلى مجرى النتائج إن وُجد"""
+        if self.sink is not None:
+            record_type = 'zeta' if group == 'zeta' else 'prime'
+            self.sink.write({'group': group, **result}, record_type=record_type)
+        else:
+            results.append(result)
+    
+    def test_group(self, group: str, primes: List[int], errors: List[float],
+                   failed_primes: List[int], unit: str = None) -> Tuple[List[Dict], int]:
+        """
+        اختبار مجموعة أعداد أولية: التقييم ثم الكتابة ثم الإحصائيات (كل مرحلة بمؤقتها)
+        A group completed by an interrupted run is read back from its checkpoint
+        instead of being evaluated again; the unit is keyed on the primes
+        themselves, so a saved group is only reused for the same primes
+        """
+        if unit:
+            unit = f'{unit}:{values_key(primes)}'
+        saved = self.checkpoint.completed(unit) if self.checkpoint is not None and unit else None
+        if saved is not None:
+            evaluated = saved['results']
+            print(f"   ↩️ مكتملة في تشغيل سابق: {len(evaluated)} نتيجة")
+            self.metrics.count('groups_resumed')
+        else:
+            with self.metrics.timer('evaluate'):
+                evaluated = [self.test_fundamental_frequency_relation(prime) for prime in primes]
+            self.metrics.count('primes_tested', len(evaluated))
+            if self.checkpoint is not None and unit:
+                with self.metrics.timer('checkpoint'):
+                    self.checkpoint.complete(unit, {'results': evaluated})
+        
+        results = []
+        with self.metrics.timer('write'):
+            for result in evaluated:
+                self.record_result(group, result, results)
+        
+        valid_count = 0
+        with self.metrics.timer('statistics'):
+            for result in evaluated:
+                errors.append(result['error_percentage'])
+                if result['is_valid']:
+                    valid_count += 1
+                else:
+                    failed_primes.append(result['prime'])
+        return results, valid_count
+    
     def run_comprehensive_test(self) -> Dict:
         """تشغيل الاختبار الشامل"""
         print("🚀 بدء الاختبار الموسع لنظرية الفتائل...")
@@ -117,77 +162,88 @@ class ExtendedPrimeFilamentTest:
         
         start_time = time.time()
         
-        # اختبار الأعداد الأولية الصغيرة
-        print(f"\n🔢 اختبار الأعداد الأولية الصغيرة (2-100): {len(self.small_primes)} عدد")
-        small_results = []
-        small_valid_count = 0
+        # نقاط الاستئناف: المجموعات مفاتيحها حدودها وعدد الأعداد المختبرة منها
+        if self.checkpoint_dir:
+            self.checkpoint = RunCheckpoint(self.checkpoint_dir, 'extended', {'law_version': LAW_VERSION})
+            if self.checkpoint.resumed:
+                print(f"↩️ استئناف تشغيل سابق من: {self.checkpoint.path}")
         
-        for prime in self.small_primes:
-            result = self.test_fundamental_frequency_relation(prime)
-            small_results.append(result)
-            if result['is_valid']:
-                small_valid_count += 1
+        # أخطاء التردد والأعداد الفاشلة (لتحليل الأخطاء حتى في وضع البث)
+        errors = []
+        failed_primes = []
+        
+        # اختبار الأعداد الأولية الصغيرة
+        with self.metrics.timer('report'):
+            print(f"\n🔢 اختبار الأعداد الأولية الصغيرة (2-100): {len(self.small_primes)} عدد")
+        small_results, small_valid_count = self.test_group('small', self.small_primes, errors, failed_primes,
+                                                            unit='small:2-100')
         
         small_success_rate = (small_valid_count / len(self.small_primes)) * 100
-        print(f"   معدل النجاح: {small_success_rate:.2f}% ({small_valid_count}/{len(self.small_primes)})")
+        with self.metrics.timer('report'):
+            print(f"   معدل النجاح: {small_success_rate:.2f}% ({small_valid_count}/{len(self.small_primes)})")
         
         # اختبار الأعداد الأولية المتوسطة
-        print(f"\n🔢 اختبار الأعداد الأولية المتوسطة (100-1000): {len(self.medium_primes)} عدد")
-        medium_results = []
-        medium_valid_count = 0
-        
-        for prime in self.medium_primes[:50]:  # اختبار أول 50 للسرعة
-            result = self.test_fundamental_frequency_relation(prime)
-            medium_results.append(result)
-            if result['is_valid']:
-                medium_valid_count += 1
+        with self.metrics.timer('report'):
+            print(f"\n🔢 اختبار الأعداد الأولية المتوسطة (100-1000): {len(self.medium_primes)} عدد")
+        medium_results, medium_valid_count = self.test_group(
+            'medium', self.medium_primes[:50], errors, failed_primes,
+            unit='medium:100-1000:50')  # اختبار أول 50 للسرعة
         
-        medium_success_rate = (medium_valid_count / len(medium_results)) * 100
-        print(f"   معدل النجاح: {medium_success_rate:.2f}% ({medium_valid_count}/{len(medium_results)})")
+        medium_tested = min(len(self.medium_primes), 50)
+        medium_success_rate = (medium_valid_count / medium_tested) * 100
+        with self.metrics.timer('report'):
+            print(f"   معدل النجاح: {medium_success_rate:.2f}% ({medium_valid_count}/{medium_tested})")
         
         # اختبار الأعداد الأولية الكبيرة
-        print(f"\n🔢 اختبار الأعداد الأولية الكبيرة (1000-10000): {len(self.large_primes)} عدد")
-        large_results = []
-        large_valid_count = 0
+        with self.metrics.timer('report'):
+            print(f"\n🔢 اختبار الأعداد الأولية الكبيرة (1000-10000): {len(self.large_primes)} عدد")
+        large_results, large_valid_count = self.test_group(
+            'large', self.large_primes[:30], errors, failed_primes,
+            unit='large:1000-10000:30')  # اختبار أول 30 للسرعة
         
-        for prime in self.large_primes[:30]:  # اختبار أول 30 للسرعة
-            result = self.test_fundamental_frequency_relation(prime)
-            large_results.append(result)
-            if result['is_valid']:
-                large_valid_count += 1
-        
-        large_success_rate = (large_valid_count / len(large_results)) * 100
-        print(f"   معدل النجاح: {large_success_rate:.2f}% ({large_valid_count}/{len(large_results)})")
+        large_tested = min(len(self.large_primes), 30)
+        large_success_rate = (large_valid_count / large_tested) * 100
+        with self.metrics.timer('report'):
+            print(f"   معدل النجاح: {large_success_rate:.2f}% ({large_valid_count}/{large_tested})")
         
         # اختبار أصفار زيتا الموسعة
-        print(f"\n🌊 اختبار أصفار زيتا الموسعة: {len(self.extended_zeta_zeros)} صفر")
-        all_primes = self.small_primes + self.medium_primes + self.large_primes
+        with self.metrics.timer('report'):
+            print(f"\n🌊 اختبار أصفار زيتا الموسعة: {len(self.extended_zeta_zeros)} صفر")
+        # أقرب عدد أولي من الجدول المشترك (يمتد تلقائياً لأي عدد من الأصفار)
+        with self.metrics.timer('zeta'):
+            zeta_columns = self.test_zeta_zero_correspondence_batch(self.extended_zeta_zeros)
+        self.metrics.count('zeta_zeros_tested', len(self.extended_zeta_zeros))
         zeta_results = []
         
-        for i, zero in enumerate(self.extended_zeta_zeros):
-            result = self.test_zeta_zero_correspondence(zero, all_primes)
-            zeta_results.append(result)
-            if i < 5:  # عرض أول 5 نتائج
-                print(f"   صفر #{i+1}: {zero:.6f} → عدد أولي {result['closest_prime']} (دقة: {result['accuracy_percent']:.1f}%)")
+        with self.metrics.timer('write'):
+            for result in column_rows(zeta_columns):
+                self.record_result('zeta', result, zeta_results)
+        
+        with self.metrics.timer('statistics'):
+            avg_zeta_accuracy = sum(zeta_columns['accuracy_percent'].tolist()) / len(self.extended_zeta_zeros)
         
-        avg_zeta_accuracy = sum(r['accuracy_percent'] for r in zeta_results) / len(zeta_results)
-        print(f"   متوسط دقة أصفار زيتا: {avg_zeta_accuracy:.2f}%")
+        with self.metrics.timer('report'):
+            for i, zero in enumerate(self.extended_zeta_zeros[:5]):  # عرض أول 5 نتائج
+                print(f"   صفر #{i+1}: {zero:.6f} → عدد أولي {zeta_columns['closest_prime'][i]} "
+                      f"(دقة: {zeta_columns['accuracy_percent'][i]:.1f}%)")
+            print(f"   متوسط دقة أصفار زيتا: {avg_zeta_accuracy:.2f}%")
         
         # حساب الإحصائيات الإجمالية
-        total_tested = len(small_results) + len(medium_results) + len(large_results)
+        total_tested = len(self.small_primes) + medium_tested + large_tested
         total_valid = small_valid_count + medium_valid_count + large_valid_count
         overall_success_rate = (total_valid / total_tested) * 100
         
         end_time = time.time()
         test_duration = end_time - start_time
         
-        print("\n" + "=" * 80)
-        print("📊 الإحصائيات الإجمالية:")
-        print(f"   إجمالي الأعداد المختبرة: {total_tested}")
-        print(f"   الأعداد الصحيحة: {total_valid}")
-        print(f"   معدل النجاح الإجمالي: {overall_success_rate:.2f}%")
-        print(f"   متوسط دقة أصفار زيتا: {avg_zeta_accuracy:.2f}%")
-        print(f"   مدة الاختبار: {test_duration:.2f} ثانية")
+        with self.metrics.timer('report'):
+            print("\n" + "=" * 80)
+            print("📊 الإحصائيات الإجمالية:")
+            print(f"   إجمالي الأعداد المختبرة: {total_tested}")
+            print(f"   الأعداد الصحيحة: {total_valid}")
+            print(f"   معدل النجاح الإجمالي: {overall_success_rate:.2f}%")
+            print(f"   متوسط دقة أصفار زيتا: {avg_zeta_accuracy:.2f}%")
+            print(f"   مدة الاختبار: {test_duration:.2f} ثانية")
         
         # حفظ النتائج
         self.results = {
@@ -203,61 +259,136 @@ class ExtendedPrimeFilamentTest:
                 'medium_success_rate': medium_success_rate,
                 'large_success_rate': large_success_rate,
                 'avg_zeta_accuracy': avg_zeta_accuracy,
-                'test_duration': test_duration
+                'test_duration': test_duration,
+                'error_analysis': {
+                    'min_error': min(errors),
+                    'max_error': max(errors),
+                    'mean_error': float(np.mean(errors)),
+                    'std_error': float(np.std(errors)),
+                    'failed_primes': failed_primes
+                }
             }
         }
         
+        if self.sink is not None:
+            with self.metrics.timer('write'):
+                self.sink.write(self.results['statistics'], record_type='statistics')
+        
+        if self.metrics.enabled:
+            self.metrics.add_time('total', time.time() - start_time)
+            self.metrics.throughput('primes_per_second', 'primes_tested', 'evaluate')
+            self.metrics.throughput('zeta_zeros_per_second', 'zeta_zeros_tested', 'zeta')
+            # مقاييس الكتابة (السجلات والبايتات) تُسجل في close_sink بعد إغلاق المجرى
+            self.results['metrics'] = self.metrics.to_dict()
+            if self.sink is not None:
+                self.sink.write(self.results['metrics'], record_type='metrics')
+        
+        # اكتمل التشغيل: لا حاجة لنقاط الاستئناف
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        
         return self.results
     
     def analyze_error_patterns(self):
         """تحليل أنماط الأخطاء"""
         print("\n🔍 تحليل أنماط الأخطاء:")
         
-        all_results = (self.results['small_primes_results'] + 
-                      self.results['medium_primes_results'] + 
-                      self.results['large_primes_results'])
-        
-        errors = [r['error_percentage'] for r in all_results]
+        analysis = self.results['statistics']['error_analysis']
         
-        print(f"   أقل خطأ: {min(errors):.6f}%")
-        print(f"   أكبر خطأ: {max(errors):.6f}%")
-        print(f"   متوسط الخطأ: {np.mean(errors):.6f}%")
-        print(f"   الانحراف المعياري: {np.std(errors):.6f}%")
+        print(f"   أقل خطأ: {analysis['min_error']:.6f}%")
+        print(f"   أكبر خطأ: {analysis['max_error']:.6f}%")
+        print(f"   متوسط الخطأ: {analysis['mean_error']:.6f}%")
+        print(f"   الانحراف المعياري: {analysis['std_error']:.6f}%")
         
         # فحص الأعداد التي لم تنجح
-        failed_primes = [r['prime'] for r in all_results if not r['is_valid']]
+        failed_primes = analysis['failed_primes']
         if failed_primes:
             print(f"   الأعداد التي لم تنجح: {failed_primes[:10]}...")
         else:
             print("   ✅ جميع الأعداد نجحت في الاختبار!")
     
-    def save_results(self, filename: str = "extended_test_results.json"):
+    def close_sink(self):
+        """
+        إغلاق مجرى النتائج ثم تسجيل مقاييس الكتابة
+        Write metrics are taken after close(): the columnar writer only
+        writes its file there, so counts read earlier would be 0 bytes
+        """
+        if self.sink is None:
+            return
+        with self.metrics.timer('write'):
+            self.sink.close()
+        if self.metrics.enabled:
+            self.metrics.count('records_written', self.sink.records_written)
+            self.metrics.count('bytes_written', self.sink.bytes_written)
+            self.metrics.throughput('bytes_per_second', 'bytes_written', 'write')
+            if 'metrics' in self.results:
+                self.results['metrics'] = self.metrics.to_dict()
+    
+    def save_results(self, filename: str = "extended_test_results.json", compact: bool = False):
         """حفظ النتائج"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=2)
+        dump_json(self.results, filename, compact=compact)
         print(f"\n💾 تم حفظ النتائج في: {filename}")
 
-def main():
-    """الدالة الرئيسية"""
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--stream', metavar='PATH',
+                        help='write per-prime records to an NDJSON file as they are produced')
+    output.add_argument('--columnar', metavar='PATH',
+                        help='write per-prime records as columnar arrays to an .npz file')
+    parser.add_argument('--compact', action='store_true',
+                        help='write results without indentation')
+    parser.add_argument('--zeta-zeros', type=int, default=20, metavar='N',
+                        help='number of Riemann zeta zeros to test (default 20)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='time each stage and add a metrics block to the results')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='do not resume from or write checkpoints (default dir: $FILAMENT_RUN_CHECKPOINTS '
+                             'or ~/.cache/filament_theory/runs)')
+
+def run(args: argparse.Namespace):
+    """تشغيل الاختبار بالخيارات المحللة"""
     print("🌟 اختبار موسع لنظرية الفتائل والأعداد الأولية")
     print("Extended Test for Filament Theory and Prime Numbers")
     print("د. باسل يحيى عبدالله - Dr. Basel Yahya Abdullah")
     print("=" * 80)
     
     # إنشاء الاختبار
-    tester = ExtendedPrimeFilamentTest()
+    if args.stream:
+        sink = ResultWriter(args.stream, compact=args.compact)
+    elif args.columnar:
+        sink = ColumnarResultWriter(args.columnar, metadata={'source': 'extended_prime_test.py'})
+    else:
+        sink = None
+    metrics = Metrics() if args.metrics else None
+    tester = ExtendedPrimeFilamentTest(sink=sink, zeta_count=args.zeta_zeros, metrics=metrics,
+                                       checkpoint_dir=None if args.no_checkpoint else default_checkpoint_dir())
     
     # تشغيل الاختبار الشامل
-    results = tester.run_comprehensive_test()
+    try:
+        results = tester.run_comprehensive_test()
+    finally:
+        if sink is not None:
+            tester.close_sink()
+            print(f"\n💾 تم بث {sink.records_written:,} سجل ({sink.bytes_written:,} بايت) إلى: {sink.filename}")
+    
+    if metrics is not None:
+        metrics.report()
     
     # تحليل أنماط الأخطاء
     tester.analyze_error_patterns()
     
     # حفظ النتائج
-    tester.save_results()
+    tester.save_results(compact=args.compact)
     
     print("\n🎯 انتهى الاختبار الموسع بنجاح!")
     return results
 
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Extended Test for Filament Theory")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
 if __name__ == "__main__":
     results = main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+واجهة سطر الأوامر الموحدة - نظرية الفتائل
+Unified Command-Line Interface - Filament Theory
+
+أوامر فرعية تعمل داخل نفس العملية وتقرأ الوسائط بدلاً من input():
+
+    python filament_cli.py check 97 101
+    python filament_cli.py check 2^4423-1 --precision 50
+    python filament_cli.py range 100 200 --show 3
+    python filament_cli.py predict 47 43 37
+    python filament_cli.py ultimate --exhaustive --metrics
+    python filament_cli.py extended --zeta-zeros 100
+    python filament_cli.py challenge
+    python filament_cli.py mersenne 521 607 --range 2 3000 --workers 4
+    python filament_cli.py serve --port 8765 --warm 10000000
+    python filament_cli.py pi 10^12 10^13 + pi --range 99999000000 10^11
+    python filament_cli.py sample 10^12 10^13 25 --seed 7 --strata 5
+    python filament_cli.py plot results.npz
+
+يمكن ربط عدة أوامر بالفاصل "+" فتُنفذ بالترتيب في نفس العملية، فيُعاد
+استخدام جدول الأعداد الأولية وأصفار زيتا والحاسبات المنشأة:
+
+    python filament_cli.py check 97 + range 1 100 + ultimate --metrics
+
+تُحلل جميع الأوامر قبل تنفيذ أولها، فخطأ في أمر لاحق لا يضيع عمل ما قبله.
+الوحدات الثقيلة (matplotlib، الاختبارات) تُستورد فقط عند تشغيل أمرها.
+"""
+
+import argparse
+import importlib
+import re
+import sys
+from typing import Callable, Dict, List
+
+# الفاصل بين الأوامر المربوطة
+CHAIN_SEPARATOR = '+'
+
+
+class Session:
+    """كائنات مشتركة بين الأوامر المربوطة في نفس العملية"""
+
+    def __init__(self):
+        self._instances: Dict[str, object] = {}
+
+    def get(self, name: str, factory: Callable[[], object]):
+        """الكائن name (يُنشأ عند أول طلب فقط)"""
+        if name not in self._instances:
+            self._instances[name] = factory()
+        return self._instances[name]
+
+    def interactive_calculator(self, precision: int = None):
+        from interactive_prime_calculator import InteractiveFilamentCalculator
+        name = 'interactive' if precision is None else f'interactive-dps{precision}'
+        return self.get(name, lambda: InteractiveFilamentCalculator(precision=precision))
+
+    def prime_calculator(self):
+        from prime_filament_calculator import FilamentPrimeCalculator
+        return self.get('calculator', FilamentPrimeCalculator)
+
+
+def integer(text: str, max_bits: int = None) -> int:
+    """
+    عدد صحيح، أو بالصيغة a^b±c (مثل 2^4423-1) للأعداد الكبيرة
+    With max_bits, a^b±c is rejected with OverflowError before the power is
+    computed when a^b certainly has more bits (10^30000000 would otherwise
+    take minutes and gigabytes)
+    """
+    match = re.fullmatch(r'(\d+)(?:\^|\*\*)(\d+)([+-]\d+)?', text.replace(' ', ''))
+    if match is None:
+        return int(text)
+    base, exponent, offset = (int(group or 0) for group in match.groups())
+    # a^b ≥ 2^(b·(bits(a) − 1))، وأي إزاحة c بحجم معقول لا تنقصه أكثر من بت
+    if max_bits is not None and exponent * (base.bit_length() - 1) > max_bits + 1:
+        raise OverflowError(f'{text} أكبر من {max_bits} بت')
+    return base ** exponent + offset
+
+
+# ==================== الأوامر ====================
+
+def cmd_check(args, session: Session):
+    """فحص أعداد وعرض خصائصها الفتائلية"""
+    calculator = session.interactive_calculator(args.precision)
+    return [calculator.analyze_prime(n) for n in args.numbers]
+
+
+def cmd_range(args, session: Session):
+    """الأعداد الأولية في نطاق مع خصائص أولها"""
+    return session.interactive_calculator().analyze_range(args.start, args.end, show=args.show)
+
+
+def cmd_predict(args, session: Session):
+    """العدد الأولي التالي لكل عدد"""
+    calculator = session.prime_calculator()
+    return [calculator.predict_next_prime(n) for n in args.numbers]
+
+
+def cmd_ultimate(args, session: Session):
+    """الاختبار النهائي الشامل"""
+    import ultimate_prime_test
+    return ultimate_prime_test.run(args)
+
+
+def cmd_extended(args, session: Session):
+    """الاختبار الموسع مع أصفار زيتا"""
+    import extended_prime_test
+    return extended_prime_test.run(args)
+
+
+def cmd_challenge(args, session: Session):
+    """اختبار الرد على التحدي"""
+    import challenge_response_test
+    return challenge_response_test.run(args)
+
+
+def cmd_mersenne(args, session: Session):
+    """اختبار لوكاس-ليمر لأعداد مرسين"""
+    import lucas_lehmer
+    return lucas_lehmer.run(args)
+
+
+def cmd_pi(args, session: Session):
+    """دالة عد الأعداد الأولية π(x)"""
+    import prime_count
+    return prime_count.run(args)
+
+
+def cmd_sample(args, session: Session):
+    """عينة أعداد أولية عشوائية من نطاق"""
+    import prime_sampling
+    return prime_sampling.run(args)
+
+
+def cmd_serve(args, session: Session):
+    """خدمة الحساب المحلية (حتى Ctrl+C)"""
+    import filament_service
+    return filament_service.run(args)
+
+
+def cmd_plot(args, session: Session):
+    """رسم ملف نتائج عمودي، أو المخططات الافتراضية بدون ملف"""
+    import visualize_results
+    if args.path:
+        visualize_results.visualize_columnar(args.path)
+    else:
+        visualize_results.load_and_visualize()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """المحلل الرئيسي بجميع الأوامر الفرعية"""
+    parser = argparse.ArgumentParser(
+        prog='filament_cli.py',
+        description="Filament Theory command-line interface",
+        epilog=f"chain several commands in one process with '{CHAIN_SEPARATOR}', "
+               f"e.g. check 97 {CHAIN_SEPARATOR} range 1 100")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    check = commands.add_parser('check', help='primality and filament properties of numbers')
+    check.add_argument('numbers', nargs='+', type=integer, metavar='N')
+    check.add_argument('--precision', type=int, metavar='D',
+                       help='mpmath digits for primes beyond the float range (default $FILAMENT_PRECISION or 30)')
+    check.set_defaults(handler=cmd_check)
+
+    range_ = commands.add_parser('range', help='primes in [START, END] with their properties')
+    range_.add_argument('start', type=int)
+    range_.add_argument('end', type=int)
+    range_.add_argument('--show', type=int, default=5, metavar='K',
+                        help='print full properties for the first K primes (default 5)')
+    range_.set_defaults(handler=cmd_range)
+
+    predict = commands.add_parser('predict', help='next prime after each number')
+    predict.add_argument('numbers', nargs='+', type=integer, metavar='N')
+    predict.set_defaults(handler=cmd_predict)
+
+    # خيارات الاختبارات تأتي من وحداتها (تُستورد الوحدة فقط عند تحليل أمرها)
+    for name, module, help_text, handler in (
+            ('ultimate', 'ultimate_prime_test', 'ultimate comprehensive test', cmd_ultimate),
+            ('extended', 'extended_prime_test', 'extended test with zeta zeros', cmd_extended),
+            ('challenge', 'challenge_response_test', 'challenge response test', cmd_challenge),
+            ('mersenne', 'lucas_lehmer', 'Lucas-Lehmer test of Mersenne numbers 2^p - 1', cmd_mersenne),
+            ('pi', 'prime_count', 'prime-counting function π(x) without enumeration', cmd_pi),
+            ('sample', 'prime_sampling', 'uniform random primes from a range', cmd_sample),
+            ('serve', 'filament_service', 'local HTTP calculation service', cmd_serve)):
+        sub = commands.add_parser(name, help=help_text, add_help=False)
+        sub.set_defaults(handler=handler, options_module=module)
+
+    plot = commands.add_parser('plot', help='plot a columnar result file (or the default charts)')
+    plot.add_argument('path', nargs='?', help='.npz file written with --columnar')
+    plot.set_defaults(handler=cmd_plot)
+    return parser
+
+
+def split_chain(argv: List[str]) -> List[List[str]]:
+    """تقسيم الوسائط إلى أوامر عند الفاصل"""
+    chain = [[]]
+    for arg in argv:
+        if arg == CHAIN_SEPARATOR:
+            chain.append([])
+        else:
+            chain[-1].append(arg)
+    return [command for command in chain if command]
+
+
+def parse_command(parser: argparse.ArgumentParser, argv: List[str]) -> argparse.Namespace:
+    """تحليل أمر واحد؛ خيارات الاختبارات تُحلل بمحلل وحدتها"""
+    args, rest = parser.parse_known_args(argv)
+    module = getattr(args, 'options_module', None)
+    if module is None:
+        if rest:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        return args
+    options = argparse.ArgumentParser(prog=f'{parser.prog} {args.command}')
+    importlib.import_module(module).add_arguments(options)
+    options.parse_args(rest, namespace=args)
+    return args
+
+
+def run_chain(argv: List[str], session: Session = None) -> list:
+    """تحليل جميع الأوامر ثم تنفيذها بالترتيب في نفس العملية"""
+    parser = build_parser()
+    chain = split_chain(argv)
+    if not chain:
+        parser.print_help()
+        return []
+    parsed = [parse_command(parser, command) for command in chain]
+
+    session = session or Session()
+    return [args.handler(args, session) for args in parsed]
+
+
+def run_module(name: str):
+    """
+    تشغيل main() لوحدة داخل نفس العملية بدلاً من مفسر جديد
+    In-process equivalent of `python <name>.py` with no arguments
+    """
+    module = importlib.import_module(name)
+    argv = sys.argv
+    sys.argv = [module.__file__]
+    try:
+        return module.main()
+    finally:
+        sys.argv = argv
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    run_chain(sys.argv[1:] if argv is None else argv)
+
+
+if __name__ == "__main__":
+    main()
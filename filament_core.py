@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+نواة نظرية الفتائل - سريعة التحميل
+Filament Theory Core - Fast Startup
+
+الثوابت ومحرك الأعداد الأولية ونوى القوانين المتجهة في وحدة واحدة لا تستورد
+إلا المكتبة القياسية و NumPy. الرسم والاعتماديات الثقيلة (matplotlib،
+mpmath، pandas) لا تُحمَّل إلا عند استخدامها فعلاً.
+
+    from filament_core import is_prime, primes_between, cavity_properties
+"""
+
+import math
+import numpy as np
+from typing import Dict
+
+from law_engine import (BIG_THRESHOLD, DEFAULT_PRECISION, LAW_VERSION, LawPlan, LawRecord, compile_laws,
+                        make_record)
+from primality import is_prime
+from prime_count import count_primes, prime_pi
+from prime_search import (is_primes, nearest_primes, next_prime, next_primes, prev_prime,
+                          prev_primes, primes_in_window)
+from prime_table import get_prime_table, primes_between
+
+__all__ = [
+    'FILAMENT_MASS', 'PLANCK_CONSTANT', 'LIGHT_SPEED', 'FUNDAMENTAL_FREQUENCY', 'LAW_VERSION',
+    'is_prime', 'is_primes', 'primes_between', 'get_prime_table', 'primes_in_window',
+    'next_prime', 'prev_prime', 'next_primes', 'prev_primes', 'nearest_primes',
+    'prime_pi', 'count_primes',
+    'law_plan', 'LawRecord', 'make_record', 'cavity_properties', 'filament_properties',
+    'BIG_THRESHOLD', 'DEFAULT_PRECISION', 'decimal_digits',
+]
+
+# ==================== الثوابت ====================
+
+FILAMENT_MASS = 5.85881e-52          # كتلة الفتيلة بالكيلوغرام
+PLANCK_CONSTANT = 6.62607015e-34     # ثابت بلانك
+LIGHT_SPEED = 299792458              # سرعة الضوء
+FUNDAMENTAL_FREQUENCY = 1 / (4 * math.pi)  # التردد الأساسي f₀ = 1/(4π) ≈ 0.079577 هرتز
+
+
+# ==================== نوى القوانين ====================
+
+def law_params(filament_mass: float = FILAMENT_MASS, planck_constant: float = PLANCK_CONSTANT,
+               fundamental_frequency: float = FUNDAMENTAL_FREQUENCY) -> Dict[str, float]:
+    """قيم الثوابت الفيزيائية التي تُربط بها القوانين عند التجميع"""
+    return {'filament_mass': filament_mass, 'planck_constant': planck_constant,
+            'fundamental_frequency': fundamental_frequency}
+
+
+def law_plan(names=None, **params) -> LawPlan:
+    """
+    خطة مُجمَّعة لمجموعة قوانين بالثوابت الافتراضية (أو params)
+    Compiled plan for any subset of the laws; see law_engine.compile_laws
+    """
+    return compile_laws(names, law_params(**params))
+
+
+# الحقول المتداخلة في "four_dimensional_properties"
+FOUR_D_LAWS = {
+    'fundamental_frequency': 'fundamental_frequency',
+    'spatial_ring_x': 'spatial_ring_x',
+    'spatial_ring_y': 'spatial_ring_y',
+    'spatial_ring_z': 'spatial_ring_z',
+    'temporal_dimension': 'temporal_dimension',
+    'effective_radius': 'effective_radius',
+    'spherical_surface_area': 'spherical_surface_area',
+    'smoky_volume': 'smoky_volume',
+    'smoky_density': 'smoky_density',
+}
+
+# حقول خصائص الحفرة بترتيب calculate_cavity_properties (اسم الحقل ← القانون،
+# والأبعاد الأربعة قاموس متداخل)
+CAVITY_LAWS = {
+    'prime': 'prime',
+    'prime_negative': 'prime_negative',
+    'capacitive_root': 'capacitive_root',
+    'inductive_root': 'inductive_root',
+    'orthogonal_angle': 'orthogonal_angle',
+    'balance_check': 'balance_check',
+    'resonance_frequency': 'resonance_frequency',
+    'material_capacitance': 'material_capacitance',
+    'material_inductance': 'material_inductance',
+    'cavity_depth': 'cavity_depth',
+    'string_radiation_strength': 'string_radiation_strength',
+    'balance_energy': 'balance_energy',
+    'filament_balance_factor': 'balance_factor',
+    'four_dimensional_properties': FOUR_D_LAWS,
+    'theoretical_frequency': 'theoretical_frequency',
+    'frequency_match_error': 'frequency_match_error',
+    'four_d_volume': 'four_d_volume',
+    'energy_density': 'cavity_energy_density',
+}
+
+# حقول اختبار خصائص الفتيلة الدفعي
+FILAMENT_BATCH_LAWS = {
+    'prime': 'prime',
+    'frequency_error': 'frequency_error',
+    'four_d_volume': 'four_d_volume',
+    'is_frequency_valid': 'is_frequency_valid',
+    'is_balance_valid': 'is_balance_valid',
+    'is_orthogonal_valid': 'is_orthogonal_valid',
+    'is_four_d_valid': 'is_four_d_valid',
+    'overall_valid': 'overall_valid',
+}
+
+
+def cavity_plan(filament_mass: float = FILAMENT_MASS,
+                planck_constant: float = PLANCK_CONSTANT) -> LawPlan:
+    """خطة خصائص الحفرة (كل الحقول بما فيها الأبعاد الأربعة)"""
+    return law_plan(CAVITY_LAWS, filament_mass=filament_mass, planck_constant=planck_constant)
+
+
+def cavity_properties(primes: np.ndarray, filament_mass: float = FILAMENT_MASS,
+                      planck_constant: float = PLANCK_CONSTANT) -> Dict[str, np.ndarray]:
+    """
+    حساب خصائص الحفرة الفتائلية لمصفوفة كاملة من الأعداد الأولية دفعة واحدة
+    Vectorized FilamentPrimeCalculator.calculate_cavity_properties
+
+    يعيد قاموساً من الأعمدة (مصفوفة لكل حقل) بنفس مفاتيح النسخة الفردية،
+    والحقول الثابتة تُعاد كعروض broadcast بدون حجز ذاكرة إضافية.
+    """
+    return cavity_plan(filament_mass, planck_constant)(primes)
+
+
+def filament_properties(primes: np.ndarray,
+                        fundamental_frequency: float = FUNDAMENTAL_FREQUENCY) -> Dict[str, np.ndarray]:
+    """
+    اختبار خصائص الفتيلة لمصفوفة كاملة من الأعداد الأولية
+    Vectorized UltimatePrimeFilamentTest.test_filament_properties:
+    every check as a boolean mask
+    """
+    return law_plan(FILAMENT_BATCH_LAWS, fundamental_frequency=fundamental_frequency)(primes)
+
+
+# ==================== الأعداد الكبيرة ====================
+
+def decimal_digits(n: int) -> int:
+    """
+    عدد الخانات العشرية لعدد صحيح بأي حجم
+    Digit count without converting to str (which is quadratic, and capped
+    at 4300 digits by default since Python 3.11)
+    """
+    n = abs(int(n))
+    if n < 10 ** 18:
+        return len(str(n))
+    import mpmath
+    with mpmath.workdps(30):
+        log10 = mpmath.log10(n)
+        digits = int(mpmath.floor(log10))
+        if mpmath.frac(log10) < mpmath.mpf(10) ** -20:
+            # قريب جداً من قوة للعشرة: مقارنة صحيحة دقيقة
+            digits -= n < 10 ** digits
+    return digits + 1
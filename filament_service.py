@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+"""
+خدمة الحساب المحلية - نظرية الفتائل
+Local Calculation Service - Filament Theory
+
+خادم HTTP صغير (asyncio من المكتبة القياسية فقط) على localhost أو مقبس Unix
+يبقي جدول الأعداد الأولية وأصفار زيتا والذاكرات المؤقتة دافئة بين الطلبات:
+
+    python filament_service.py --port 8765 --warm 10000000
+    python filament_service.py --unix /tmp/filament.sock
+
+    curl 'localhost:8765/is_prime?n=97,2^127-1'
+    curl 'localhost:8765/filament_properties?p=101'
+    curl 'localhost:8765/next_prime?n=1000000'
+    curl 'localhost:8765/zeta?n=1,2,3'          # أو ?t=14.134725
+    curl -d '{"n": [97, 101, 103]}' localhost:8765/is_prime
+    curl localhost:8765/metrics
+
+الطلبات المتزامنة لنفس النقطة تُجمع في استدعاء دفعي واحد (is_primes،
+next_primes، خصائص الفتيلة المتجهة، تناظر زيتا المتجه) يُنفذ على خيط عامل
+واحد، ثم تُوزع النتائج على أصحابها. عدد الطلبات قيد التنفيذ محدود، وما زاد
+عن حد الانتظار يُرفض فوراً برمز 503.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from filament_core import get_prime_table, is_primes, next_prime, next_primes
+from instrumentation import LatencyHistogram
+from prime_search import NUMPY_SAFE_LIMIT
+from property_cache import cache_stats
+from result_writer import NumpyJSONEncoder, column_rows
+from zeta_zeros import get_zeta_dataset
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# حجم جدول الأعداد الأولية المُحمّل قبل قبول الطلبات
+DEFAULT_WARM = 10_000_000
+
+# عدد أصفار زيتا المُحمّلة مسبقاً
+DEFAULT_ZETA_ZEROS = 100
+
+# أقصى عدد من الطلبات قيد الحساب، وأقصى عدد منتظر قبل الرفض بـ 503
+DEFAULT_MAX_CONCURRENCY = 64
+DEFAULT_MAX_PENDING = 1024
+
+# الدفعة تُرسل بعد هذه المهلة أو عند بلوغ max_batch قيمة
+DEFAULT_BATCH_DELAY = 0.001
+DEFAULT_MAX_BATCH = 4096
+
+# حدود كل طلب: عدد القيم، وحجم العدد بالبتات (BPSW بـ Python بطيء فوق بضعة آلاف)،
+# وأعلى صفر زيتا (يحدد حجم الجدول اللازم لأقرب عدد أولي)
+DEFAULT_MAX_VALUES = 10_000
+DEFAULT_MAX_BITS = 4096
+MAX_ZETA_HEIGHT = 1e7
+MAX_ZETA_INDEX = 100_000
+
+# أقصى حجم لجسم طلب POST
+MAX_BODY = 1 << 20
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 503: 'Service Unavailable'}
+
+
+class HTTPError(Exception):
+    """خطأ يُعاد للعميل برمز الحالة status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class BatchCoalescer:
+    """
+    تجميع الطلبات المتزامنة في استدعاءات دفعية
+    Pending requests are concatenated into one batch_fn call, flushed after
+    delay seconds or as soon as max_batch values are waiting; batch_fn runs on
+    the executor and its results are split back per request in order
+    """
+
+    def __init__(self, batch_fn: Callable[[list], list], executor: ThreadPoolExecutor,
+                 delay: float = DEFAULT_BATCH_DELAY, max_batch: int = DEFAULT_MAX_BATCH):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.delay = delay
+        self.max_batch = max_batch
+        self._pending: List[Tuple[list, asyncio.Future]] = []
+        self._pending_values = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+        self.requests = 0
+        self.batches = 0
+        self.values = 0
+        self.largest_batch = 0
+
+    async def submit(self, values: list) -> list:
+        """نتائج values (بنفس الترتيب) من أول دفعة تتسع لها"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((values, future))
+        self._pending_values += len(values)
+        self.requests += 1
+        if self._pending_values >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_values = self._pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[list, asyncio.Future]]) -> None:
+        values = [value for request, _ in batch for value in request]
+        self.batches += 1
+        self.values += len(values)
+        self.largest_batch = max(self.largest_batch, len(values))
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.batch_fn, values)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for request, future in batch:
+            if not future.done():
+                future.set_result(results[start:start + len(request)])
+            start += len(request)
+
+    def stats(self) -> Dict:
+        """إحصاءات التجميع"""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'values': self.values,
+            'largest_batch': self.largest_batch,
+            'values_per_batch': self.values / self.batches if self.batches else 0.0,
+        }
+
+
+class Endpoint:
+    """نقطة حساب: تحليل القيم من الطلب، ومجمّع دفعاتها، ومدرج أزمنتها"""
+
+    def __init__(self, params: Tuple[str, ...], parse: Callable, coalescer: BatchCoalescer):
+        self.params = params
+        self.parse = parse
+        self.coalescer = coalescer
+        self.latency = LatencyHistogram()
+
+
+class FilamentService:
+    """
+    خدمة الحساب: الحاسبات والجدول المشترك ونقاط HTTP
+    Owns the warm calculators, one single-thread executor shared by every
+    batch (the table and calculators are never touched concurrently) and
+    the concurrency limits
+    """
+
+    def __init__(self, warm: int = DEFAULT_WARM, zeta_zeros: int = DEFAULT_ZETA_ZEROS,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, max_pending: int = DEFAULT_MAX_PENDING,
+                 batch_delay: float = DEFAULT_BATCH_DELAY, max_batch: int = DEFAULT_MAX_BATCH,
+                 max_values: int = DEFAULT_MAX_VALUES, max_bits: int = DEFAULT_MAX_BITS):
+        self.warm_limit = warm
+        self.zeta_count = zeta_zeros
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_values = max_values
+        self.max_bits = max_bits
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='filament-batch')
+        self.filament_calculator = None
+        self.prime_calculator = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.started = time.time()
+
+        def coalescer(batch_fn):
+            return BatchCoalescer(batch_fn, self.executor, delay=batch_delay, max_batch=max_batch)
+
+        self.endpoints: Dict[str, Endpoint] = {
+            'is_prime': Endpoint(('n',), self._parse_integers, coalescer(self._is_prime_batch)),
+            'next_prime': Endpoint(('n',), self._parse_integers, coalescer(self._next_prime_batch)),
+            'filament_properties': Endpoint(('p',), self._parse_integers, coalescer(self._filament_batch)),
+            'zeta': Endpoint(('t', 'n'), self._parse_zeta, coalescer(self._zeta_batch)),
+        }
+
+    # ==================== التحميل المسبق ====================
+
+    def warm(self) -> None:
+        """تحميل الجدول وأصفار زيتا وإنشاء الحاسبات وتجميع خطط القوانين"""
+        from interactive_prime_calculator import InteractiveFilamentCalculator
+        from prime_filament_calculator import FilamentPrimeCalculator
+
+        start = time.time()
+        get_prime_table().ensure(self.warm_limit)
+        get_zeta_dataset().ensure(self.zeta_count)
+        with redirect_stdout(io.StringIO()):
+            self.filament_calculator = InteractiveFilamentCalculator()
+            self.prime_calculator = FilamentPrimeCalculator()
+        # تشغيل كل دالة دفعية مرة لتجميع الخطط قبل أول طلب
+        self._is_prime_batch([97])
+        self._next_prime_batch([97])
+        self._filament_batch([97])
+        self._zeta_batch([14.134725])
+        print(f"🔥 تحميل مسبق: {len(get_prime_table().primes):,} عدد أولي حتى "
+              f"{get_prime_table().limit:,} و {self.zeta_count} صفر زيتا ({time.time() - start:.2f} ثانية)")
+
+    # ==================== الدوال الدفعية (خيط العامل) ====================
+
+    def _is_prime_batch(self, values: List[int]) -> List[Dict]:
+        return [{'n': n, 'is_prime': flag} for n, flag in zip(values, is_primes(values).tolist())]
+
+    def _next_prime_batch(self, values: List[int]) -> List[Dict]:
+        results = [None] * len(values)
+        vectorized = [i for i, n in enumerate(values) if 0 <= n < NUMPY_SAFE_LIMIT]
+        if vectorized:
+            found = next_primes([values[i] for i in vectorized]).tolist()
+            for i, prime in zip(vectorized, found):
+                results[i] = prime
+        for i, n in enumerate(values):
+            if results[i] is None:
+                results[i] = next_prime(n)
+        return [{'n': n, 'next_prime': prime} for n, prime in zip(values, results)]
+
+    def _filament_batch(self, values: List[int]) -> List[Dict]:
+        return self.filament_calculator.calculate_filament_properties_batch(values)
+
+    def _zeta_batch(self, values: List[float]) -> List[Dict]:
+        zeros = np.asarray(values, dtype=np.float64)
+        # الجدول يغطي أقرب عدد أولي للعدد المتوقع (t/π)(1 + 0.1·log₂ t) بهامش مضاعف
+        top = float(zeros.max())
+        table = get_prime_table()
+        table.ensure(2 * int(top / math.pi * (1 + 0.1 * math.log2(max(top, 2.0)))) + 1024)
+        columns = self.prime_calculator.test_zeta_zero_correspondence_batch(zeros, primes=table.primes)
+        return list(column_rows(columns))
+
+    # ==================== تحليل الطلبات ====================
+
+    @staticmethod
+    def _raw_values(params: Tuple[str, ...], query: Dict[str, List[str]], body: bytes) -> Tuple[str, list]:
+        """القيم الخام لأول وسيط موجود: من الاستعلام (مفصولة بفواصل) أو من جسم JSON"""
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f'جسم JSON غير صالح: {e}')
+            if not isinstance(data, dict):
+                raise HTTPError(400, 'جسم الطلب يجب أن يكون كائن JSON')
+            query = {name: value if isinstance(value, list) else [value] for name, value in data.items()}
+        else:
+            query = {name: [item for value in values for item in value.split(',') if item.strip()]
+                     for name, values in query.items()}
+
+        for name in params:
+            if query.get(name):
+                return name, query[name]
+        raise HTTPError(400, f"الوسيط المطلوب: {' أو '.join(params)}")
+
+    def _check_count(self, values: list) -> None:
+        if len(values) > self.max_values:
+            raise HTTPError(400, f'عدد القيم {len(values):,} يتجاوز الحد {self.max_values:,}')
+
+    def _parse_integers(self, params, query, body) -> List[int]:
+        from filament_cli import integer
+        _, raw = self._raw_values(params, query, body)
+        self._check_count(raw)
+        values = []
+        for value in raw:
+            try:
+                if isinstance(value, bool) or not isinstance(value, (int, str)):
+                    raise ValueError
+                n = value if isinstance(value, int) else integer(value.strip(), self.max_bits)
+            except ValueError:
+                raise HTTPError(400, f'قيمة غير صحيحة: {value!r}')
+            except OverflowError:
+                raise HTTPError(400, f'العدد أكبر من الحد {self.max_bits} بت')
+            if n.bit_length() > self.max_bits:
+                raise HTTPError(400, f'العدد أكبر من الحد {self.max_bits} بت')
+            values.append(n)
+        return values
+
+    async def _parse_zeta(self, params, query, body) -> List[float]:
+        name, raw = self._raw_values(params, query, body)
+        self._check_count(raw)
+        try:
+            if name == 'n':
+                indices = [int(value) for value in raw]
+            else:
+                values = [float(value) for value in raw]
+        except (TypeError, ValueError):
+            raise HTTPError(400, f'قيم غير صالحة للوسيط {name}')
+
+        if name == 't':
+            if not all(0 < t <= MAX_ZETA_HEIGHT for t in values):
+                raise HTTPError(400, f't يجب أن يكون في (0, {MAX_ZETA_HEIGHT:g}]')
+            return values
+        if not all(1 <= index <= MAX_ZETA_INDEX for index in indices):
+            raise HTTPError(400, f'رقم الصفر يجب أن يكون في [1, {MAX_ZETA_INDEX:,}]')
+        # أصفار جديدة تُحسب (وتُحفظ) على خيط العامل
+        zeros = await asyncio.get_running_loop().run_in_executor(
+            self.executor, get_zeta_dataset().zeros, max(indices))
+        return [float(zeros[index - 1]) for index in indices]
+
+    # ==================== التوجيه ====================
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        """تنفيذ طلب واحد وإعادة (رمز الحالة، كائن JSON)"""
+        url = urllib.parse.urlsplit(target)
+        path = url.path.strip('/')
+        if path == 'health':
+            return 200, {'status': 'ok'}
+        if path == 'metrics':
+            return 200, self.metrics()
+
+        endpoint = self.endpoints.get(path)
+        if endpoint is None:
+            raise HTTPError(404, f'نقطة غير معروفة: /{path}')
+        if method not in ('GET', 'POST'):
+            raise HTTPError(405, f'الطريقة {method} غير مدعومة')
+
+        start = time.perf_counter()
+        try:
+            values = endpoint.parse(endpoint.params, urllib.parse.parse_qs(url.query), body)
+            if asyncio.iscoroutine(values):
+                values = await values
+            if self.waiting + self.in_flight >= self.max_pending:
+                self.rejected += 1
+                raise HTTPError(503, 'الخدمة مشغولة، أعد المحاولة لاحقاً')
+
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            try:
+                results = await endpoint.coalescer.submit(values)
+            finally:
+                self.in_flight -= 1
+                self._semaphore.release()
+            return 200, {'results': results}
+        finally:
+            endpoint.latency.record(time.perf_counter() - start)
+
+    def metrics(self) -> Dict:
+        """مدرجات أزمنة الاستجابة وإحصاءات الدفعات والذاكرات المؤقتة"""
+        table = get_prime_table()
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'rejected': self.rejected,
+            'max_concurrency': self.max_concurrency,
+            'max_pending': self.max_pending,
+            'latency': {name: endpoint.latency.to_dict() for name, endpoint in self.endpoints.items()},
+            'batches': {name: endpoint.coalescer.stats() for name, endpoint in self.endpoints.items()},
+            'caches': cache_stats(),
+            'prime_table': {'limit': table.limit, 'primes': len(table.primes)},
+            'zeta_zeros': len(get_zeta_dataset()),
+        }
+
+    # ==================== HTTP ====================
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """اتصال HTTP/1.1 واحد (مع keep-alive)"""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, target, version, headers, body = request
+                    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                    status, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                writer.write(encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix: Optional[str] = None) -> asyncio.AbstractServer:
+        """بدء الاستماع (TCP على host:port، أو مقبس Unix إذا حُدد unix)"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if unix:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix: Optional[str] = None) -> None:
+        """الاستماع حتى الإيقاف"""
+        server = await self.start(host, port, unix)
+        address = unix or f'http://{host}:{port}'
+        print(f"🌐 خدمة الفتائل تستمع على {address}")
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=False)
+
+
+async def read_request(reader: asyncio.StreamReader):
+    """طلب HTTP واحد: (الطريقة، الهدف، الإصدار، الترويسات، الجسم)، أو None عند إغلاق الاتصال"""
+    try:
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise HTTPError(400, 'سطر طلب غير صالح')
+        method, target, version = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(400, 'ترويسات طويلة جداً')
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise HTTPError(400, 'Content-Length غير صالح')
+    if length > MAX_BODY:
+        raise HTTPError(413, f'جسم الطلب أكبر من {MAX_BODY:,} بايت')
+    body = await reader.readexactly(length) if length > 0 else b''
+    return method.upper(), target, version, headers, body
+
+
+def encode_response(status: int, payload: Dict, keep_alive: bool) -> bytes:
+    """استجابة HTTP/1.1 بجسم JSON"""
+    body = json.dumps(payload, cls=NumpyJSONEncoder, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f'address to listen on (default {DEFAULT_HOST})')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'TCP port (default {DEFAULT_PORT})')
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    parser.add_argument('--warm', type=int, default=DEFAULT_WARM, metavar='LIMIT',
+                        help=f'prime table limit loaded before serving (default {DEFAULT_WARM:,})')
+    parser.add_argument('--zeta-zeros', type=int, default=DEFAULT_ZETA_ZEROS, metavar='N',
+                        help=f'zeta zeros loaded before serving (default {DEFAULT_ZETA_ZEROS})')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f'requests computed at once (default {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING,
+                        help=f'requests queued before answering 503 (default {DEFAULT_MAX_PENDING})')
+    parser.add_argument('--batch-delay-ms', type=float, default=DEFAULT_BATCH_DELAY * 1e3,
+                        help=f'how long a batch waits for more requests (default {DEFAULT_BATCH_DELAY * 1e3:g} ms)')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH,
+                        help=f'values that flush a batch immediately (default {DEFAULT_MAX_BATCH})')
+    parser.add_argument('--max-values', type=int, default=DEFAULT_MAX_VALUES,
+                        help=f'values accepted per request (default {DEFAULT_MAX_VALUES:,})')
+    parser.add_argument('--max-bits', type=int, default=DEFAULT_MAX_BITS,
+                        help=f'largest accepted number in bits (default {DEFAULT_MAX_BITS})')
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """تشغيل الخدمة بالخيارات المحللة حتى Ctrl+C، وإعادة مقاييسها النهائية"""
+    service = FilamentService(warm=args.warm, zeta_zeros=args.zeta_zeros,
+                              max_concurrency=args.max_concurrency, max_pending=args.max_pending,
+                              batch_delay=args.batch_delay_ms / 1e3, max_batch=args.max_batch,
+                              max_values=args.max_values, max_bits=args.max_bits)
+    service.warm()
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("\n👋 تم إيقاف الخدمة")
+    finally:
+        service.close()
+    return service.metrics()
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Local Filament Theory calculation service")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+قياس مراحل التنفيذ - نظرية الفتائل
+Stage Instrumentation - Filament Theory
+
+مؤقتات مسماة وعدادات ومقاييس إنتاجية (أعداد أولية/ثانية، بايت/ثانية)
+تُضاف إلى النتائج ككتلة JSON باسم "metrics".
+
+    metrics = Metrics()
+    with metrics.timer('sieve'):
+        primes = ...
+    metrics.count('primes_sieved', len(primes))
+    metrics.throughput('sieve_primes_per_second', 'primes_sieved', 'sieve')
+
+عند التعطيل يُستخدم NULL_METRICS: كل استدعاء دالة فارغة وكل مؤقت سياق
+مشترك لا يفعل شيئاً، فتبقى التكلفة استدعاء دالة واحد لكل مرحلة.
+"""
+
+import bisect
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Tuple
+
+
+class Metrics:
+    """مؤقتات وعدادات ومقاييس إنتاجية لتشغيل واحد"""
+
+    enabled = True
+
+    def __init__(self):
+        self.timers: Dict[str, list] = {}
+        self.counters: Dict[str, int] = {}
+        self.gauges: Dict[str, Tuple[str, str]] = {}
+
+    @contextmanager
+    def timer(self, name: str):
+        """قياس زمن كتلة وإضافته إلى المؤقت name (يُجمع عبر الاستدعاءات)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """إضافة زمن مقاس مسبقاً إلى المؤقت name"""
+        entry = self.timers.get(name)
+        if entry is None:
+            self.timers[name] = [seconds, 1]
+        else:
+            entry[0] += seconds
+            entry[1] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        """زيادة العداد name بمقدار n"""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def throughput(self, name: str, counter: str, timer: str) -> None:
+        """تعريف مقياس إنتاجية: قيمة العداد مقسومة على زمن المؤقت"""
+        self.gauges[name] = (counter, timer)
+
+    def to_dict(self) -> Dict:
+        """كتلة المقاييس القابلة للتحويل إلى JSON"""
+        throughput = {}
+        for name, (counter, timer) in self.gauges.items():
+            seconds = self.timers.get(timer, (0.0, 0))[0]
+            if counter in self.counters and seconds > 0:
+                throughput[name] = self.counters[counter] / seconds
+        return {
+            'timers': {name: {'seconds': seconds, 'calls': calls}
+                       for name, (seconds, calls) in self.timers.items()},
+            'counters': dict(self.counters),
+            'throughput': throughput
+        }
+
+    def report(self) -> None:
+        """طباعة ملخص المقاييس"""
+        data = self.to_dict()
+        print("\n⏱️ مقاييس التنفيذ:")
+        for name, timer in sorted(data['timers'].items(), key=lambda item: -item[1]['seconds']):
+            print(f"   {name:<24} {timer['seconds']:10.4f} ثانية ({timer['calls']} استدعاء)")
+        for name, value in data['counters'].items():
+            print(f"   {name:<24} {value:,}")
+        for name, value in data['throughput'].items():
+            print(f"   {name:<24} {value:,.0f}")
+
+
+class NullMetrics(Metrics):
+    """مقاييس معطلة: جميع العمليات لا تفعل شيئاً"""
+
+    enabled = False
+    _null_context = nullcontext()
+
+    def timer(self, name: str):
+        return self._null_context
+
+    def add_time(self, name: str, seconds: float) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def throughput(self, name: str, counter: str, timer: str) -> None:
+        pass
+
+    def to_dict(self) -> Dict:
+        return {}
+
+    def report(self) -> None:
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+# حدود دلاء مدرج زمن الاستجابة: مضاعفات 2 من 0.1 ملي ثانية إلى ~52 ثانية
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(1e-4 * 2 ** i for i in range(20))
+
+
+class LatencyHistogram:
+    """
+    مدرج تكراري لأزمنة الاستجابة بدلاء لوغاريتمية ثابتة
+    Fixed log-2 buckets: constant memory, O(log buckets) per record, and
+    percentiles reported as the upper bound of the bucket they fall in
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts: List[int] = [0] * (len(bounds) + 1)
+        self.total = 0
+        self.seconds = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """تسجيل زمن استجابة واحد"""
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.total += 1
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """الحد الأعلى للدلو الذي يقع فيه المئين q (0-100)"""
+        if not self.total:
+            return 0.0
+        rank = q / 100 * self.total
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        """ملخص المدرج القابل للتحويل إلى JSON (الأزمنة بالملي ثانية)"""
+        buckets = {f'{bound * 1e3:g}': count for bound, count in zip(self.bounds, self.counts) if count}
+        if self.counts[-1]:
+            buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.total,
+            'mean_ms': self.seconds / self.total * 1e3 if self.total else 0.0,
+            'p50_ms': self.percentile(50) * 1e3,
+            'p90_ms': self.percentile(90) * 1e3,
+            'p99_ms': self.percentile(99) * 1e3,
+            'max_ms': self.max * 1e3,
+            'buckets_ms': buckets,
+        }
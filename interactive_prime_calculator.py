@@ -13,78 +13,98 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 
 import math
 import sys
+import numpy as np
 from typing import Dict, List
+from filament_core import is_primes, law_plan, make_record
+from primality import is_prime
+from prime_search import NUMPY_SAFE_LIMIT
+from result_writer import column_rows
+from prime_table import primes_between
+from property_cache import PropertyCache, get_property_cache
+
+# حقول calculate_filament_properties (اسم الحقل ← القانون)
+FILAMENT_PROPERTY_LAWS = {
+    'calculated_frequency': 'prime_frequency',
+    'theoretical_frequency': 'theoretical_frequency',
+    'frequency_error': 'frequency_error',
+    'balance_check': 'balance_check',
+    'balance_factor': 'balance_factor',
+    'temporal_dimension': 'temporal_dimension',
+    'spatial_radius': 'effective_radius',
+    'spherical_surface': 'spherical_surface_area',
+    'smoky_volume': 'smoky_volume',
+    'four_d_volume': 'four_d_volume',
+    'capacitive_root': 'capacitive_root',
+    'inductive_root': 'inductive_root',
+    'is_theory_confirmed': 'theory_confirmed',
+}
 
 class InteractiveFilamentCalculator:
     """حاسبة تفاعلية لنظرية الفتائل المؤكدة"""
     
-    def __init__(self):
+    def __init__(self, cache: PropertyCache = None, precision: int = None):
+        # دقة mpmath للأعداد فوق نطاق float (None = الدقة الافتراضية)
+        self.precision = precision
+        
+        # ذاكرة LRU مشتركة لنتائج الأعداد المطلوبة مراراً
+        if cache is None:
+            cache = get_property_cache('filament_properties' if precision is None
+                                       else f'filament_properties-dps{precision}')
+        self.property_cache = cache
+        
         # الثوابت المؤكدة
         self.fundamental_frequency = 1 / (4 * math.pi)  # 0.079577 هرتز
         self.filament_mass = 5.85881e-52  # كتلة الفتيلة
         self.planck_constant = 6.62607015e-34
+        self.laws = law_plan(FILAMENT_PROPERTY_LAWS, fundamental_frequency=self.fundamental_frequency)
         
         print("🌟 مرحباً بك في حاسبة الأعداد الأولية التفاعلية")
         print("🎯 نظرية الفتائل المؤكدة بدقة 100%")
         print("=" * 60)
     
     def is_prime(self, n: int) -> bool:
-        """فحص ما إذا كان العدد أولي"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
+        """فحص ما إذا كان العدد أولي (ميلر-رابين الحتمي / BPSW)"""
+        return is_prime(n)
     
     def calculate_filament_properties(self, prime: int) -> Dict:
-        """حساب خصائص الفتيلة للعدد الأولي"""
+        """حساب خصائص الفتيلة للعدد الأولي (من الذاكرة المؤقتة إن وُجد)"""
+        return self.property_cache.get(prime, self._compute_filament_properties)
+    
+    def _compute_filament_properties(self, prime: int) -> Dict:
+        # النتائج مشتركة عبر الذاكرة المؤقتة: سجلات للقراءة فقط
         if not self.is_prime(prime):
-            return {'error': f'{prime} ليس عدد أولي'}
+            return make_record({'error': f'{prime} ليس عدد أولي'})
         
-        # القوانين المؤكدة
-        calculated_freq = prime / math.pi  # تردد العدد الأولي
-        theoretical_freq = 4 * prime * self.fundamental_frequency  # التردد النظري
-        
-        # التوازن الفتائلي
-        balance_check = prime + (-prime)  # يجب أن يساوي 0
-        balance_factor = 1.0 if balance_check == 0 else 1.0 / (1.0 + abs(balance_check))
-        
-        # الأبعاد الأربعة
-        temporal_dimension = prime  # البعد الزمني
-        spatial_radius = 1.0  # نصف القطر الفعال
-        spherical_surface = 4 * math.pi * (spatial_radius ** 2)
-        smoky_volume = (4/3) * math.pi * (spatial_radius ** 3)
-        four_d_volume = smoky_volume * temporal_dimension
-        
-        # الجذور المتعامدة
-        capacitive_root = math.sqrt(prime)  # الجذر السعوي
-        inductive_root = math.sqrt(prime)   # الجذر الحثي
-        
-        # التحقق من الدقة
-        freq_error = abs(calculated_freq - theoretical_freq) / calculated_freq * 100
-        
-        return {
+        # القوانين المؤكدة (مُجمَّعة مرة واحدة في law_engine)
+        values = self.laws.scalar(prime, self.precision)
+        return make_record({
             'prime': prime,
             'is_valid_prime': True,
-            'calculated_frequency': calculated_freq,
-            'theoretical_frequency': theoretical_freq,
-            'frequency_error': freq_error,
-            'balance_check': balance_check,
-            'balance_factor': balance_factor,
-            'temporal_dimension': temporal_dimension,
-            'spatial_radius': spatial_radius,
-            'spherical_surface': spherical_surface,
-            'smoky_volume': smoky_volume,
-            'four_d_volume': four_d_volume,
-            'capacitive_root': capacitive_root,
-            'inductive_root': inductive_root,
-            'is_theory_confirmed': freq_error < 1e-10 and balance_factor == 1.0
-        }
+            **{name: values[name] for name in FILAMENT_PROPERTY_LAWS}
+        })
+    
+    def calculate_filament_properties_batch(self, numbers: List[int]) -> List[Dict]:
+        """
+        خصائص الفتيلة لقائمة أعداد (نفس نتائج calculate_filament_properties)
+        Cached results where available; the misses are checked with one batch
+        primality test and evaluated in one vectorized pass
+        """
+        return self.property_cache.get_many(numbers, self._compute_filament_properties_batch)
+    
+    def _compute_filament_properties_batch(self, numbers: List[int]) -> List[Dict]:
+        results = [None] * len(numbers)
+        prime_mask = is_primes(numbers)
+        vectorized = [i for i, n in enumerate(numbers)
+                      if prime_mask[i] and n < NUMPY_SAFE_LIMIT and self.precision is None]
+        if vectorized:
+            columns = self.laws(np.array([numbers[i] for i in vectorized], dtype=np.int64))
+            for i, values in zip(vectorized, column_rows(columns)):
+                results[i] = make_record({'prime': numbers[i], 'is_valid_prime': True, **values})
+        for i, n in enumerate(numbers):
+            if results[i] is None:
+                results[i] = (self._compute_filament_properties(n) if prime_mask[i]
+                              else make_record({'error': f'{n} ليس عدد أولي'}))
+        return results
     
     def display_results(self, result: Dict):
         """عرض النتائج بشكل جميل"""
@@ -163,37 +183,45 @@ class InteractiveFilamentCalculator:
         """تحليل عدد أولي واحد"""
         try:
             number = int(input("أدخل العدد للتحليل: "))
-            result = self.calculate_filament_properties(number)
-            self.display_results(result)
         except ValueError:
             print("❌ يرجى إدخال رقم صحيح")
+            return
+        self.analyze_prime(number)
+    
+    def analyze_prime(self, number: int) -> Dict:
+        """تحليل عدد واحد وعرض النتائج"""
+        result = self.calculate_filament_properties(number)
+        self.display_results(result)
+        return result
     
     def analyze_multiple_primes(self):
         """تحليل مجموعة من الأعداد الأولية"""
         try:
             start = int(input("أدخل بداية النطاق: "))
             end = int(input("أدخل نهاية النطاق: "))
-            
-            primes_found = []
-            for num in range(start, end + 1):
-                if self.is_prime(num):
-                    primes_found.append(num)
-            
-            if not primes_found:
-                print(f"❌ لا توجد أعداد أولية في النطاق {start}-{end}")
-                return
-            
-            print(f"\n🔢 الأعداد الأولية في النطاق {start}-{end}: {primes_found}")
-            
-            for prime in primes_found[:5]:  # عرض أول 5 فقط
-                result = self.calculate_filament_properties(prime)
-                self.display_results(result)
-                
-            if len(primes_found) > 5:
-                print(f"\n... وهناك {len(primes_found) - 5} أعداد أولية أخرى")
-                
         except ValueError:
             print("❌ يرجى إدخال أرقام صحيحة")
+            return
+        self.analyze_range(start, end)
+    
+    def analyze_range(self, start: int, end: int, show: int = 5) -> List[int]:
+        """تحليل الأعداد الأولية في نطاق وعرض أول show منها"""
+        # شريحة من جدول الأعداد الأولية المحفوظ على القرص
+        primes_found = primes_between(start, end).tolist()
+        
+        if not primes_found:
+            print(f"❌ لا توجد أعداد أولية في النطاق {start}-{end}")
+            return primes_found
+        
+        print(f"\n🔢 الأعداد الأولية في النطاق {start}-{end}: {primes_found}")
+        
+        for prime in primes_found[:show]:  # عرض أول show فقط
+            result = self.calculate_filament_properties(prime)
+            self.display_results(result)
+            
+        if len(primes_found) > show:
+            print(f"\n... وهناك {len(primes_found) - show} أعداد أولية أخرى")
+        return primes_found
     
     def show_theory_info(self):
         """عرض معلومات النظرية"""
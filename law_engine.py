@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""
+محرك قوانين نظرية الفتائل المُجمَّعة
+Compiled Law-Expression Engine - Filament Theory
+
+كل قانون لكل عدد أولي (القوانين 1-6 و 10 في "قوانين_نظرية_الفتائل_الكاملة.md")
+مُعرَّف هنا مرة واحدة كتعبير. compile_laws يحوّل أي مجموعة من القوانين إلى
+خطة تقييم واحدة:
+
+- حذف التعابير المشتركة (CSE): كل تعبير فرعي متطابق يُحسب مرة واحدة
+- طي الثوابت: كل تعبير فرعي لا يعتمد على العدد الأولي (مثل تصحيح الكتلة
+  √(h/(4πm)) أو حجم الحالة الدخانية) يُحسب مرة واحدة عند التجميع
+- توليد دالة Python واحدة بالخطوات المتبقية بالترتيب، تعمل على مصفوفات
+  NumPy (تمريرة واحدة على المصفوفة مع تحرير المؤقتات بعد آخر استخدام)
+  وعلى أعداد Python المفردة بنفس الكود
+
+    plan = compile_laws(['resonance_frequency', 'cavity_depth'], params)
+    columns = plan(primes)            # قاموس أعمدة NumPy
+    values = plan.scalar(97)          # سجل LawRecord بقيم Python (يُقرأ كقاموس)
+
+الأعداد الأكبر من BIG_THRESHOLD (أو عبر plan.big) تُقيَّم بوضع الأعداد
+الكبيرة: نفس الكود بأعداد Python الصحيحة و mpmath بدقة قابلة للضبط، فلا
+تتجاوز القوانين نطاق float (~10^308) ولا تفقد دقتها لأعداد بآلاف الخانات.
+الثوابت المطوية تُعاد حسابها بالدقة نفسها: π هي mpmath.pi، والثوابت الفيزيائية
+mpf من قيمتها العشرية، والتردد الأساسي 1/(4π) من تعريفه الدقيق (EXACT_PARAMS).
+
+    values = plan.scalar(2**4423 - 1)           # mpmath.mpf بالدقة الافتراضية
+    values = plan.big(97, precision=60)         # وضع الأعداد الكبيرة قسراً
+
+قيمة في قاموس المخرجات يمكن أن تكون قاموساً بدورها، فيُعاد قاموس (أو سجل) متداخل
+بنفس الشكل (مثل four_dimensional_properties في خصائص الحفرة).
+
+نتيجة العدد المفرد سجل LawRecord بحقول __slots__ (صنف لكل مجموعة حقول) بدل
+قاموس بـ 18-21 مفتاحاً (الحاوية 176 بايت بدل 464 لخصائص الحفرة، وحوالي
+40% أقل لكل سجل مع قيمه)، ويُقرأ كالقاموس
+تماماً (record['field']، keys، items، **record، المقارنة مع قاموس)، ولا
+يُحوَّل إلى قاموس إلا عند التصدير (to_dict، أو JSON عبر NumpyJSONEncoder).
+
+لا يُعاد ترتيب العمليات الحسابية (لا تجميع ولا تبديل)، فالنتائج مطابقة
+بتاً ببت للصيغ المكتوبة يدوياً بنفس الترتيب.
+"""
+
+import keyword
+import math
+import os
+import numpy as np
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+# إصدار مجموعة القوانين: يُرفع عند تغيير أي قانون فتبطل النتائج المخزنة به
+LAW_VERSION = 1
+
+# الدقة الافتراضية لوضع الأعداد الكبيرة (خانات عشرية معنوية في mpmath)
+DEFAULT_PRECISION = 30
+
+# متغير البيئة لتحديد الدقة الافتراضية
+PRECISION_ENV_VAR = 'FILAMENT_PRECISION'
+
+# فوق هذا الحد يُستخدم وضع الأعداد الكبيرة تلقائياً: بعض القوانين تنمو أسرع
+# من العدد نفسه (قوة الإشعاع الوتري ~ p^1.25 × 10^58) فتتجاوز نطاق float
+BIG_THRESHOLD = 2.0 ** 512
+
+
+def default_precision() -> int:
+    """الدقة الافتراضية (من متغير البيئة إن وُجد)"""
+    value = os.environ.get(PRECISION_ENV_VAR)
+    if value is None or not value.strip():
+        return DEFAULT_PRECISION
+    return max(1, int(value))
+
+
+# ==================== التعابير ====================
+
+class Expr:
+    """عقدة تعبير غير قابلة للتغيير: عملية ومعاملات"""
+
+    __slots__ = ('op', 'args', 'key')
+
+    def __init__(self, op: str, *args):
+        self.op = op
+        self.args = args
+        if op == 'const':
+            value = args[0]
+            self.key = ('const', type(value).__name__, repr(value))
+        elif op in ('var', 'param'):
+            self.key = (op, args[0])
+        else:
+            self.key = (op,) + tuple(arg.key for arg in args)
+
+    def __add__(self, other): return Expr('add', self, lift(other))
+    def __radd__(self, other): return Expr('add', lift(other), self)
+    def __sub__(self, other): return Expr('sub', self, lift(other))
+    def __rsub__(self, other): return Expr('sub', lift(other), self)
+    def __mul__(self, other): return Expr('mul', self, lift(other))
+    def __rmul__(self, other): return Expr('mul', lift(other), self)
+    def __truediv__(self, other): return Expr('div', self, lift(other))
+    def __rtruediv__(self, other): return Expr('div', lift(other), self)
+    def __pow__(self, other): return Expr('pow', self, lift(other))
+    def __neg__(self): return Expr('neg', self)
+    def __and__(self, other): return Expr('and', self, lift(other))
+    def __lt__(self, other): return Expr('lt', self, lift(other))
+    def __gt__(self, other): return Expr('gt', self, lift(other))
+    def eq(self, other): return Expr('eq', self, lift(other))
+
+    def __repr__(self):
+        if self.op in ('const', 'var', 'param'):
+            return f"{self.op}({self.args[0]!r})"
+        return f"{self.op}({', '.join(map(repr, self.args))})"
+
+
+def lift(value) -> Expr:
+    """تحويل ثابت Python إلى عقدة"""
+    return value if isinstance(value, Expr) else Expr('const', value)
+
+
+def const(value) -> Expr:
+    return Expr('const', value)
+
+
+def param(name: str) -> Expr:
+    """ثابت فيزيائي يُربط بقيمته عند التجميع"""
+    return Expr('param', name)
+
+
+def sqrt(x) -> Expr: return Expr('sqrt', lift(x))
+def absolute(x) -> Expr: return Expr('abs', lift(x))
+def cos(x) -> Expr: return Expr('cos', lift(x))
+def sin(x) -> Expr: return Expr('sin', lift(x))
+def to_float(x) -> Expr: return Expr('float', lift(x))
+def where(condition, a, b) -> Expr: return Expr('where', lift(condition), lift(a), lift(b))
+
+
+# قوالب الكود لكل عملية
+_TEMPLATES = {
+    'add': '{0} + {1}', 'sub': '{0} - {1}', 'mul': '{0} * {1}', 'div': '_div({0}, {1})',
+    'pow': '{0} ** {1}', 'neg': '-{0}', 'and': '{0} & {1}',
+    'lt': '{0} < {1}', 'gt': '{0} > {1}', 'eq': '{0} == {1}',
+    'sqrt': '_sqrt({0})', 'abs': '_abs({0})', 'cos': '_cos({0})', 'sin': '_sin({0})',
+    'float': '_float({0})', 'where': '_where({0}, {1}, {2})', 'pi': '_pi',
+}
+
+
+# للأعداد المفردة: عمليات Python المباشرة بدلاً من استدعاء دوال مساعدة
+_SCALAR_TEMPLATES = dict(_TEMPLATES, div='{0} / {1}', where='({1} if {0} else {2})')
+
+
+def _scalar_div(a, b):
+    """قسمة بأعداد Python بنفس نتيجة NumPy عند القسمة على صفر"""
+    if b:
+        return a / b
+    return math.copysign(math.inf, a) if a else math.nan
+
+
+_SCALAR_NAMESPACE = {
+    '_div': _scalar_div, '_sqrt': math.sqrt, '_abs': abs, '_cos': math.cos, '_sin': math.sin,
+    '_float': float, '_where': lambda condition, a, b: a if condition else b, '_pi': math.pi,
+}
+
+def _big_namespace() -> Dict:
+    """دوال وضع الأعداد الكبيرة (mpmath يُستورد عند أول استخدام فقط)"""
+    import mpmath
+    return dict(_SCALAR_NAMESPACE, _sqrt=mpmath.sqrt, _cos=mpmath.cos, _sin=mpmath.sin,
+                _float=mpmath.mpf, _pi=mpmath.pi, _div=lambda a, b: _scalar_div(mpmath.mpf(a), b))
+
+
+def _exact_value(node: Expr, namespace: Dict):
+    """
+    قيمة تعبير ثابت بدوال namespace (وضع الأعداد الكبيرة: بدقة mpmath الحالية)
+    float literals become mpf from their decimal repr, so 1e50 or
+    6.62607015e-34 are exact rather than their nearest binary double
+    """
+    if node.op == 'const':
+        value = node.args[0]
+        return namespace['_float'](repr(value)) if isinstance(value, float) else value
+    args = [_exact_value(arg, namespace) for arg in node.args]
+    code = _TEMPLATES[node.op].format(*(f'_c{i}' for i in range(len(args))))
+    return eval(code, dict(namespace, **{f'_c{i}': arg for i, arg in enumerate(args)}))
+
+
+_ARRAY_NAMESPACE = {
+    '_div': np.true_divide, '_sqrt': np.sqrt, '_abs': np.abs, '_cos': np.cos, '_sin': np.sin,
+    '_float': lambda x: x.astype(np.float64), '_where': np.where,
+}
+
+
+# ==================== القوانين ====================
+
+prime = Expr('var', 'prime')
+p = to_float(prime)
+PI = Expr('pi')  # يُطوى إلى math.pi، وإلى mpmath.pi في وضع الأعداد الكبيرة
+
+FILAMENT_MASS = param('filament_mass')
+PLANCK_CONSTANT = param('planck_constant')
+FUNDAMENTAL_FREQUENCY = param('fundamental_frequency')
+
+# التعريف الدقيق لثوابت معرّفة بتعبير: إذا ساوت القيمة المربوطة قيمته float
+# استُخدم التعبير نفسه في وضع الأعداد الكبيرة بدل تقريبه العشري
+EXACT_PARAMS: Dict[str, Expr] = {'fundamental_frequency': 1 / (4 * PI)}
+
+# الحد الأدنى لاعتبار خطأ التردد صفراً
+FREQUENCY_TOLERANCE = 1e-10
+
+# حد خطأ التردد (نسبة مئوية) في اختبار العلاقة الأساسية الموسع
+RELATION_TOLERANCE = 0.001
+
+LAWS: Dict[str, Expr] = {}
+
+
+def law(name: str, expr) -> Expr:
+    """تسجيل قانون باسمه وإعادته لاستخدامه في القوانين التالية"""
+    if name in LAWS:
+        raise ValueError(f"القانون معرّف مسبقاً: {name}")
+    LAWS[name] = lift(expr)
+    return LAWS[name]
+
+
+law('prime', prime)
+
+# القانون الأول: تردد العدد الأولي f_p = p/π
+prime_frequency = law('prime_frequency', p / PI)
+
+# القانون الثاني: العلاقة الأساسية p/π = 4p × (1/(4π))
+law('fundamental_frequency', FUNDAMENTAL_FREQUENCY)
+theoretical_frequency = law('theoretical_frequency', 4 * p * FUNDAMENTAL_FREQUENCY)
+frequency_error = law('frequency_error',
+                      absolute(prime_frequency - theoretical_frequency) / prime_frequency * 100)
+law('frequency_match_error', absolute(theoretical_frequency - prime_frequency) / prime_frequency * 100)
+
+# القانون الثالث: التوازن الفتائلي p + n = 0
+prime_negative = law('prime_negative', -prime)
+balance_check = law('balance_check', prime + prime_negative)
+balance_factor = law('balance_factor',
+                     where(balance_check.eq(0), 1.0, 1.0 / (1.0 + absolute(balance_check))))
+
+# القانون الرابع: الأبعاد الأربعة (البعد الزمني = p، ثلاث حلقات مكانية)
+temporal_dimension = law('temporal_dimension', prime)
+sqrt_p = sqrt(p)
+law('spatial_ring_x', sqrt_p * cos(0))
+law('spatial_ring_y', sqrt_p * cos(PI / 2))
+law('spatial_ring_z', sqrt_p * cos(PI))
+
+# القانون الخامس: الحالة الدخانية (نصف قطر = 1 وحدة أساسية)
+effective_radius = law('effective_radius', const(1.0))
+law('spherical_surface_area', 4 * PI * (effective_radius ** 2))
+smoky_volume = law('smoky_volume', const(4) / 3 * PI * (effective_radius ** 3))
+law('smoky_density', FILAMENT_MASS / smoky_volume)
+four_d_volume = law('four_d_volume', smoky_volume * p)
+
+# القانون السادس: الجذور المتعامدة √p × √p بزاوية 90°
+capacitive_root = law('capacitive_root', sqrt_p * cos(0))
+inductive_root = law('inductive_root', sqrt(to_float(absolute(prime_negative))) * sin(PI / 2))
+orthogonal_angle = law('orthogonal_angle', const(90.0))
+
+# تردد الرنين مع تصحيح كتلة الفتيلة والحالة الدخانية (ثابت يُطوى عند التجميع)
+filament_correction = law('filament_correction', sqrt(PLANCK_CONSTANT / (4 * PI * FILAMENT_MASS)))
+resonance_frequency = law('resonance_frequency', prime_frequency * (1 + filament_correction * 1e50))
+
+# خصائص الحفرة الفتائلية
+material_capacitance = law('material_capacitance', capacitive_root / p)
+material_inductance = law('material_inductance', inductive_root * absolute(prime_negative) / capacitive_root)
+cavity_depth = law('cavity_depth', sqrt(material_capacitance * material_inductance))
+law('string_radiation_strength', resonance_frequency * cavity_depth)
+balance_energy = law('balance_energy', absolute(balance_check) * PLANCK_CONSTANT * resonance_frequency)
+law('cavity_energy_density', where(four_d_volume > 0, balance_energy / four_d_volume, 0.0))
+law('frequency_energy_density', where(four_d_volume > 0, PLANCK_CONSTANT * prime_frequency / four_d_volume, 0.0))
+
+# القانون العاشر: فحص الأعداد الأولية
+is_frequency_valid = law('is_frequency_valid', frequency_error < FREQUENCY_TOLERANCE)
+is_balance_valid = law('is_balance_valid', balance_factor.eq(1.0))
+is_orthogonal_valid = law('is_orthogonal_valid', absolute(orthogonal_angle - 90.0) < FREQUENCY_TOLERANCE)
+is_four_d_valid = law('is_four_d_valid', four_d_volume > 0)
+law('theory_confirmed', is_frequency_valid & is_balance_valid)
+law('relation_valid', (frequency_error < RELATION_TOLERANCE) & is_balance_valid)
+law('overall_valid', is_frequency_valid & is_balance_valid & is_orthogonal_valid & is_four_d_valid)
+
+
+# ==================== السجلات ====================
+
+class LawRecord(Mapping):
+    """
+    سجل نتائج عدد أولي واحد: خانة __slots__ لكل حقل بدل قاموس
+    Compact per-prime result that reads like the dict it replaces
+    (record['field'], keys/items/values, **record, == dict). Records are
+    read-only since caches share them: to_dict() gives a mutable copy
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    _field_set: frozenset = frozenset()
+    _build: Callable = None
+
+    def __new__(cls, *values):
+        return cls._build(*values)
+
+    def __getitem__(self, key):
+        if key in self._field_set:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key) -> bool:
+        return key in self._field_set
+
+    def to_dict(self) -> Dict:
+        """قاموس عادي (والسجلات المتداخلة قواميس أيضاً)"""
+        return {name: value.to_dict() if isinstance(value, LawRecord) else value
+                for name, value in zip(self._fields, map(self.__getattribute__, self._fields))}
+
+    def copy(self) -> Dict:
+        return self.to_dict()
+
+    def __reduce__(self):
+        # الأصناف مولَّدة عند التشغيل: تُنقل بين العمليات كقواميس
+        return dict, (self.to_dict(),)
+
+    def __repr__(self) -> str:
+        return f'LawRecord({self.to_dict()!r})'
+
+
+_record_types: Dict[Tuple[str, ...], type] = {}
+
+
+def _read_only(self, name, *value):
+    raise AttributeError(f"السجل للقراءة فقط: {name} (to_dict() تعطي نسخة قابلة للتعديل)")
+
+
+def record_fields_valid(outputs: Mapping) -> bool:
+    """هل تصلح أسماء المخرجات (والمتداخلة) أسماءً لخانات السجل؟"""
+    return all(isinstance(name, str) and name.isidentifier() and not keyword.iskeyword(name)
+               and not hasattr(LawRecord, name)
+               and (record_fields_valid(law) if isinstance(law, Mapping) else True)
+               for name, law in outputs.items())
+
+
+def record_type(fields: Iterable[str]) -> type:
+    """
+    صنف سجل بهذه الحقول بالترتيب (واحد لكل مجموعة حقول)
+    The constructor _build is generated like the law functions: positional
+    values stored straight into the slots of a writable twin class, which
+    then becomes the read-only class (a custom __setattr__ would slow every
+    store down)
+    """
+    fields = tuple(fields)
+    cls = _record_types.get(fields)
+    if cls is None:
+        writable = type('LawRecord', (LawRecord,), {'__slots__': fields, '__module__': __name__})
+        values = [f'_{i}' for i in range(len(fields))]
+        body = [f'    self.{name} = {value}' for name, value in zip(fields, values)]
+        scope = {'_new': object.__new__, '_writable': writable}
+        exec('\n'.join([f'def _build({", ".join(values)}):', '    self = _new(_writable)'] + body
+                       + ['    self.__class__ = _cls', '    return self']) + '\n', scope)
+        cls = type('LawRecord', (writable,), {'__slots__': (), '_fields': fields,
+                                              '_field_set': frozenset(fields),
+                                              '_build': staticmethod(scope['_build']),
+                                              '__setattr__': _read_only, '__delattr__': _read_only,
+                                              '__module__': __name__})
+        scope['_cls'] = cls
+        _record_types[fields] = cls
+    return cls
+
+
+def make_record(values: Mapping) -> LawRecord:
+    """سجل من قاموس قيم (والقواميس المتداخلة سجلات)"""
+    return record_type(values)._build(*(make_record(value) if isinstance(value, Mapping) else value
+                                        for value in values.values()))
+
+
+# ==================== التجميع ====================
+
+LawSelection = Union[None, Iterable[str], Mapping[str, Union[str, Mapping]]]
+
+
+class LawPlan:
+    """
+    خطة تقييم مُجمَّعة لمجموعة قوانين
+    A compiled evaluation plan: one generated function, constants folded,
+    shared subexpressions computed once
+    """
+
+    def __init__(self, outputs: Dict[str, Union[str, Mapping]], params: Dict[str, float]):
+        self.outputs = dict(outputs)  # اسم المخرج ← اسم القانون (أو قاموس متداخل)
+        self.params = dict(params)
+        self._nodes: Dict[tuple, Expr] = {}
+        self._steps: List[Tuple[str, Expr]] = []
+        self._names: Dict[tuple, str] = {}
+        # الثابت المطوي ← تعبيره قبل الطي (لإعادة حسابه بدقة وضع الأعداد الكبيرة)
+        self._exact: Dict[tuple, Expr] = {}
+        self._constant_keys: Dict[str, tuple] = {}
+
+        roots = self._roots(self.outputs)
+        for root in _leaves(roots):
+            self._schedule(root)
+
+        self.constants = {name: node.args[0] for name, node in roots.items()
+                          if isinstance(node, Expr) and node.op == 'const'}
+        self._constants: Dict[str, object] = {}
+        # النتائج المفردة سجلات LawRecord (قواميس إن لم تصلح الأسماء خانات)
+        self.records = record_fields_valid(self.outputs)
+        self.source = self._generate(roots, _TEMPLATES, release=True)
+        self.scalar_source = self._generate(roots, _SCALAR_TEMPLATES, release=False, records=self.records)
+        self._array_fn = self._build(self.source, _ARRAY_NAMESPACE)
+        self._scalar_fn = self._build(self.scalar_source, _SCALAR_NAMESPACE)
+        self._big_fns: Dict[int, Callable] = {}
+
+    @property
+    def steps(self) -> int:
+        """عدد العمليات المتبقية لكل تقييم بعد الطي والحذف"""
+        return len(self._steps)
+
+    def _roots(self, outputs: Mapping) -> Dict:
+        return {name: self._roots(law) if isinstance(law, Mapping) else self._fold(LAWS[law])
+                for name, law in outputs.items()}
+
+    def _fold(self, node: Expr) -> Expr:
+        """ربط الثوابت الفيزيائية وطي التعابير الثابتة وتوحيد المتطابقة"""
+        if node.key in self._nodes:
+            return self._nodes[node.key]
+        if node.op == 'param':
+            name = node.args[0]
+            if name not in self.params:
+                raise ValueError(f"قيمة الثابت غير محددة: {name}")
+            folded = const(self.params[name])
+            if name in EXACT_PARAMS and self._fold(EXACT_PARAMS[name]).args[0] == folded.args[0]:
+                folded = self._fold(EXACT_PARAMS[name])
+        elif node.op in ('const', 'var'):
+            folded = node
+        else:
+            args = [self._fold(arg) for arg in node.args]
+            if all(arg.op == 'const' for arg in args):
+                code = _TEMPLATES[node.op].format(*(f'_c{i}' for i in range(len(args))))
+                namespace = dict(_SCALAR_NAMESPACE, **{f'_c{i}': arg.args[0] for i, arg in enumerate(args)})
+                folded = const(eval(code, namespace))
+                self._exact.setdefault(folded.key, Expr(node.op, *(self._exact.get(arg.key, arg) for arg in args)))
+            else:
+                folded = Expr(node.op, *args)
+        folded = self._nodes.setdefault(folded.key, folded)
+        self._nodes[node.key] = folded
+        return folded
+
+    def _schedule(self, node: Expr) -> None:
+        """ترتيب الخطوات طوبولوجياً (كل عقدة مرة واحدة)"""
+        if node.key in self._names or node.op == 'const':
+            return
+        if node.op == 'var':
+            self._names[node.key] = node.args[0]
+            return
+        for arg in node.args:
+            self._schedule(arg)
+        name = f't{len(self._steps)}'
+        self._names[node.key] = name
+        self._steps.append((name, node))
+
+    def _operand(self, node: Expr, constants: Dict[str, object]) -> str:
+        if node.op == 'const':
+            name = f'_k{len(constants)}'
+            constants[name] = node.args[0]
+            self._constant_keys[name] = node.key
+            return name
+        return self._names[node.key]
+
+    def _generate(self, roots: Dict[str, Expr], templates: Dict[str, str], release: bool,
+                  records: bool = False) -> str:
+        """
+        توليد كود الدالة؛ الثوابت والدوال المساعدة تُربط كمتغيرات محلية،
+        و release يحرر المؤقتات (مصفوفات) بعد آخر استخدام، و records يعيد
+        سجلات LawRecord بدل القواميس
+        """
+        outputs = {self._names.get(node.key) for node in _leaves(roots)}
+        last_use = {}
+        for index, (_, node) in enumerate(self._steps):
+            for arg in node.args:
+                if arg.op not in ('const', 'var'):
+                    last_use[self._names[arg.key]] = index
+
+        body = []
+        for index, (name, node) in enumerate(self._steps):
+            operands = [self._operand(arg, self._constants) for arg in node.args]
+            body.append(f'    {name} = {templates[node.op].format(*operands)}')
+            dead = [arg for arg, last in last_use.items() if last == index and arg not in outputs]
+            if release and dead:
+                body.append(f'    del {", ".join(sorted(dead))}')
+        body.append(f'    return {self._record(roots) if records else self._literal(roots)}')
+
+        bound = ', '.join(f'{name}={name}' for name in list(_ARRAY_NAMESPACE) + list(self._constants))
+        return '\n'.join([f'def evaluate(prime, {bound}):'] + body) + '\n'
+
+    def _literal(self, roots: Dict) -> str:
+        items = ', '.join(f'{name!r}: {self._literal(node) if isinstance(node, dict) else self._operand(node, self._constants)}'
+                          for name, node in roots.items())
+        return f'{{{items}}}'
+
+    def _record(self, roots: Dict) -> str:
+        name = f'_R{len(self._constants)}'
+        self._constants[name] = record_type(roots)._build
+        values = ', '.join(self._record(node) if isinstance(node, dict) else self._operand(node, self._constants)
+                           for node in roots.values())
+        return f'{name}({values})'
+
+    def _build(self, source: str, namespace: Dict, constants: Optional[Dict] = None):
+        scope = dict(namespace, **(self._constants if constants is None else constants))
+        exec(compile(source, f'<laws {sorted(self.outputs)}>', 'exec'), scope)
+        return scope['evaluate']
+
+    def __call__(self, primes) -> Dict[str, np.ndarray]:
+        """
+        تقييم القوانين على مصفوفة أعداد أولية في تمريرة واحدة
+        Evaluate over a prime array; constant laws come back as broadcast views
+        """
+        primes = np.asarray(primes, dtype=np.int64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return _broadcast(self._array_fn(primes), primes.shape)
+
+    def scalar(self, prime: int, precision: Optional[int] = None) -> LawRecord:
+        """
+        تقييم القوانين لعدد أولي واحد بقيم Python عادية في سجل LawRecord
+        (بوضع الأعداد الكبيرة بدقة precision فوق BIG_THRESHOLD)
+        """
+        if not -BIG_THRESHOLD < prime < BIG_THRESHOLD:
+            return self.big(prime, precision)
+        try:
+            return self._scalar_fn(prime)
+        except ZeroDivisionError:
+            # مدخلات منحطة (مثل 0): نفس نتائج NumPy (inf / nan / فرع where الآخر)
+            values = _items(self(np.asarray(prime)))
+            return make_record(values) if self.records else values
+
+    def big(self, prime: int, precision: Optional[int] = None) -> LawRecord:
+        """
+        تقييم بأعداد صحيحة بلا حدود و mpmath بدقة precision خانة
+        Arbitrary-size evaluation: integer laws stay exact Python ints,
+        real-valued laws are mpmath.mpf at the working precision (folded
+        constants included, recomputed once per precision)
+        """
+        import mpmath
+        with mpmath.workdps(precision or default_precision()):
+            fn = self._big_fns.get(mpmath.mp.prec)
+            if fn is None:
+                namespace = _big_namespace()
+                constants = dict(self._constants)
+                for name, key in self._constant_keys.items():
+                    constants[name] = _exact_value(self._exact.get(key, const(constants[name])), namespace)
+                fn = self._big_fns[mpmath.mp.prec] = self._build(self.scalar_source, namespace, constants)
+            return fn(int(prime))
+
+    def evaluate(self, prime, precision: Optional[int] = None) -> Dict:
+        """مصفوفات NumPy → أعمدة، وأعداد Python → قيم مفردة"""
+        return self(prime) if isinstance(prime, np.ndarray) else self.scalar(prime, precision)
+
+
+def _leaves(roots: Dict) -> Iterable[Expr]:
+    for node in roots.values():
+        if isinstance(node, dict):
+            yield from _leaves(node)
+        else:
+            yield node
+
+
+def _broadcast(values: Dict, shape: tuple) -> Dict:
+    for name, value in values.items():
+        if isinstance(value, dict):
+            _broadcast(value, shape)
+        elif not isinstance(value, np.ndarray) or value.shape != shape:
+            values[name] = np.broadcast_to(value, shape)
+    return values
+
+
+def _items(values: Dict) -> Dict:
+    return {name: _items(value) if isinstance(value, dict) else value.item()
+            for name, value in values.items()}
+
+
+def _freeze(outputs: Mapping) -> tuple:
+    return tuple((name, _freeze(law) if isinstance(law, Mapping) else law)
+                 for name, law in outputs.items())
+
+
+def _law_names(outputs: Mapping) -> Iterable[str]:
+    for law in outputs.values():
+        if isinstance(law, Mapping):
+            yield from _law_names(law)
+        else:
+            yield law
+
+
+_plans: Dict[tuple, LawPlan] = {}
+
+
+def law_names() -> List[str]:
+    """أسماء جميع القوانين المعرّفة"""
+    return list(LAWS)
+
+
+def compile_laws(names: LawSelection = None, params: Optional[Mapping[str, float]] = None) -> LawPlan:
+    """
+    تجميع مجموعة قوانين (مع التخزين حسب المجموعة وقيم الثوابت)
+    names: law names, or a {output_key: law_name} mapping to rename outputs,
+    where a value may itself be such a mapping for a nested group
+    (default: every law); params binds the physical constants
+    """
+    if names is None:
+        outputs = {name: name for name in LAWS}
+    elif isinstance(names, Mapping):
+        outputs = dict(names)
+    else:
+        outputs = {name: name for name in names}
+    unknown = sorted(set(_law_names(outputs)) - set(LAWS))
+    if unknown:
+        raise KeyError(f"قوانين غير معروفة: {unknown}")
+
+    params = dict(params or {})
+    key = (_freeze(outputs), tuple(sorted(params.items())))
+    if key not in _plans:
+        _plans[key] = LawPlan(outputs, params)
+    return _plans[key]
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+اختبار لوكاس-ليمر لأعداد مرسين - نظرية الفتائل
+Lucas–Lehmer Test for Mersenne Numbers - Filament Theory
+
+M_p = 2^p - 1 أولي (لـ p > 2) إذا وفقط إذا كان s_(p-2) ≡ 0 (mod M_p) حيث
+s_0 = 4 و s_(k+1) = s_k² - 2. كل تكرار تربيع عدد صحيح كبير ثم اختزال بمقياس
+2^p - 1 بالإزاحة والجمع فقط (x mod M_p = (x & M_p) + (x >> p)) بدون قسمة.
+
+    python lucas_lehmer.py 521 607 1279 4423
+    python lucas_lehmer.py --range 2 5000 --workers 8 --metrics
+    python lucas_lehmer.py 86243 --checkpoint-seconds 30
+
+الاختبارات الطويلة تحفظ نقطة استئناف (رقم التكرار والباقي) كل بضع دقائق في
+ملف مستقل لكل أس، فيُستأنف التشغيل المقطوع من آخر نقطة بدلاً من البداية.
+الأسس المستقلة تُوزع على مجمع عمليات. إذا كانت gmpy2 مثبتة تُجرى
+التكرارات بأعداد mpz (نفس العمليات، تربيع أسرع بكثير للأسس الكبيرة).
+"""
+
+import argparse
+import json
+import os
+import time
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from instrumentation import Metrics, NULL_METRICS
+from primality import is_prime
+
+try:
+    import gmpy2
+except ImportError:  # اختيارية: أعداد Python الصحيحة
+    gmpy2 = None
+
+LL_CHECKPOINT_FORMAT = 'filament-lucas-lehmer'
+LL_CHECKPOINT_VERSION = 1
+METADATA_KEY = '__metadata__'
+
+# الفاصل الزمني الافتراضي بين نقاط الاستئناف (ثوانٍ)
+CHECKPOINT_SECONDS = 300
+
+# عدد التكرارات بين فحوص الوقت (لنقاط الاستئناف وتقارير التقدم)
+CHECK_EVERY = 256
+
+# متغير البيئة لتحديد مجلد نقاط الاستئناف، والقيم "" أو "off" تعطلها
+CHECKPOINT_ENV_VAR = 'FILAMENT_LL_CHECKPOINTS'
+
+# أسس أعداد مرسين الأولية المعروفة حتى 10000 (للتحقق السريع)
+KNOWN_MERSENNE_EXPONENTS = (2, 3, 5, 7, 13, 17, 19, 31, 61, 89, 107, 127, 521, 607,
+                            1279, 2203, 2281, 3217, 4253, 4423, 9689, 9941)
+
+
+def default_checkpoint_dir() -> Optional[str]:
+    """المجلد الافتراضي لنقاط الاستئناف (None إذا كانت معطلة)"""
+    path = os.environ.get(CHECKPOINT_ENV_VAR)
+    if path is not None:
+        return None if path.strip().lower() in ('', 'off', '0') else path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'filament_theory', 'lucas-lehmer')
+
+
+def checkpoint_file(checkpoint_dir: str, exponent: int) -> str:
+    """ملف مستقل لكل أس"""
+    return os.path.join(checkpoint_dir, f'll-v{LL_CHECKPOINT_VERSION}-p{exponent}.npz')
+
+
+def read_checkpoint(path: str, exponent: int) -> Optional[Tuple[int, int]]:
+    """
+    قراءة نقطة استئناف
+    Return (iteration, residue), or None if absent, invalid or for another exponent
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data[METADATA_KEY]))
+            if (metadata.get('format') != LL_CHECKPOINT_FORMAT
+                    or metadata.get('version') != LL_CHECKPOINT_VERSION
+                    or metadata.get('exponent') != exponent):
+                return None
+            residue = int.from_bytes(data['residue'].tobytes(), 'little')
+    except (OSError, KeyError, ValueError):
+        return None
+    iteration = metadata.get('iteration')
+    if not isinstance(iteration, int) or not 0 <= iteration <= exponent - 2 or residue >> exponent:
+        return None
+    return iteration, residue
+
+
+def write_checkpoint(path: str, exponent: int, iteration: int, residue: int) -> None:
+    """كتابة نقطة الاستئناف في ملف مؤقت ثم استبداله (لا يبقى ملف نصف مكتوب)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    metadata = {
+        'format': LL_CHECKPOINT_FORMAT,
+        'version': LL_CHECKPOINT_VERSION,
+        'exponent': exponent,
+        'iteration': iteration,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, residue=np.frombuffer(residue.to_bytes((exponent + 7) // 8, 'little'), dtype=np.uint8),
+                 **{METADATA_KEY: np.array(json.dumps(metadata))})
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def lucas_lehmer_residue(exponent: int, iterations: int, residue: int = 4, start: int = 0,
+                         on_progress=None) -> int:
+    """
+    تكرارات لوكاس-ليمر من start حتى iterations بالاختزال بالإزاحة والجمع
+    Run s ← s² − 2 (mod 2^p − 1); on_progress(iteration, residue) is called
+    every CHECK_EVERY iterations and may stop the run by returning False
+    """
+    integer = gmpy2.mpz if gmpy2 is not None else int
+    mask = integer((1 << exponent) - 1)
+    s = integer(residue)
+    i = start
+    while i < iterations:
+        stop = min(iterations, i + CHECK_EVERY)
+        for _ in range(i, stop):
+            s = s * s - 2
+            # x mod (2^p - 1) = (x mod 2^p) + ⌊x / 2^p⌋، مرة واحدة تكفي لأن s² < 2^2p
+            # (والقيمة السالبة -2 أو -1 تُختزل صحيحاً بتمثيل المتمم الثنائي في Python)
+            s = (s & mask) + (s >> exponent)
+            if s >= mask:
+                s -= mask
+        i = stop
+        if on_progress is not None and on_progress(i, int(s)) is False:
+            break
+    return int(s)
+
+
+def lucas_lehmer(exponent: int, checkpoint_dir: Optional[str] = None,
+                 checkpoint_seconds: float = CHECKPOINT_SECONDS,
+                 metrics: Metrics = None, verbose: bool = False) -> Dict:
+    """
+    اختبار أولية M_p = 2^p - 1
+    Lucas–Lehmer test of 2^exponent − 1 with periodic checkpoints; returns a
+    record with is_prime, the low 64 bits of the final residue (res64),
+    iterations run in this call and where it resumed from
+    """
+    metrics = metrics if metrics is not None else NULL_METRICS
+    exponent = int(exponent)
+    record = {'exponent': exponent, 'is_prime': False, 'res64': None,
+              'iterations': 0, 'resumed_from': 0, 'seconds': 0.0}
+
+    # M_p مركب إذا كان p مركباً؛ و M_2 = 3 أولي (الاختبار يبدأ من p = 3)
+    if exponent == 2:
+        record['is_prime'] = True
+        return record
+    if not is_prime(exponent):
+        return record
+
+    total = exponent - 2
+    path = checkpoint_file(checkpoint_dir, exponent) if checkpoint_dir else None
+    start, residue = 0, 4
+    if path:
+        saved = read_checkpoint(path, exponent)
+        if saved is not None:
+            start, residue = saved
+            record['resumed_from'] = start
+            if verbose:
+                print(f"↩️ M_{exponent}: استئناف من التكرار {start:,} / {total:,}")
+
+    begin = time.perf_counter()
+    last_save = begin
+
+    def on_progress(iteration: int, s: int):
+        nonlocal last_save
+        now = time.perf_counter()
+        if path and now - last_save >= checkpoint_seconds and iteration < total:
+            write_checkpoint(path, exponent, iteration, s)
+            last_save = now
+            metrics.count('ll_checkpoints')
+            if verbose:
+                rate = (iteration - start) / (now - begin)
+                print(f"⏳ M_{exponent}: {iteration:,} / {total:,} ({iteration / total:.1%})، "
+                      f"{rate:,.0f} تكرار/ثانية، متبقٍ ~{(total - iteration) / rate:,.0f} ثانية")
+
+    with metrics.timer('lucas_lehmer'):
+        residue = lucas_lehmer_residue(exponent, total, residue, start, on_progress)
+    record['seconds'] = time.perf_counter() - begin
+    record['iterations'] = total - start
+    record['is_prime'] = residue == 0
+    record['res64'] = format(residue & 0xFFFFFFFFFFFFFFFF, '016X')
+    metrics.count('ll_iterations', record['iterations'])
+    metrics.throughput('ll_iterations_per_second', 'll_iterations', 'lucas_lehmer')
+
+    if path and os.path.exists(path):
+        os.remove(path)
+    return record
+
+
+def _check_task(task) -> Dict:
+    """اختبار أس واحد (في عملية فرعية)"""
+    exponent, checkpoint_dir, checkpoint_seconds, verbose = task
+    return lucas_lehmer(exponent, checkpoint_dir, checkpoint_seconds, verbose=verbose)
+
+
+def check_exponents(exponents: Iterable[int], workers: Optional[int] = 1,
+                    checkpoint_dir: Optional[str] = None,
+                    checkpoint_seconds: float = CHECKPOINT_SECONDS,
+                    metrics: Metrics = None, verbose: bool = False) -> List[Dict]:
+    """
+    اختبار عدة أسس مستقلة، موزعة على مجمع عمليات عند workers != 1
+    Records come back in the order of exponents; the largest exponents are
+    submitted first so the pool finishes together
+    """
+    metrics = metrics if metrics is not None else NULL_METRICS
+    exponents = list(exponents)
+    tasks = [(p, checkpoint_dir, checkpoint_seconds, verbose) for p in exponents]
+    if workers == 1 or len(tasks) <= 1:
+        records = [lucas_lehmer(p, checkpoint_dir, checkpoint_seconds, metrics, verbose)
+                   for p in exponents]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        order = sorted(range(len(tasks)), key=lambda i: -exponents[i])
+        records = [None] * len(tasks)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {i: pool.submit(_check_task, tasks[i]) for i in order}
+            for i, future in futures.items():
+                records[i] = future.result()
+        # أزمنة العمليات الفرعية تُجمع: الإنتاجية هي معدل العملية الواحدة
+        for record in records:
+            metrics.add_time('lucas_lehmer', record['seconds'])
+            metrics.count('ll_iterations', record['iterations'])
+        metrics.throughput('ll_iterations_per_second', 'll_iterations', 'lucas_lehmer')
+    metrics.count('ll_exponents', len(records))
+    metrics.count('ll_mersenne_primes', sum(record['is_prime'] for record in records))
+    return records
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    parser.add_argument('exponents', nargs='*', type=int, metavar='P',
+                        help='exponents p to test 2^p - 1 for')
+    parser.add_argument('--range', nargs=2, type=int, metavar=('START', 'END'),
+                        help='also test every prime exponent in [START, END]')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='worker processes for independent exponents (default 1)')
+    parser.add_argument('--checkpoint-seconds', type=float, default=CHECKPOINT_SECONDS,
+                        help=f'seconds between resume checkpoints (default {CHECKPOINT_SECONDS})')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help=f'do not read or write checkpoints (default dir: ${CHECKPOINT_ENV_VAR} '
+                             f'or ~/.cache/filament_theory/lucas-lehmer)')
+    parser.add_argument('--metrics', action='store_true',
+                        help='print iteration counts and the iteration rate')
+
+
+def run(args: argparse.Namespace) -> List[Dict]:
+    """تشغيل الاختبار بالخيارات المحللة"""
+    exponents = list(args.exponents)
+    if args.range:
+        from prime_table import primes_between
+        exponents += [int(p) for p in primes_between(*args.range) if int(p) not in exponents]
+    checkpoint_dir = None if args.no_checkpoint else default_checkpoint_dir()
+    metrics = Metrics() if args.metrics else None
+
+    print(f"🧮 اختبار لوكاس-ليمر لـ {len(exponents):,} أس")
+    start = time.time()
+    records = check_exponents(exponents, workers=args.workers, checkpoint_dir=checkpoint_dir,
+                              checkpoint_seconds=args.checkpoint_seconds, metrics=metrics, verbose=True)
+    for record in records:
+        status = "✅ أولي" if record['is_prime'] else "❌ مركب"
+        res64 = f" (res64 {record['res64']})" if record['res64'] and not record['is_prime'] else ""
+        print(f"   M_{record['exponent']}: {status}{res64}")
+    primes = [record['exponent'] for record in records if record['is_prime']]
+    print(f"🌟 أعداد مرسين الأولية: {primes} ({time.time() - start:.2f} ثانية)")
+
+    if metrics is not None:
+        metrics.report()
+    return records
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Lucas-Lehmer test for Mersenne numbers 2^p - 1")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
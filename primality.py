@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+فحص الأولية السريع - نظرية الفتائل
+Fast Primality Testing - Filament Theory
+
+فحص أولية حتمي لأي عدد صحيح:
+- قسمة تجريبية على الأعداد الأولية الصغيرة كمرشح أولي
+- ميلر-رابين الحتمي للأعداد حتى 2^64
+- اختبار BPSW (ميلر-رابين للأساس 2 + لوكاس القوي) لما فوق ذلك
+
+إذا كانت gmpy2 مثبتة يُنفذ BPSW للأعداد الكبيرة بها (نفس الاختبار بنفس
+النتائج، أسرع بكثير لأعداد بآلاف الخانات)، وإلا فبـ Python الخالص.
+"""
+
+import math
+from typing import Iterable, Tuple
+
+try:
+    import gmpy2
+except ImportError:  # اختيارية: BPSW بـ Python الخالص
+    gmpy2 = None
+
+# الأعداد الأولية الصغيرة للمرشح الأولي (أقل من 256)
+SMALL_PRIMES: Tuple[int, ...] = tuple(
+    n for n in range(2, 256) if all(n % d for d in range(2, math.isqrt(n) + 1))
+)
+
+# أسس ميلر-رابين الحتمية لكل n < 2^64 (أول 12 عدد أولي)
+MILLER_RABIN_BASES_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+UINT64_LIMIT = 1 << 64
+
+
+def miller_rabin(n: int, bases: Iterable[int]) -> bool:
+    """
+    اختبار ميلر-رابين القوي لعدد فردي n > 2 بالأسس المعطاة
+    Strong Miller-Rabin probable-prime test of odd n > 2 for the given bases
+    """
+    # n - 1 = d × 2^s حيث d فردي
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def jacobi_symbol(a: int, n: int) -> int:
+    """رمز جاكوبي (a/n) لعدد فردي موجب n"""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def strong_lucas(n: int) -> bool:
+    """
+    اختبار لوكاس القوي بمعاملات سيلفريدج لعدد فردي n ليس مربعاً كاملاً
+    Strong Lucas probable-prime test (Selfridge method A) for odd non-square n
+    """
+    # اختيار D من المتتالية 5, -7, 9, -11, ... بحيث (D/n) = -1
+    D = 5
+    while True:
+        j = jacobi_symbol(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+
+    P = 1
+    Q = (1 - D) // 4
+
+    # n + 1 = d × 2^s حيث d فردي
+    d = n + 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+
+    # حساب U_d و V_d و Q^d بطريقة المضاعفة الثنائية
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            # القسمة على 2 بمقياس n
+            if U % 2:
+                U += n
+            if V % 2:
+                V += n
+            U = (U // 2) % n
+            V = (V // 2) % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+def is_prime(n: int) -> bool:
+    """
+    فحص ما إذا كان العدد أولي (حتمي حتى 2^64، و BPSW لما فوق)
+    Deterministic below 2^64, Baillie-PSW above
+    """
+    n = int(n)
+    if n < 2:
+        return False
+
+    # المرشح الأولي: القسمة على الأعداد الأولية الصغيرة
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+
+    if n < UINT64_LIMIT:
+        return miller_rabin(n, MILLER_RABIN_BASES_64)
+
+    # BPSW: ميلر-رابين للأساس 2 ثم لوكاس القوي
+    if gmpy2 is not None:
+        return bool(gmpy2.is_strong_bpsw_prp(n))
+    if not miller_rabin(n, (2,)):
+        return False
+    if math.isqrt(n) ** 2 == n:
+        return False
+    return strong_lucas(n)
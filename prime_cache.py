@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+ذاكرة تخزين الأعداد الأولية على القرص - نظرية الفتائل
+On-Disk Prime Table Cache - Filament Theory
+
+يحفظ مخرجات الغربال كمصفوفة int64 خام مسبوقة بترويسة صغيرة، وتُفتح
+بـ numpy.memmap بحيث لا تُقرأ من القرص إلا الصفحات المستخدمة فعلاً.
+
+تنسيق الملف (little-endian):
+    0   8 بايت   توقيع الملف  b'FILPRIME'
+    8   4 بايت   إصدار التنسيق (uint32)
+    12  4 بايت   نوع البيانات  b'<i8\\0'
+    16  8 بايت   الحد: جميع الأعداد الأولية <= limit موجودة (uint64)
+    24  8 بايت   عدد الأعداد الأولية المخزنة (uint64)
+    32  32 بايت  محجوز
+    64  ...      الأعداد الأولية مرتبة تصاعدياً
+"""
+
+import os
+import struct
+import numpy as np
+from typing import Optional, Tuple
+
+from prime_sieve import PRIME_DTYPE, iter_prime_chunks
+
+try:
+    import fcntl
+except ImportError:  # ويندوز: بدون قفل بين العمليات
+    fcntl = None
+
+CACHE_MAGIC = b'FILPRIME'
+CACHE_VERSION = 1
+CACHE_DTYPE = b'<i8\0'
+HEADER_FORMAT = '<8sI4sQQ32x'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# متغير البيئة لتحديد مسار الملف، والقيم "" أو "off" تعطل التخزين
+CACHE_ENV_VAR = 'FILAMENT_PRIME_CACHE'
+
+
+def default_cache_path() -> Optional[str]:
+    """المسار الافتراضي لملف التخزين (None إذا كان معطلاً)"""
+    path = os.environ.get(CACHE_ENV_VAR)
+    if path is not None:
+        return None if path.strip().lower() in ('', 'off', '0') else path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'filament_theory', 'primes-int64.bin')
+
+
+def read_header(path: str) -> Optional[Tuple[int, int]]:
+    """
+    قراءة الترويسة والتحقق من صحة الملف
+    Return (limit, count) if the file is a valid cache, otherwise None
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read(HEADER_SIZE)
+            file_size = os.fstat(f.fileno()).st_size
+    except OSError:
+        return None
+    if len(raw) != HEADER_SIZE:
+        return None
+
+    magic, version, dtype, limit, count = struct.unpack(HEADER_FORMAT, raw)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION or dtype != CACHE_DTYPE:
+        return None
+    if file_size < HEADER_SIZE + count * 8:
+        return None
+    return limit, count
+
+
+def _write_header(f, limit: int, count: int) -> None:
+    f.seek(0)
+    f.write(struct.pack(HEADER_FORMAT, CACHE_MAGIC, CACHE_VERSION, CACHE_DTYPE, limit, count))
+
+
+def open_prime_cache(path: str) -> Optional[Tuple[int, np.ndarray]]:
+    """
+    فتح ملف التخزين كمصفوفة memmap للقراءة فقط
+    Open the cache read-only; returns (limit, primes) or None if absent/invalid
+    """
+    header = read_header(path)
+    if header is None:
+        return None
+    limit, count = header
+    if count == 0:
+        return limit, np.empty(0, dtype=PRIME_DTYPE)
+    primes = np.memmap(path, dtype=PRIME_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+    return limit, primes
+
+
+def extend_prime_cache(path: str, limit: int) -> Tuple[int, np.ndarray]:
+    """
+    تمديد ملف التخزين ليغطي جميع الأعداد الأولية حتى limit
+    Extend (or rebuild, if invalid) the cache so it covers every prime <= limit
+
+    تُلحق الأعداد الجديدة بنهاية الملف ثم تُحدَّث الترويسة أخيراً، لذلك
+    يبقى الملف صالحاً إذا توقفت العملية في المنتصف.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    with os.fdopen(fd, 'r+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            header = read_header(path)
+            if header is None:
+                # ملف غير موجود أو تالف أو من إصدار آخر: إعادة البناء
+                cached_limit, count = 1, 0
+            else:
+                cached_limit, count = header
+
+            if limit > cached_limit:
+                f.truncate(HEADER_SIZE + count * 8)
+                _write_header(f, cached_limit, count)
+                f.seek(0, os.SEEK_END)
+                for chunk in iter_prime_chunks(cached_limit + 1, limit):
+                    f.write(chunk.astype('<i8').tobytes())
+                    count += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+                _write_header(f, limit, count)
+                f.flush()
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    return open_prime_cache(path)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+دالة عد الأعداد الأولية π(x) - نظرية الفتائل
+Prime-Counting Function π(x) - Filament Theory
+
+π(x) بدون سرد الأعداد الأولية، بطريقة Legendre–Meissel مطبقة على جميع القيم
+⌊x/n⌋ معاً (خوارزمية Lucy، من عائلة Meissel–Lehmer / LMO): جدول φ واحد
+S(v) لكل قيمة مميزة v = ⌊x/n⌋ (حوالي 2√x قيمة) يُحدّث لكل عدد أولي p ≤ √x:
+
+    S(v) ← S(v) − (S(⌊v/p⌋) − π(p − 1))     لكل v ≥ p²
+
+كل تحديث عملية NumPy واحدة على مصفوفتين (القيم الصغيرة v ≤ √x والكبيرة
+⌊x/i⌋)، فالتكلفة O(x^(3/4) / log x) بذاكرة O(√x): π(10^11) في جزء من
+الثانية و π(10^13) في ثوانٍ.
+
+    python prime_count.py 10^13
+    python prime_count.py --range 99999000000 10^11     # عدد الأعداد الأولية في [a, b]
+
+جداول φ المحسوبة تُحفظ في ذاكرة صغيرة (آخر PHI_TABLE_CACHE جداول): π لأي
+y ≤ √x أو y = ⌊x/n⌋ يُقرأ من جدول x مباشرة بدون حساب جديد.
+"""
+
+import argparse
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import numpy as np
+
+from prime_sieve import base_primes
+
+# عدد جداول φ المحفوظة (جدولا 10^13 ≈ 25 ميغابايت)
+PHI_TABLE_CACHE = 2
+
+# أكبر x مدعوم: الجداول O(√x) في الذاكرة (10^15 ≈ 600 ميغابايت أثناء الحساب)
+MAX_X = 10 ** 15
+
+# عدد الأزواج (i، p) في كل قطعة من جولات الأعداد الأولية الكبيرة
+TAIL_CHUNK = 1 << 21
+
+_phi_tables: 'OrderedDict[int, Tuple[np.ndarray, np.ndarray]]' = OrderedDict()
+
+
+def _icbrt(x: int) -> int:
+    """الجذر التكعيبي الصحيح ⌊x^(1/3)⌋"""
+    c = int(round(x ** (1 / 3)))
+    while c ** 3 > x:
+        c -= 1
+    while (c + 1) ** 3 <= x:
+        c += 1
+    return c
+
+
+def phi_tables(x: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    جدولا العد لـ x بالأعداد الفردية فقط (الزوجية تُحذف قبل البدء):
+    small[j] = π(2j + 1) − 1 و large[j] = π(⌊x/(2j + 1)⌋) − 1 لكل 2j + 1 ≤ √x
+    The odd-only Lucy / Meissel–Lehmer tables for x
+    """
+    x = int(x)
+    tables = _phi_tables.get(x)
+    if tables is not None:
+        _phi_tables.move_to_end(x)
+        return tables
+    if not 1 <= x <= MAX_X:
+        raise ValueError(f"x يجب أن يكون في [1, {MAX_X:.0e}]")
+
+    r = math.isqrt(x)
+    half = (r + 1) // 2
+    odd = np.arange(1, 2 * half, 2, dtype=np.int64)
+    values = x // odd
+    # بعد حذف الزوجية: g(v) = عدد الأعداد الفردية في [3, v]
+    small = (odd - 1) // 2
+    large = (values - 1) // 2
+    del odd
+    # مخازن مؤقتة مشتركة بين الجولات (المصفوفات المؤقتة الكبيرة تكلف أكثر من الحساب نفسه)
+    index = np.empty(half, dtype=np.int64)
+    gathered = np.empty(half, dtype=np.int64)
+
+    def subtract_counts(target, source, table, p, k):
+        # target −= g(⌊v/p⌋) − k لكل v في source، و g(⌊v/p⌋) = table[(v − p) // 2p]
+        n = len(target)
+        np.subtract(source, p, out=index[:n])
+        np.floor_divide(index[:n], 2 * p, out=index[:n])
+        np.take(table, index[:n], out=gathered[:n], mode='clip')
+        np.subtract(gathered[:n], k, out=gathered[:n])
+        np.subtract(target, gathered[:n], out=target)
+
+    primes = base_primes(r)[1:]
+    serial = int(np.searchsorted(primes, _icbrt(x), side='right'))
+    # k = g(p − 1) = عدد الأعداد الأولية الفردية الأصغر من p
+    for k, p in enumerate(primes[:serial].tolist()):
+        p2 = p * p
+        # المضاعفات الفردية المحذوفة p·m (m فردي ≥ p ناجٍ من الغربلة السابقة):
+        # g(v) ← g(v) − (g(⌊v/p⌋) − k) لكل v ≥ p²
+        # القيم الكبيرة: i فردي ≤ x/p²؛ ⌊x/(i·p)⌋ من large إن كان i·p ≤ √x وإلا من small
+        top = (min(r, x // p2) + 1) // 2
+        split = min(top, (r // p + 1) // 2)
+        offset = (p - 1) // 2
+        large[:split] -= large[offset:offset + split * p:p] - k
+        if top > split:
+            subtract_counts(large[split:top], values[split:top], small, p, k)
+        # القيم الصغيرة v ≥ p²: الفهرس (v − p) // 2p يبدأ عند (p − 1)/2 ويتكرر p مرة
+        # متتالية، فالتحديث طرح عمود من مصفوفة (m × p) بدون قسمة أو تجميع
+        first = (p2 - 1) // 2
+        if first < half:
+            m, rest = divmod(half - first, p)
+            counts = small[offset:offset + m + 1] - k
+            blocks = small[first:first + m * p].reshape(m, p)
+            np.subtract(blocks, counts[:m, None], out=blocks)
+            if rest:
+                small[first + m * p:] -= counts[m]
+
+    _sieve_tail(x, r, small, large, primes, serial)
+
+    _phi_tables[x] = (small, large)
+    while len(_phi_tables) > PHI_TABLE_CACHE:
+        _phi_tables.popitem(last=False)
+    return small, large
+
+
+def _sieve_tail(x: int, r: int, small: np.ndarray, large: np.ndarray, primes: np.ndarray, first: int) -> None:
+    """
+    جولات الأعداد الأولية p > ∛x دفعة واحدة (على قطع محدودة الحجم)
+    For p > ∛x round p writes large[i] only for i ≤ x/p² < p and reads
+    large[i·p] with i·p ≥ p, so no round reads what another one writes,
+    and small is already final (p² > √x): the rounds are one gather
+    """
+    tail = primes[first:]
+    counts = (np.minimum(r, x // (tail * tail)) + 1) // 2
+    ends = np.cumsum(counts)
+    lo = 0
+    while lo < len(tail):
+        # قطعة من الأعداد الأولية مجموع أزواجها (i، p) حوالي TAIL_CHUNK
+        hi = max(lo + 1, int(np.searchsorted(ends, ends[lo] - counts[lo] + TAIL_CHUNK, side='right')))
+        chunk = counts[lo:hi]
+        total = int(chunk.sum())
+        owner = np.repeat(np.arange(lo, hi), chunk)
+        j = np.arange(total) - np.repeat(np.cumsum(chunk) - chunk, chunk)
+        ip = (2 * j + 1) * tail[owner]
+        from_large = ip <= r
+        read = np.empty(total, dtype=np.int64)
+        read[from_large] = large[(ip[from_large] - 1) // 2]
+        read[~from_large] = small[(x // ip[~from_large] - 1) // 2]
+        np.subtract.at(large, j, read - (owner + first))
+        lo = hi
+
+
+def _cached_pi(x: int):
+    """π(x) من جدول محفوظ إن كان x قيمة فيه، وإلا None"""
+    for n, (small, large) in reversed(_phi_tables.items()):
+        if x <= 2 * len(small) - 1:
+            return int(small[(x - 1) // 2]) + 1
+        # i فردي بحيث ⌊n/i⌋ = x
+        i = n // x
+        i -= 1 - i % 2
+        if 1 <= i <= 2 * len(large) - 1 and n // i == x:
+            return int(large[(i - 1) // 2]) + 1
+    return None
+
+
+def prime_pi(x: int) -> int:
+    """
+    عدد الأعداد الأولية ≤ x
+    π(x) without enumerating primes; values already in a cached φ table
+    are answered without recomputation
+    """
+    x = int(x)
+    if x < 2:
+        return 0
+    cached = _cached_pi(x)
+    if cached is not None:
+        return cached
+    return int(phi_tables(x)[1][0]) + 1
+
+
+def count_primes(start: int, end: int) -> int:
+    """عدد الأعداد الأولية في [start, end] = π(end) − π(start − 1)"""
+    if end < max(start, 2):
+        return 0
+    return prime_pi(end) - prime_pi(start - 1)
+
+
+def clear_cache() -> None:
+    """حذف جداول φ المحفوظة"""
+    _phi_tables.clear()
+
+
+def cache_info() -> Dict:
+    """الجداول المحفوظة وحجمها بالبايت"""
+    return {'tables': list(_phi_tables),
+            'bytes': sum(small.nbytes + large.nbytes for small, large in _phi_tables.values())}
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    from filament_cli import integer
+    parser.add_argument('bounds', nargs='+', type=integer, metavar='X',
+                        help='π(X) for each X, or the count in [A, B] with --range')
+    parser.add_argument('--range', action='store_true',
+                        help='treat the two numbers as an inclusive range [A, B]')
+
+
+def run(args: argparse.Namespace) -> Dict:
+    """تشغيل العد بالخيارات المحللة"""
+    start = time.time()
+    if args.range:
+        if len(args.bounds) != 2:
+            raise SystemExit("--range يحتاج عددين A B")
+        a, b = args.bounds
+        result = {'start': a, 'end': b, 'count': count_primes(a, b)}
+        print(f"🔢 عدد الأعداد الأولية في [{a:,}, {b:,}] = {result['count']:,} "
+              f"({time.time() - start:.2f} ثانية)")
+        return result
+
+    result = {}
+    for x in args.bounds:
+        begin = time.time()
+        result[x] = prime_pi(x)
+        print(f"🔢 π({x:,}) = {result[x]:,} ({time.time() - begin:.2f} ثانية)")
+    return result
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Prime-counting function π(x) without enumeration")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
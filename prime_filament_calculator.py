@@ -13,9 +13,14 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import List, Tuple, Dict
-import json
+from filament_core import (FILAMENT_MASS, FUNDAMENTAL_FREQUENCY, LIGHT_SPEED, PLANCK_CONSTANT,
+                           cavity_plan, law_plan)
+from primality import is_prime
+from prime_search import nearest_primes, next_prime, primes_in_window
+from property_cache import PropertyCache, get_property_cache
+from result_writer import ResultWriter, column_rows, dump_json
+from zeta_zeros import first_zeta_zeros
 
 class FilamentPrimeCalculator:
     """
@@ -31,26 +36,38 @@ class FilamentPrimeCalculator:
     - الحالة الدخانية: نصف قطر = 1 وحدة أساسية
     """
 
-    def __init__(self):
+    def __init__(self, sink: ResultWriter = None, zeta_count: int = 5, cache: PropertyCache = None,
+                 precision: int = None):
+        # مجرى النتائج المتدفق (اختياري): تُكتب السجلات فور إنتاجها ولا تُحفظ في الذاكرة
+        self.sink = sink
+        
+        # دقة mpmath للأعداد فوق نطاق float (None = الدقة الافتراضية)
+        self.precision = precision
+        
+        # ذاكرة LRU مشتركة لخصائص الحفرة (الحسابات الدفعية تتجاوزها بـ bypass)
+        if cache is None:
+            cache = get_property_cache('cavity_properties' if precision is None
+                                       else f'cavity_properties-dps{precision}')
+        self.property_cache = cache
+        
         # ثوابت نظرية الفتائل المؤكدة
-        self.filament_mass = 5.85881e-52  # كتلة الفتيلة بالكيلوغرام
-        self.light_speed = 299792458  # سرعة الضوء
-        self.planck_constant = 6.62607015e-34  # ثابت بلانك
+        self.filament_mass = FILAMENT_MASS  # كتلة الفتيلة بالكيلوغرام
+        self.light_speed = LIGHT_SPEED  # سرعة الضوء
+        self.planck_constant = PLANCK_CONSTANT  # ثابت بلانك
 
         # التردد الأساسي المؤكد من فيزياء الكم
-        self.fundamental_frequency = 1 / (4 * math.pi)  # 0.079577 هرتز
+        self.fundamental_frequency = FUNDAMENTAL_FREQUENCY  # 0.079577 هرتز
+        
+        # القوانين مُجمَّعة مرة واحدة بهذه الثوابت (التصحيح √(h/(4πm)) يُطوى كثابت)
+        self.laws = cavity_plan(self.filament_mass, self.planck_constant)
+        self.resonance_law = law_plan(['resonance_frequency'], filament_mass=self.filament_mass,
+                                      planck_constant=self.planck_constant)
         
         # الأعداد الأولية الأولى للاختبار
         self.first_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
         
-        # أول أصفار زيتا ريمان
-        self.first_zeta_zeros = [
-            14.134725141734693790,
-            21.022039638771554993,
-            25.010857580145688763,
-            30.424876125859513210,
-            32.935061587739189691
-        ]
+        # أول أصفار زيتا ريمان (من مجموعة الأصفار المخزنة)
+        self.first_zeta_zeros = first_zeta_zeros(zeta_count)
         
         self.results = {}
     
@@ -63,193 +80,99 @@ class FilamentPrimeCalculator:
         Prime = Capacitive_root × Inductive_root (orthogonal)
         مع العلاقة: p + n = 0 حيث n = -p
         """
-        # الجذر الأساسي للعدد الأولي الموجب
-        basic_root_positive = math.sqrt(prime)
-
-        # النقيض السالب: n = -p
-        prime_negative = -prime
-        basic_root_negative = math.sqrt(abs(prime_negative))  # الجذر للقيمة المطلقة
-
-        # الجذر السعوي (من الضد الكُتيلي) - الجزء الموجب
-        capacitive_root = basic_root_positive * math.cos(0)  # الجزء الحقيقي
-
-        # الجذر الحثي (من الضد المُكيني) - الجزء السالب المتعامد
-        inductive_root = basic_root_negative * math.sin(math.pi/2)  # الجزء التخيلي (متعامد)
-
-        # زاوية التعامد
-        orthogonal_angle = 90.0  # درجة
-
-        # التحقق من التوازن: p + n = 0
-        balance_check = prime + prime_negative  # يجب أن يساوي 0
-
-        return capacitive_root, inductive_root, orthogonal_angle, balance_check
+        values = self.laws.scalar(prime, self.precision)
+        return (values['capacitive_root'], values['inductive_root'],
+                values['orthogonal_angle'], values['balance_check'])
     
     def calculate_resonance_frequency(self, prime: int) -> float:
         """
         حساب تردد الرنين للحفرة الفتائلية مع الأبعاد الأربعة
         Calculate resonance frequency for filament cavity with four dimensions
-        """
-        # التردد الأساسي من فيزياء الكم
-        fundamental_frequency = 1 / (4 * math.pi)  # التردد الأساسي
-
-        # العلاقة المكتشفة: f = p/π = 4p × (1/(4π))
-        # حيث p يمثل البعد الزمني للفتيلة
-        temporal_dimension = prime  # البعد الزمني
-        spatial_dimensions_factor = 4  # مساهمة الأبعاد المكانية الثلاثة
-
-        # تردد العدد الأولي
-        prime_frequency = prime / math.pi
-
-        # التحقق من العلاقة: p/π = 4p × (1/(4π))
-        theoretical_frequency = spatial_dimensions_factor * temporal_dimension * fundamental_frequency
 
-        # تصحيح بناءً على كتلة الفتيلة والحالة الدخانية
-        filament_correction = math.sqrt(self.planck_constant / (4 * math.pi * self.filament_mass))
-
-        # التردد النهائي مع تصحيح الحالة الدخانية
-        resonance_freq = prime_frequency * (1 + filament_correction * 1e50)  # تطبيع الوحدات
-
-        return resonance_freq
+        f = p/π × (1 + √(h/(4πm)) × 10^50)، والتصحيح ثابت محسوب عند التجميع
+        """
+        return self.resonance_law.evaluate(prime, self.precision)['resonance_frequency']
 
     def calculate_four_dimensional_properties(self, prime: int) -> Dict:
         """
         حساب خصائص الفتيلة رباعية الأبعاد
         Calculate four-dimensional filament properties
         """
-        # التردد الأساسي
-        fundamental_freq = 1 / (4 * math.pi)
-
-        # الأبعاد المكانية الثلاثة (حلقات مدارية)
-        spatial_ring_x = math.sqrt(prime) * math.cos(0)  # الحلقة الأولى
-        spatial_ring_y = math.sqrt(prime) * math.cos(math.pi/2)  # الحلقة الثانية
-        spatial_ring_z = math.sqrt(prime) * math.cos(math.pi)  # الحلقة الثالثة
-
-        # البعد الزمني (التردد الداخلي)
-        temporal_dimension = prime
-
-        # نصف القطر الفعال للحالة الدخانية
-        effective_radius = 1.0  # وحدة أساسية
-
-        # مساحة السطح الكروي
-        spherical_surface_area = 4 * math.pi * (effective_radius ** 2)
-
-        # حجم الحالة الدخانية
-        smoky_volume = (4/3) * math.pi * (effective_radius ** 3)
-
-        # كثافة الحالة الدخانية
-        smoky_density = self.filament_mass / smoky_volume
-
-        return {
-            'fundamental_frequency': fundamental_freq,
-            'spatial_ring_x': spatial_ring_x,
-            'spatial_ring_y': spatial_ring_y,
-            'spatial_ring_z': spatial_ring_z,
-            'temporal_dimension': temporal_dimension,
-            'effective_radius': effective_radius,
-            'spherical_surface_area': spherical_surface_area,
-            'smoky_volume': smoky_volume,
-            'smoky_density': smoky_density
-        }
+        return self.laws.scalar(prime, self.precision)['four_dimensional_properties']
     
     def calculate_cavity_properties(self, prime: int) -> Dict:
         """
         حساب خصائص الحفرة الفتائلية مع النقيض والأبعاد الأربعة
         Calculate filament cavity properties with opposite and four dimensions
+        (memoized per prime; the returned LawRecord is shared, so it refuses
+        assignment: use to_dict() for a copy to change)
         """
-        cap_root, ind_root, angle, balance = self.calculate_orthogonal_roots(prime)
-        resonance_freq = self.calculate_resonance_frequency(prime)
-        four_d_props = self.calculate_four_dimensional_properties(prime)
-
-        # النقيض السالب
-        prime_negative = -prime
+        return self.property_cache.get(prime, self._compute_cavity_properties)
 
-        # السعة المادية (من الضد الكُتيلي) - الجزء الموجب
-        material_capacitance = cap_root / prime  # C = k/V
-
-        # المحاثة المادية (من الضد المُكيني) - الجزء السالب
-        material_inductance = ind_root * abs(prime_negative) / cap_root  # L = mS/k
-
-        # عمق الحفرة الفتائلية (التوازن بين الموجب والسالب)
-        cavity_depth = math.sqrt(material_capacitance * material_inductance)
-
-        # قوة الإشعاعات الوترية (التفاعل بين الضدين)
-        string_radiation_strength = resonance_freq * cavity_depth
-
-        # طاقة التوازن الفتائلي
-        balance_energy = abs(balance) * self.planck_constant * resonance_freq
-
-        # معامل التوازن الفتائلي (يجب أن يكون قريب من 1 للأعداد الأولية)
-        filament_balance_factor = 1.0 if balance == 0 else 1.0 / (1.0 + abs(balance))
-
-        # التحقق من العلاقة p/π = 4p × (1/(4π))
-        theoretical_freq = 4 * prime * four_d_props['fundamental_frequency']
-        actual_freq = prime / math.pi
-        frequency_match = abs(theoretical_freq - actual_freq) / actual_freq * 100
-
-        # حجم الحفرة رباعية الأبعاد
-        four_d_volume = four_d_props['smoky_volume'] * four_d_props['temporal_dimension']
-
-        # كثافة الطاقة في الحفرة
-        energy_density = balance_energy / four_d_volume if four_d_volume > 0 else 0
-
-        return {
-            'prime': prime,
-            'prime_negative': prime_negative,
-            'capacitive_root': cap_root,
-            'inductive_root': ind_root,
-            'orthogonal_angle': angle,
-            'balance_check': balance,
-            'resonance_frequency': resonance_freq,
-            'material_capacitance': material_capacitance,
-            'material_inductance': material_inductance,
-            'cavity_depth': cavity_depth,
-            'string_radiation_strength': string_radiation_strength,
-            'balance_energy': balance_energy,
-            'filament_balance_factor': filament_balance_factor,
-            'four_dimensional_properties': four_d_props,
-            'theoretical_frequency': theoretical_freq,
-            'frequency_match_error': frequency_match,
-            'four_d_volume': four_d_volume,
-            'energy_density': energy_density
-        }
+    def _compute_cavity_properties(self, prime: int) -> Dict:
+        return self.laws.scalar(prime, self.precision)
     
+    def calculate_cavity_properties_batch(self, primes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        حساب خصائص الحفرة الفتائلية لمصفوفة كاملة من الأعداد الأولية دفعة واحدة
+        Vectorized calculate_cavity_properties (filament_core.cavity_properties)
+        """
+        return self.laws(primes)
+
     def test_zeta_zero_correspondence(self, zeta_zero: float) -> Dict:
         """
         اختبار التناظر مع أصفار زيتا - معادلة محسنة
         Test correspondence with Riemann zeta zeros - Enhanced equation
         """
+        return next(column_rows(self.test_zeta_zero_correspondence_batch([zeta_zero])))
+
+    def test_zeta_zero_correspondence_batch(self, zeta_zeros, primes=None) -> Dict[str, np.ndarray]:
+        """
+        اختبار التناظر لمصفوفة من أصفار زيتا دفعة واحدة
+        Vectorized zeta correspondence; nearest primes come from one
+        searchsorted over the sorted primes (default: first_primes)
+        """
+        zeta_zeros = np.asarray(zeta_zeros, dtype=np.float64)
+
         # التردد المقابل لصفر زيتا
-        zeta_frequency = zeta_zero / (2 * math.pi)
+        zeta_frequency = zeta_zeros / (2 * math.pi)
 
         # المعادلة المحسنة للعدد الأولي المتوقع
         # تطبيق تصحيح الفتائل المتعامدة
         filament_correction = math.sqrt(2) * math.cos(math.pi/4)  # تصحيح التعامد
-        zeta_correction = math.log(zeta_zero) / math.log(2)  # تصحيح لوغاريتمي
+        zeta_correction = np.log(zeta_zeros) / math.log(2)  # تصحيح لوغاريتمي
 
         # العدد الأولي المتوقع المحسن
-        predicted_prime = (zeta_zero / math.pi) * filament_correction * (1 + 0.1 * zeta_correction)
+        predicted_prime = (zeta_zeros / math.pi) * filament_correction * (1 + 0.1 * zeta_correction)
 
         # أقرب عدد أولي حقيقي
-        closest_prime = min(self.first_primes, key=lambda p: abs(p - predicted_prime))
+        closest_prime = nearest_primes(predicted_prime, self.first_primes if primes is None else primes)
 
         # حساب الدقة المحسنة
-        accuracy = (1 - abs(closest_prime - predicted_prime) / closest_prime) * 100
+        accuracy = (1 - np.abs(closest_prime - predicted_prime) / closest_prime) * 100
 
         # تحسين إضافي بناءً على الترددات الرنينية
         resonance_factor = self.calculate_resonance_frequency(closest_prime) / (zeta_frequency * 1e55)
-        enhanced_accuracy = accuracy * (1 + 0.05 * math.log10(resonance_factor))
+        enhanced_accuracy = accuracy * (1 + 0.05 * np.log10(resonance_factor))
 
         return {
-            'zeta_zero': zeta_zero,
+            'zeta_zero': zeta_zeros,
             'zeta_frequency': zeta_frequency,
             'predicted_prime': predicted_prime,
             'closest_prime': closest_prime,
             'accuracy_percent': accuracy,
-            'enhanced_accuracy_percent': min(enhanced_accuracy, 100.0),
-            'filament_correction': filament_correction,
+            'enhanced_accuracy_percent': np.minimum(enhanced_accuracy, 100.0),
+            'filament_correction': np.broadcast_to(filament_correction, zeta_zeros.shape),
             'resonance_factor': resonance_factor
         }
     
+    def record_result(self, record_type: str, result: Dict, results: List[Dict]):
+        """حفظ النتيجة في القائمة، أو كتابتها فوراً إلى مجرى النتائج إن وُجد"""
+        if self.sink is not None:
+            self.sink.write(result, record_type=record_type)
+        else:
+            results.append(result)
+    
     def run_comprehensive_test(self) -> Dict:
         """
         تشغيل الاختبار الشامل
@@ -262,9 +185,11 @@ class FilamentPrimeCalculator:
         
         # اختبار الأعداد الأولية
         prime_results = []
+        primes_tested = 0
         for prime in self.first_primes[:5]:  # أول 5 أعداد أولية
             result = self.calculate_cavity_properties(prime)
-            prime_results.append(result)
+            self.record_result('prime', result, prime_results)
+            primes_tested += 1
             
             print(f"\n🔢 العدد الأولي: {prime}")
             print(f"   النقيض السالب: {result['prime_negative']}")
@@ -295,9 +220,11 @@ class FilamentPrimeCalculator:
         
         # اختبار أصفار زيتا
         zeta_results = []
-        for i, zero in enumerate(self.first_zeta_zeros[:3]):  # أول 3 أصفار
-            result = self.test_zeta_zero_correspondence(zero)
-            zeta_results.append(result)
+        zeta_accuracies = []
+        zeta_columns = self.test_zeta_zero_correspondence_batch(self.first_zeta_zeros[:3])  # أول 3 أصفار
+        for i, (zero, result) in enumerate(zip(self.first_zeta_zeros, column_rows(zeta_columns))):
+            self.record_result('zeta', result, zeta_results)
+            zeta_accuracies.append(result['accuracy_percent'])
             
             print(f"\n🌊 صفر زيتا #{i+1}: {zero:.6f}")
             print(f"   التردد المقابل: {result['zeta_frequency']:.6f} هرتز")
@@ -310,12 +237,15 @@ class FilamentPrimeCalculator:
             'prime_results': prime_results,
             'zeta_results': zeta_results,
             'summary': {
-                'total_primes_tested': len(prime_results),
-                'total_zeros_tested': len(zeta_results),
-                'average_accuracy': sum(r['accuracy_percent'] for r in zeta_results) / len(zeta_results)
+                'total_primes_tested': primes_tested,
+                'total_zeros_tested': len(zeta_accuracies),
+                'average_accuracy': sum(zeta_accuracies) / len(zeta_accuracies)
             }
         }
         
+        if self.sink is not None:
+            self.sink.write(self.results['summary'], record_type='summary')
+        
         print("\n" + "=" * 80)
         print(f"📊 ملخص النتائج المؤكدة:")
         print(f"   عدد الأعداد الأولية المختبرة: {self.results['summary']['total_primes_tested']}")
@@ -346,55 +276,44 @@ class FilamentPrimeCalculator:
         search_start = last_known_prime + 1
         search_end = last_known_prime + int(estimated_gap * 3) + 20  # نطاق معقول
 
-        # البحث عن الأعداد الأولية في النطاق
-        candidates = []
-        for candidate in range(search_start, search_end + 1):
-            if self.is_prime(candidate):
-                candidates.append(candidate)
-
-        if candidates:
-            # أول عدد أولي في النطاق
-            predicted_prime = candidates[0]
-
-            # حساب الثقة بناءً على نظرية الفتائل
-            # فحص التوازن الفتائلي للعدد المتوقع
-            balance_check = predicted_prime + (-predicted_prime)
-            balance_factor = 1.0 if balance_check == 0 else 1.0 / (1.0 + abs(balance_check))
-
-            # فحص العلاقة الأساسية
-            calculated_freq = predicted_prime / math.pi
-            theoretical_freq = 4 * predicted_prime * self.fundamental_frequency
-            freq_error = abs(calculated_freq - theoretical_freq) / calculated_freq * 100
-
-            # حساب الثقة بناءً على صحة القوانين
-            if balance_factor == 1.0 and freq_error < 1e-10:
-                confidence = 95.0  # ثقة عالية - يحقق قوانين الفتائل
-            else:
-                confidence = 70.0  # ثقة متوسطة
+        # العدد الأولي التالي الدقيق (غربال نافذة + ميلر-رابين، تتوسع عند الحاجة)
+        predicted_prime = next_prime(last_known_prime)
+
+        # الأعداد الأولية في نطاق البحث (يشمل دائماً العدد المتوقع)
+        candidates = primes_in_window(search_start, max(search_end, predicted_prime))
 
-            # تقدير الفجوة الفعلية
-            actual_gap = predicted_prime - last_known_prime
-            expected_gap = estimated_gap
-            gap_accuracy = (1 - abs(actual_gap - expected_gap) / expected_gap) * 100
+        # حساب الثقة بناءً على نظرية الفتائل
+        # فحص التوازن الفتائلي للعدد المتوقع
+        balance_check = predicted_prime + (-predicted_prime)
+        balance_factor = 1.0 if balance_check == 0 else 1.0 / (1.0 + abs(balance_check))
 
+        # فحص العلاقة الأساسية
+        calculated_freq = predicted_prime / math.pi
+        theoretical_freq = 4 * predicted_prime * self.fundamental_frequency
+        freq_error = abs(calculated_freq - theoretical_freq) / calculated_freq * 100
+
+        # حساب الثقة بناءً على صحة القوانين
+        if balance_factor == 1.0 and freq_error < 1e-10:
+            confidence = 95.0  # ثقة عالية - يحقق قوانين الفتائل
         else:
-            # لم نجد أعداد أولية في النطاق (حالة نادرة)
-            predicted_prime = last_known_prime + int(estimated_gap)
-            confidence = 30.0  # ثقة منخفضة
-            actual_gap = int(estimated_gap)
-            gap_accuracy = 50.0
+            confidence = 70.0  # ثقة متوسطة
+
+        # تقدير الفجوة الفعلية
+        actual_gap = predicted_prime - last_known_prime
+        expected_gap = estimated_gap
+        gap_accuracy = (1 - abs(actual_gap - expected_gap) / expected_gap) * 100
 
         result = {
             'last_known_prime': last_known_prime,
             'predicted_prime': predicted_prime,
             'confidence_percent': confidence,
             'estimated_gap': estimated_gap,
-            'actual_gap': actual_gap if 'actual_gap' in locals() else 0,
-            'gap_accuracy': gap_accuracy if 'gap_accuracy' in locals() else 0,
+            'actual_gap': actual_gap,
+            'gap_accuracy': gap_accuracy,
             'search_range': (search_start, search_end),
             'candidates_found': candidates,
-            'balance_factor': balance_factor if 'balance_factor' in locals() else 0,
-            'frequency_error': freq_error if 'freq_error' in locals() else 0
+            'balance_factor': balance_factor,
+            'frequency_error': freq_error
         }
 
         print(f"   العدد الأولي المتوقع: {predicted_prime}")
@@ -405,23 +324,12 @@ class FilamentPrimeCalculator:
         return result
 
     def is_prime(self, n: int) -> bool:
-        """فحص ما إذا كان العدد أولي"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
-
-    def save_results(self, filename: str = "filament_prime_results.json"):
+        """فحص ما إذا كان العدد أولي (ميلر-رابين الحتمي / BPSW)"""
+        return is_prime(n)
+
+    def save_results(self, filename: str = "filament_prime_results.json", compact: bool = False):
         """حفظ النتائج في ملف"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, ensure_ascii=False, indent=2)
+        dump_json(self.results, filename, compact=compact)
         print(f"\n💾 تم حفظ النتائج في: {filename}")
 
 def main():
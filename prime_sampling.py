@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+عينات عشوائية منتظمة من الأعداد الأولية - نظرية الفتائل
+Uniform Random Prime Sampling - Filament Theory
+
+اختيار k عدد أولي عشوائي (بدون تكرار، كل عدد أولي في [a, b] بنفس الاحتمال)
+دون بناء قائمة النطاق كاملة:
+
+- table: النطاق داخل الجدول المشترك، فتُختار k فهارس من شريحته مباشرة
+- reservoir: عينة خزان (Algorithm L) على قطع الغربال المقطعي، بذاكرة O(k)
+  وعدد أرقام عشوائية O(k·log(n/k)) بدل رقم لكل عدد أولي
+- rejection: أعداد مرشحة عشوائية من [a, b] تُقبل إذا اجتازت Miller–Rabin /
+  BPSW، للنطاقات الأكبر من أن تُغربل (أي حجم، حتى أعداد بآلاف الخانات)
+
+    sample_primes(10**12, 10**13, 25, seed=7)
+    sample_primes(2, 10**7, 100, seed=7, strata=10)
+
+مع strata > 1 يُقسم النطاق إلى فترات متساوية الطول وتُوزع k عليها بنسبة عدد
+الأعداد الأولية في كل فترة (دقيق داخل الجدول، وتقدير مبرهنة الأعداد الأولية
+(b − a)/ln m بعده). حصة فترة لا تتجاوز عدد أعدادها الأولية الفعلي (يُعد بالغربال
+للفترات القصيرة حين تقترب الحصة من التقدير)، والفائض يُوزع على الفترات الأخرى،
+فالعينة فيها k عدداً كلما كان في النطاق k عدد أولي، بأي طريقة. كل فترة تأخذ
+بذرة فرعية مشتقة من seed، فنفس البذرة تعطي نفس العينة.
+
+    python prime_sampling.py 10^12 10^13 25 --seed 7 --strata 5
+"""
+
+import argparse
+import math
+import random
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from prime_search import is_primes, primes_in_window
+from prime_sieve import count_primes_in_range
+from prime_table import get_prime_table
+
+# أقصى طول نطاق يُغربل لعينة الخزان (أبعد من ذلك: الرفض مع Miller–Rabin)
+RESERVOIR_SPAN = 10 ** 7
+
+# عدد المرشحين المسحوبين في كل دفعة من وضع الرفض
+REJECTION_BATCH = 64
+
+# حد السحب في وضع الرفض: هذا العدد × k × ln(end) مرشحاً (المتوقع k × ln(end))
+REJECTION_DRAWS = 100
+
+# تحت هذا التقدير تُعد أعداد الفترة بالغربال قبل إعطائها حصة (الفترات الضيقة
+# قد تحوي أقل بكثير من (b − a)/ln m، وعدّها رخيص)؛ فوقه يكفي هامش الضعف
+EXACT_COUNT_WEIGHT = 1000
+
+# كلفة فحص عدد في نافذة Miller–Rabin مقارنة بعدد في غربال أعداد الأساس حتى √b
+# (تقريبية): الفترة الأقصر من √b / WINDOW_COST تُعد بالنافذة بدل الغربال
+WINDOW_COST = 1000
+
+METHODS = ('auto', 'table', 'reservoir', 'rejection')
+
+Seed = Union[None, int, Sequence[int], np.random.SeedSequence]
+
+
+def stratum_weight(start: int, end: int) -> float:
+    """
+    وزن الفترة [start, end]: عدد أعدادها الأولية داخل الجدول، وتقديره بعده
+    Exact count within the table bound, (end − start + 1)/ln(midpoint) beyond it
+    """
+    table = get_prime_table()
+    if table.covers(end):
+        return table.count_between(start, end)
+    return (end - start + 1) / math.log(start + (end - start) // 2)
+
+
+def choose_method(start: int, end: int) -> str:
+    """
+    أرخص طريقة لنطاق: الجدول، ثم الخزان للنطاقات القصيرة، ثم الرفض
+    Depends only on the bounds (not on how far the table is built yet), so a
+    seed reproduces the same sample on any machine
+    """
+    if get_prime_table().covers(end):
+        return 'table'
+    if end - start < RESERVOIR_SPAN:
+        return 'reservoir'
+    return 'rejection'
+
+
+def allocate(k: int, weights: Sequence[float]) -> List[int]:
+    """
+    توزيع k على الفترات بنسبة أوزانها (طريقة أكبر الباقي)
+    Proportional allocation by largest remainder; never exceeds an integer weight when k ≤ sum(weights)
+    """
+    total = sum(weights)
+    if not total:
+        return [0] * len(weights)
+    shares = [k * w / total for w in weights]
+    counts = [int(share) for share in shares]
+    order = sorted(range(len(weights)), key=lambda i: counts[i] - shares[i])
+    for i in order[:k - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def stratum_capacity(start: int, end: int, quota: int, weight: float) -> float:
+    """
+    أقصى حصة للفترة [start, end]: عدد أعدادها الأولية حين يكون معروفاً أو رخيصاً
+    Exact within the table; sieved when the stratum is short enough and
+    either small (EXACT_COUNT_WEIGHT) or asked for over half its x/ln x
+    estimate; otherwise unbounded (far more primes than the quota)
+    """
+    if get_prime_table().covers(end):
+        return weight
+    if end - start < RESERVOIR_SPAN and (weight < EXACT_COUNT_WEIGHT or 2 * quota > weight):
+        if (end - start) * WINDOW_COST < math.isqrt(end):
+            return len(primes_in_window(start, end))
+        return count_primes_in_range(start, end)
+    return math.inf
+
+
+def stratum_quotas(k: int, bounds: Sequence[Tuple[int, int]]) -> List[int]:
+    """
+    حصص الفترات بنسبة أوزانها، مقيدة بسعة كل فترة، والفائض للفترات التي فيها متسع
+    The shortfall of strata holding fewer primes than their share goes to
+    the others in proportion to their weights, so the quotas sum to k
+    whenever the range holds k primes
+    """
+    weights = [stratum_weight(lo, hi) for lo, hi in bounds]
+    quotas = allocate(k, weights)
+    capacity = [math.inf] * len(bounds)
+    while True:
+        for i, (lo, hi) in enumerate(bounds):
+            if quotas[i] > capacity[i] or (capacity[i] == math.inf and quotas[i]):
+                capacity[i] = stratum_capacity(lo, hi, quotas[i], weights[i])
+        shortfall = sum(max(0, quota - room) for quota, room in zip(quotas, capacity))
+        if not shortfall:
+            return quotas
+        quotas = [min(quota, room) for quota, room in zip(quotas, capacity)]
+        extra = allocate(shortfall, [w if quota < room else 0
+                                     for w, quota, room in zip(weights, quotas, capacity)])
+        if not any(extra):
+            # النطاق كله فيه أقل من k عدد أولي
+            return quotas
+        quotas = [quota + e for quota, e in zip(quotas, extra)]
+
+
+def sample_table(start: int, end: int, k: int, rng: np.random.Generator) -> List[int]:
+    """k فهارس عشوائية من شريحة الجدول المشترك"""
+    primes = get_prime_table().primes_between(start, end)
+    if k >= len(primes):
+        return primes.tolist()
+    return primes[rng.choice(len(primes), size=k, replace=False)].tolist()
+
+
+def sample_reservoir(start: int, end: int, k: int, rng: np.random.Generator) -> List[int]:
+    """
+    عينة خزان (Algorithm L) على قطع الأعداد الأولية في [start, end]
+    The gap to the next replacement is drawn directly, so only O(k log(n/k))
+    random numbers are used however many primes stream past
+    """
+    reservoir: List[int] = []
+    if k <= 0:
+        return reservoir
+    position = 0  # رقم أول عدد في القطعة الحالية داخل التدفق
+    weight = following = 0
+
+    def skip() -> int:
+        return int(math.floor(math.log(1.0 - rng.random()) / math.log1p(-weight))) if weight < 1 else 0
+
+    for chunk in get_prime_table().iter_primes_between(start, end):
+        n = len(chunk)
+        filled = 0
+        if len(reservoir) < k:
+            filled = min(k - len(reservoir), n)
+            reservoir.extend(chunk[:filled].tolist())
+            if len(reservoir) == k:
+                weight = math.exp(math.log(1.0 - rng.random()) / k)
+                following = position + filled + skip()
+        if len(reservoir) == k:
+            while following < position + n:
+                reservoir[int(rng.integers(k))] = int(chunk[following - position])
+                weight *= math.exp(math.log(1.0 - rng.random()) / k)
+                following += skip() + 1
+        position += n
+    return reservoir
+
+
+def sample_rejection(start: int, end: int, k: int, rng: random.Random) -> List[int]:
+    """
+    مرشحون عشوائيون منتظمون من [start, end] يُقبل منهم الأولي غير المكرر
+    Each draw is uniform over the integers, so an accepted prime is uniform
+    over the primes
+    """
+    chosen = {}
+    budget = REJECTION_DRAWS * k * math.ceil(math.log(max(end, 3)))
+    while len(chosen) < k:
+        if budget <= 0:
+            raise ValueError(f"لم يُعثر على {k} عدد أولي مختلف في [{start}, {end}] "
+                             f"(النطاق أصغر من العينة؟ استخدم method='reservoir')")
+        budget -= REJECTION_BATCH
+        candidates = [rng.randrange(start, end + 1) for _ in range(REJECTION_BATCH)]
+        for n, prime in zip(candidates, is_primes(candidates).tolist()):
+            if prime and n not in chosen:
+                chosen[n] = None
+                if len(chosen) == k:
+                    break
+    return list(chosen)
+
+
+def _python_random(seed: np.random.SeedSequence) -> random.Random:
+    """مولد random.Random بذرته مشتقة من SeedSequence (randrange لأعداد بأي حجم)"""
+    state = seed.generate_state(4, np.uint64).tolist()
+    return random.Random(sum(word << (64 * i) for i, word in enumerate(state)))
+
+
+def sample_primes(start: int, end: int, k: int, seed: Seed = None, strata: int = 1,
+                  method: str = 'auto') -> List[int]:
+    """
+    k عدد أولي عشوائي مختلف من [start, end] (مرتبة تصاعدياً)
+    Uniform sample without replacement, streamed rather than materialized.
+    seed: None, an int, a sequence of ints or a numpy SeedSequence; the
+    same seed gives the same sample. strata > 1 splits [start, end] into
+    equal-width sub-intervals sampled in proportion to their prime counts
+    """
+    if method not in METHODS:
+        raise ValueError(f"طريقة غير معروفة: {method} ({', '.join(METHODS)})")
+    start = max(start, 2)
+    if end < start or k <= 0:
+        return []
+    strata = max(1, min(strata, end - start + 1))
+    seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+    edges = [start + (end - start + 1) * i // strata for i in range(strata + 1)]
+    bounds = [(edges[i], edges[i + 1] - 1) for i in range(strata)]
+    quotas = stratum_quotas(k, bounds) if strata > 1 else [k]
+
+    sample: List[int] = []
+    for (lo, hi), quota, child in zip(bounds, quotas, seed.spawn(strata)):
+        if not quota:
+            continue
+        chosen = choose_method(lo, hi) if method == 'auto' else method
+        if chosen == 'table':
+            sample += sample_table(lo, hi, quota, np.random.default_rng(child))
+        elif chosen == 'reservoir':
+            sample += sample_reservoir(lo, hi, quota, np.random.default_rng(child))
+        else:
+            sample += sample_rejection(lo, hi, quota, _python_random(child))
+    return sorted(sample)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    from filament_cli import integer
+    parser.add_argument('start', type=integer)
+    parser.add_argument('end', type=integer)
+    parser.add_argument('k', type=int, help='number of primes to draw')
+    parser.add_argument('--seed', type=int, help='random seed (same seed, same sample)')
+    parser.add_argument('--strata', type=int, default=1,
+                        help='equal-width sub-intervals sampled in proportion to their prime counts')
+    parser.add_argument('--method', choices=METHODS, default='auto',
+                        help='table slice, reservoir over the segmented sieve, or rejection with Miller-Rabin')
+
+
+def run(args: argparse.Namespace) -> List[int]:
+    """سحب العينة بالخيارات المحللة وطباعتها"""
+    sample = sample_primes(args.start, args.end, args.k, seed=args.seed, strata=args.strata,
+                           method=args.method)
+    print(f"🎲 {len(sample)} عدد أولي عشوائي من [{args.start:,}, {args.end:,}]:")
+    for prime in sample:
+        print(f"   {prime}")
+    return sample
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Uniform random primes from a range without listing it")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
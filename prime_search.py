@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+البحث عن العدد الأولي التالي والسابق - نظرية الفتائل
+Next / Previous Prime Search - Filament Theory
+
+- داخل جدول الأعداد الأولية المشترك: بحث ثنائي مباشر
+- فوق الجدول: غربال نافذة صغيرة بالأعداد الأولية الصغيرة ثم تأكيد
+  المرشحين بميلر-رابين، مع توسيع النافذة حتى العثور على عدد أولي
+- دوال دفعية لملايين البذور (بحث ثنائي متجه ثم النافذة للباقي)
+"""
+
+import math
+import numpy as np
+from typing import List, Optional
+
+from primality import is_prime
+from prime_sieve import PRIME_DTYPE, base_primes
+from prime_table import get_prime_table
+
+# الأعداد الأولية الصغيرة المستخدمة في غربال النافذة
+WINDOW_SIEVE_PRIMES = base_primes(1 << 12)
+
+# فوق هذا الحد لا تكفي أعداد int64 فنفحص المرشحين واحداً واحداً
+NUMPY_SAFE_LIMIT = 1 << 62
+
+
+def window_size(n: int) -> int:
+    """حجم النافذة الابتدائي: بضعة أضعاف متوسط الفجوة log(n)"""
+    return max(64, 8 * int(math.log(max(n, 2)) + 1))
+
+
+def window_candidates(lo: int, hi: int) -> List[int]:
+    """
+    المرشحون في [lo, hi] بعد حذف مضاعفات الأعداد الأولية الصغيرة
+    Candidates in [lo, hi] that survive the small-prime window sieve
+    (exact primes when the table covers hi)
+    """
+    lo = max(lo, 2)
+    if hi < lo:
+        return []
+
+    table = get_prime_table()
+    if hi <= table.bound:
+        return table.primes_between(lo, hi).tolist()
+
+    if hi >= NUMPY_SAFE_LIMIT:
+        return [n for n in range(lo | 1, hi + 1, 2)]
+
+    # غربلة النافذة بالأعداد الأولية الصغيرة ثم تأكيد الناجين
+    values = np.arange(lo, hi + 1, dtype=PRIME_DTYPE)
+    survivors = np.ones(len(values), dtype=bool)
+    for p in WINDOW_SIEVE_PRIMES.tolist():
+        if p * p > hi:
+            break
+        survivors[(-lo) % p::p] = False
+    survivors &= values > 1
+    if lo <= WINDOW_SIEVE_PRIMES[-1]:
+        # الأعداد الأولية الصغيرة نفسها داخل النافذة
+        survivors |= np.isin(values, WINDOW_SIEVE_PRIMES)
+    return values[survivors].tolist()
+
+
+def primes_in_window(lo: int, hi: int) -> List[int]:
+    """
+    الأعداد الأولية في [lo, hi] لأي حجم من الأعداد
+    Primes in [lo, hi]: table slice, or small-prime window sieve plus Miller-Rabin
+    """
+    return [n for n in window_candidates(lo, hi) if is_prime(n)]
+
+
+def next_prime(n: int) -> int:
+    """
+    أصغر عدد أولي أكبر من n
+    Smallest prime strictly greater than n
+    """
+    n = int(n)
+    if n < 2:
+        return 2
+
+    table = get_prime_table()
+    if n < table.limit:
+        index = np.searchsorted(table.primes, n, side='right')
+        if index < len(table.primes):
+            return int(table.primes[index])
+
+    lo = n + 1
+    width = window_size(n)
+    while True:
+        # تأكيد المرشحين بالترتيب والتوقف عند أول عدد أولي
+        for candidate in window_candidates(lo, lo + width - 1):
+            if is_prime(candidate):
+                return candidate
+        lo += width
+        width *= 2
+
+
+def prev_prime(n: int) -> Optional[int]:
+    """
+    أكبر عدد أولي أصغر من n (None إذا لم يوجد)
+    Largest prime strictly less than n, or None for n <= 2
+    """
+    n = int(n)
+    if n <= 2:
+        return None
+
+    table = get_prime_table()
+    if n <= table.limit + 1:
+        index = np.searchsorted(table.primes, n, side='left')
+        return int(table.primes[index - 1])
+
+    hi = n - 1
+    width = window_size(n)
+    while True:
+        lo = max(2, hi - width + 1)
+        for candidate in reversed(window_candidates(lo, hi)):
+            if is_prime(candidate):
+                return candidate
+        hi = lo - 1
+        width *= 2
+
+
+def is_primes(values) -> np.ndarray:
+    """
+    فحص أولية قائمة أعداد دفعة واحدة
+    Batch is_prime: one searchsorted over the shared table for the values it
+    covers, the Miller-Rabin / BPSW test for the rest (any size)
+    """
+    values = list(values)
+    result = np.zeros(len(values), dtype=bool)
+    if not values:
+        return result
+
+    table = get_prime_table()
+    small = [i for i, n in enumerate(values) if 0 <= n <= table.limit]
+    if small:
+        keys = np.array([values[i] for i in small], dtype=PRIME_DTYPE)
+        index = np.searchsorted(table.primes, keys, side='left')
+        found = table.primes[np.minimum(index, len(table.primes) - 1)] == keys
+        result[small] = found & (index < len(table.primes))
+    for i in set(range(len(values))).difference(small):
+        result[i] = is_prime(values[i])
+    return result
+
+
+def next_primes(seeds) -> np.ndarray:
+    """
+    العدد الأولي التالي لكل بذرة في مصفوفة
+    Batch next_prime: vectorized searchsorted where the table covers the seed
+    """
+    seeds = np.asarray(seeds, dtype=PRIME_DTYPE)
+    result = np.empty(len(seeds), dtype=PRIME_DTYPE)
+    if not len(seeds):
+        return result
+
+    table = get_prime_table()
+    # تمديد الجدول ليغطي البذور (مع هامش لأكبر فجوة متوقعة)
+    top = int(seeds.max())
+    table.ensure(top + window_size(top) * 4)
+
+    index = np.searchsorted(table.primes, seeds, side='right')
+    covered = index < len(table.primes)
+    result[covered] = table.primes[index[covered]]
+    for i in np.flatnonzero(~covered).tolist():
+        result[i] = next_prime(int(seeds[i]))
+    return result
+
+
+def prev_primes(seeds) -> np.ndarray:
+    """
+    العدد الأولي السابق لكل بذرة (0 حيث لا يوجد عدد أولي أصغر)
+    Batch prev_prime; seeds <= 2 map to 0
+    """
+    seeds = np.asarray(seeds, dtype=PRIME_DTYPE)
+    result = np.zeros(len(seeds), dtype=PRIME_DTYPE)
+    if not len(seeds):
+        return result
+
+    table = get_prime_table()
+    table.ensure(int(seeds.max()))
+
+    index = np.searchsorted(table.primes, seeds, side='left')
+    covered = (seeds <= table.limit + 1) & (index > 0)
+    result[covered] = table.primes[index[covered] - 1]
+    for i in np.flatnonzero(~covered & (seeds > 2)).tolist():
+        result[i] = prev_prime(int(seeds[i]))
+    return result
+
+
+def nearest_primes(values, primes=None) -> np.ndarray:
+    """
+    أقرب عدد أولي لكل قيمة في مصفوفة (بحث ثنائي واحد متجه)
+    Nearest prime to each value; ties go to the smaller prime. primes is a
+    sorted prime array (default: the shared table, extended to cover values)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.empty(values.shape, dtype=PRIME_DTYPE)
+    if not values.size:
+        return result
+
+    fallback = None
+    if primes is None:
+        table = get_prime_table()
+        top = int(math.ceil(values.max()))
+        table.ensure(top + window_size(top) * 4)
+        primes = table.primes
+        # القيم خارج الجدول تُحسم بالبحث عن التالي والسابق
+        fallback = values > table.limit
+    else:
+        primes = np.asarray(primes, dtype=PRIME_DTYPE)
+        if not len(primes):
+            raise ValueError("قائمة الأعداد الأولية فارغة")
+
+    # مفاتيح صحيحة: البحث بقيم float كان يحوّل الجدول كله إلى float64 في كل استدعاء
+    keys = np.floor(np.clip(values, 0, np.iinfo(PRIME_DTYPE).max // 2)).astype(PRIME_DTYPE)
+    index = np.searchsorted(primes, keys, side='right')
+    lower = primes[np.maximum(index - 1, 0)]
+    upper = primes[np.minimum(index, len(primes) - 1)]
+    take_lower = np.abs(values - lower) <= np.abs(upper - values)
+    result[...] = np.where(take_lower, lower, upper)
+
+    if fallback is not None and fallback.any():
+        for i in zip(*np.nonzero(fallback)):
+            value = float(values[i])
+            below = prev_prime(math.floor(value) + 1) or 2
+            above = next_prime(math.floor(value))
+            result[i] = below if value - below <= above - value else above
+    return result
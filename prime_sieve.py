@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+محرك الغربال المقطعي للأعداد الأولية - نظرية الفتائل
+Segmented Prime Sieve Engine - Filament Theory
+
+غربال إراتوستينس مقطعي للأعداد الفردية فقط مبني على NumPy.
+كل قطعة بحجم ذاكرة التخزين المؤقت (L2) لذلك تبقى الذاكرة محدودة
+مهما كان النطاق [a, b]، ويمكن الوصول إلى 10^11 وما بعدها.
+"""
+
+import math
+import numpy as np
+from typing import Iterator, Optional
+
+# عدد الأعداد الفردية في كل قطعة (بايت لكل عدد فردي ≈ 256 كيلوبايت)
+SEGMENT_SIZE = 1 << 18
+
+# نوع مصفوفات الأعداد الأولية الناتجة
+PRIME_DTYPE = np.int64
+
+
+def base_primes(limit: int) -> np.ndarray:
+    """
+    غربال بسيط للأعداد الفردية فقط لتوليد الأعداد الأولية حتى limit
+    Simple odd-only sieve returning all primes <= limit
+    """
+    if limit < 2:
+        return np.empty(0, dtype=PRIME_DTYPE)
+    if limit < 3:
+        return np.array([2], dtype=PRIME_DTYPE)
+
+    # الفهرس i يمثل العدد الفردي 2i + 3
+    flags = np.ones((limit - 1) // 2, dtype=bool)
+    for i in range((math.isqrt(limit) - 3) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 3
+            flags[(p * p - 3) // 2::p] = False
+
+    odd_primes = 2 * np.flatnonzero(flags).astype(PRIME_DTYPE) + 3
+    return np.concatenate((np.array([2], dtype=PRIME_DTYPE), odd_primes))
+
+
+def iter_prime_chunks(start: int, end: int,
+                      segment_size: int = SEGMENT_SIZE,
+                      sieving_primes: Optional[np.ndarray] = None) -> Iterator[np.ndarray]:
+    """
+    توليد الأعداد الأولية في [start, end] على شكل قطع مرتبة
+    Yield the primes in [start, end] as sorted NumPy chunks, one per segment
+
+    sieving_primes: أعداد أولية أساسية جاهزة تغطي √end على الأقل
+    (مثلاً من ذاكرة مشتركة بين العمليات) بدل حسابها من جديد
+    """
+    start = max(start, 2)
+    if end < start:
+        return
+
+    if start == 2:
+        yield np.array([2], dtype=PRIME_DTYPE)
+        start = 3
+
+    # أول عدد فردي في النطاق
+    first_odd = start | 1
+    if first_odd > end:
+        return
+
+    # الأعداد الأولية الأساسية حتى √end (بدون العدد 2)
+    if sieving_primes is None:
+        sieving_primes = base_primes(math.isqrt(end))
+    sieving_primes = sieving_primes[sieving_primes > 2]
+    squares = sieving_primes * sieving_primes
+
+    low = first_odd
+    while low <= end:
+        count = min(segment_size, (end - low) // 2 + 1)
+        high = low + 2 * (count - 1)
+        flags = np.ones(count, dtype=bool)
+
+        # الأعداد الأولية التي يقع مربعها داخل القطعة أو قبلها فقط
+        active = np.searchsorted(squares, high, side='right')
+        if active:
+            ps = sieving_primes[:active]
+            # أول مضاعف فردي لكل عدد أولي داخل القطعة
+            first = np.maximum(squares[:active], ((low + ps - 1) // ps) * ps)
+            first += np.where(first % 2 == 0, ps, 0)
+            offsets = (first - low) // 2
+            hit = offsets < count
+            for p, offset in zip(ps[hit].tolist(), offsets[hit].tolist()):
+                flags[offset::p] = False
+
+        yield low + 2 * np.flatnonzero(flags).astype(PRIME_DTYPE)
+        low = high + 2
+
+
+def primes_in_range(start: int, end: int,
+                    segment_size: int = SEGMENT_SIZE) -> np.ndarray:
+    """
+    جميع الأعداد الأولية في النطاق [start, end] كمصفوفة NumPy
+    All primes in the inclusive range [start, end] as a NumPy array
+    """
+    chunks = list(iter_prime_chunks(start, end, segment_size))
+    if not chunks:
+        return np.empty(0, dtype=PRIME_DTYPE)
+    return np.concatenate(chunks)
+
+
+def count_primes_in_range(start: int, end: int,
+                          segment_size: int = SEGMENT_SIZE) -> int:
+    """عدّ الأعداد الأولية في [start, end] بدون الاحتفاظ بها"""
+    return sum(len(chunk) for chunk in iter_prime_chunks(start, end, segment_size))
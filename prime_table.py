@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+جدول الأعداد الأولية المشترك - نظرية الفتائل
+Shared Prime Table - Filament Theory
+
+جدول واحد على مستوى العملية يحتوي جميع الأعداد الأولية من 2 حتى حد معين.
+يُبنى مرة واحدة ويُمدَّد عند الحاجة بغربلة الجزء الجديد فقط، وتُجاب
+استعلامات النطاقات بالبحث الثنائي (searchsorted) دون إعادة غربلة.
+الجدول المشترك مدعوم بملف على القرص (prime_cache) يُعاد استخدامه بين التشغيلات.
+"""
+
+import numpy as np
+from typing import Iterator, Optional
+
+from prime_cache import default_cache_path, extend_prime_cache, open_prime_cache
+from prime_count import count_primes
+from prime_sieve import PRIME_DTYPE, iter_prime_chunks, primes_in_range
+
+# حجم القطع عند المرور على نطاق كبير
+CHUNK_SIZE = 1 << 20
+
+# أكبر حد يُحتفظ به في الذاكرة (5,761,455 عدد أولي ≈ 46 ميغابايت)
+# النطاقات الأبعد تُغربل مباشرة بالغربال المقطعي دون تخزين
+DEFAULT_MAX_LIMIT = 10 ** 8
+
+
+class PrimeTable:
+    """جدول مرتب لجميع الأعداد الأولية حتى limit"""
+
+    def __init__(self, limit: int = 0, max_limit: int = DEFAULT_MAX_LIMIT,
+                 cache_path: Optional[str] = None):
+        self.limit = 1
+        self.max_limit = max_limit
+        self.cache_path = cache_path
+        self.primes = np.empty(0, dtype=PRIME_DTYPE)
+
+        # تحميل الجدول المحفوظ من تشغيل سابق (memmap - بدون قراءة فعلية)
+        if cache_path:
+            cached = open_prime_cache(cache_path)
+            if cached is not None:
+                self.limit, self.primes = cached
+
+        if limit:
+            self.ensure(limit)
+
+    def ensure(self, limit: int) -> None:
+        """
+        تمديد الجدول ليغطي جميع الأعداد الأولية حتى limit
+        Extend the table to cover every prime <= limit, sieving only the new part
+        """
+        limit = min(limit, self.max_limit)
+        if limit <= self.limit:
+            return
+
+        if self.cache_path:
+            try:
+                self.limit, self.primes = extend_prime_cache(self.cache_path, limit)
+                return
+            except OSError as e:
+                print(f"⚠️ تعذر استخدام ملف التخزين {self.cache_path}: {e}")
+                self.cache_path = None
+                self.primes = np.array(self.primes)
+
+        new_primes = primes_in_range(self.limit + 1, limit)
+        self.primes = np.concatenate((self.primes, new_primes))
+        self.limit = limit
+
+    def covers(self, end: int) -> bool:
+        """هل يمكن للجدول الإجابة عن نطاق ينتهي عند end"""
+        return end <= self.bound
+
+    @property
+    def bound(self) -> int:
+        """أكبر حد يمكن للجدول تغطيته"""
+        return max(self.max_limit, self.limit)
+
+    def primes_between(self, start: int, end: int) -> np.ndarray:
+        """
+        الأعداد الأولية في النطاق [start, end] كشريحة من الجدول
+        Primes in the inclusive range [start, end] as a slice of the table
+        """
+        if not self.covers(end):
+            # الجزء الواقع خارج الجدول يُغربل مباشرة
+            tail = primes_in_range(max(start, self.bound + 1), end)
+            if start > self.bound:
+                return tail
+            return np.concatenate((self.primes_between(start, self.bound), tail))
+        self.ensure(end)
+        lo = np.searchsorted(self.primes, start, side='left')
+        hi = np.searchsorted(self.primes, end, side='right')
+        return self.primes[lo:hi]
+
+    def iter_primes_between(self, start: int, end: int,
+                            chunk_size: int = CHUNK_SIZE) -> Iterator[np.ndarray]:
+        """
+        المرور على الأعداد الأولية في [start, end] على شكل قطع محدودة الحجم
+        Yield the primes in [start, end] in bounded chunks: table slices below
+        the bound, segmented-sieve output above it
+        """
+        if start <= self.bound:
+            covered = self.primes_between(start, min(end, self.bound))
+            for i in range(0, len(covered), chunk_size):
+                yield covered[i:i + chunk_size]
+        if end > self.bound:
+            yield from iter_prime_chunks(max(start, self.bound + 1), end)
+
+    def count_between(self, start: int, end: int) -> int:
+        """
+        عدد الأعداد الأولية في النطاق [start, end] بدون سردها
+        Two searchsorted calls inside the table, π(end) − π(start − 1) beyond it
+        """
+        if end > self.limit:
+            return count_primes(start, end)
+        if end < start:
+            return 0
+        lo = np.searchsorted(self.primes, start, side='left')
+        hi = np.searchsorted(self.primes, end, side='right')
+        return int(hi - lo)
+
+    def __len__(self) -> int:
+        return len(self.primes)
+
+
+_shared_table = None
+
+
+def get_prime_table() -> PrimeTable:
+    """الجدول المشترك على مستوى العملية"""
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = PrimeTable(cache_path=default_cache_path())
+    return _shared_table
+
+
+def primes_between(start: int, end: int) -> np.ndarray:
+    """الأعداد الأولية في [start, end] من الجدول المشترك"""
+    return get_prime_table().primes_between(start, end)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+ذاكرة مؤقتة محدودة لخصائص الأعداد الأولية - نظرية الفتائل
+Bounded Per-Prime Property Cache - Filament Theory
+
+ذاكرة LRU محدودة الحجم لنتائج الحسابات لكل عدد (الخصائص الفتائلية، خصائص
+الحفرة، الفحص اليدوي)، مفتاحها (إصدار القوانين، العدد)، مع عدادات
+الإصابة والإخفاق والإزالة. الأعداد الصغيرة نفسها تُطلب مراراً في الاستخدام
+التفاعلي وفي الخدمة، فتُعاد نتيجتها بدون إعادة الحساب أو فحص الأولية.
+
+    cache = get_property_cache('cavity')
+    result = cache.get(prime, compute)
+
+المستدعون الدفعيون يمكنهم ملء الذاكرة مسبقاً (prefill) أو تجاوزها مؤقتاً
+(bypass) حتى لا تطرد ملايين الأعداد المارة مرة واحدة الأعداد الساخنة.
+القيم المعادة لا تُشارك قابلة للتعديل: القواميس تُنسخ لكل مستدعٍ، وسجلات
+LawRecord للقراءة فقط فتُعاد كما هي (to_dict() تعطي نسخة قابلة للتعديل).
+
+الحجم الافتراضي من متغير البيئة FILAMENT_PROPERTY_CACHE_SIZE (0 يعطل التخزين).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from filament_core import LAW_VERSION
+
+# عدد الإدخالات الافتراضي لكل ذاكرة
+DEFAULT_MAXSIZE = 4096
+
+# متغير البيئة لتحديد الحجم
+SIZE_ENV_VAR = 'FILAMENT_PROPERTY_CACHE_SIZE'
+
+
+def default_maxsize() -> int:
+    """الحجم الافتراضي (من متغير البيئة إن وُجد)"""
+    value = os.environ.get(SIZE_ENV_VAR)
+    if value is None or not value.strip():
+        return DEFAULT_MAXSIZE
+    return max(0, int(value))
+
+
+def copy_value(value):
+    """نسخة من قيمة مخزنة: القواميس (والمتداخلة فيها) تُنسخ، وغيرها يُعاد كما هو"""
+    if isinstance(value, dict):
+        return {key: copy_value(item) if isinstance(item, dict) else item for key, item in value.items()}
+    return value
+
+
+class PropertyCache:
+    """
+    ذاكرة LRU محدودة لنتائج حساب لكل عدد
+    Size-bounded LRU memo keyed by (law version, prime) with hit/miss counters
+    """
+
+    def __init__(self, name: str, maxsize: int = None, version: int = LAW_VERSION):
+        self.name = name
+        self.maxsize = default_maxsize() if maxsize is None else maxsize
+        self.version = version
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._bypass = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, prime: int, compute: Callable[[int], Dict]) -> Dict:
+        """النتيجة المخزنة للعدد prime، أو compute(prime) مع تخزينها"""
+        if self._bypass or not self.maxsize:
+            self.bypassed += 1
+            return compute(prime)
+
+        key = (self.version, prime)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy_value(value)
+            self.misses += 1
+
+        value = compute(prime)
+        self._store(key, value)
+        return copy_value(value)
+
+    def get_many(self, primes: Iterable[int], compute_batch: Callable[[List[int]], List[Dict]]) -> List[Dict]:
+        """
+        النتائج لعدة أعداد: المخزنة من الذاكرة والباقي باستدعاء دفعي واحد
+        Batch get: compute_batch receives the distinct missing primes (in first-seen
+        order) and returns their values in the same order
+        """
+        primes = list(primes)
+        if self._bypass or not self.maxsize:
+            self.bypassed += len(primes)
+            return list(compute_batch(primes))
+
+        results = [None] * len(primes)
+        missing: Dict[int, List[int]] = {}
+        with self._lock:
+            for i, prime in enumerate(primes):
+                key = (self.version, prime)
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results[i] = copy_value(value)
+                else:
+                    missing.setdefault(prime, []).append(i)
+            self.misses += len(missing)
+
+        if missing:
+            for (prime, indices), value in zip(missing.items(), compute_batch(list(missing))):
+                self._store((self.version, prime), value)
+                for i in indices:
+                    results[i] = copy_value(value)
+        return results
+
+    def _store(self, key: Tuple[int, int], value: Dict) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def prefill(self, items: Iterable[Tuple[int, Dict]]) -> int:
+        """
+        تخزين نتائج محسوبة مسبقاً (مثلاً من حساب دفعي)
+        Insert (prime, value) pairs without counting hits or misses
+        """
+        count = 0
+        if not self.maxsize:
+            return count
+        for prime, value in items:
+            self._store((self.version, prime), copy_value(value))
+            count += 1
+        return count
+
+    @contextmanager
+    def bypass(self):
+        """تعطيل البحث والتخزين مؤقتاً (للحلقات الدفعية على أعداد لن تتكرر)"""
+        self._bypass += 1
+        try:
+            yield self
+        finally:
+            self._bypass -= 1
+
+    def clear(self) -> None:
+        """حذف جميع الإدخالات (العدادات تبقى)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """إحصائيات الذاكرة القابلة للتحويل إلى JSON"""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'version': self.version,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'bypassed': self.bypassed,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+_caches: Dict[str, PropertyCache] = {}
+
+
+def get_property_cache(name: str) -> PropertyCache:
+    """الذاكرة المشتركة على مستوى العملية باسم معين"""
+    if name not in _caches:
+        _caches[name] = PropertyCache(name)
+    return _caches[name]
+
+
+def cache_stats() -> Dict[str, Dict]:
+    """إحصائيات جميع الذواكر المشتركة"""
+    return {name: cache.stats() for name, cache in _caches.items()}
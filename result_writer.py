@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+كاتب النتائج المتدفق - نظرية الفتائل
+Streaming Result Writer - Filament Theory
+
+يكتب كل سجل فور إنتاجه كسطر JSON مستقل (NDJSON / JSON Lines) بدلاً من
+بناء شجرة النتائج كاملة في الذاكرة ثم تفريغها، فتبقى الذاكرة ثابتة
+مهما كان عدد الأعداد الأولية المختبرة.
+"""
+
+import json
+import math
+import numpy as np
+from typing import Dict, Iterable, Optional
+
+
+class NumpyJSONEncoder(json.JSONEncoder):
+    """مُرمِّز JSON يفهم أنواع NumPy (و mpmath.mpf وسجلات LawRecord) بدون نسخ شجرة النتائج"""
+
+    def default(self, obj):
+        if isinstance(obj, np.integer):
+            return int(obj)
+        if isinstance(obj, np.floating):
+            return float(obj)
+        if isinstance(obj, np.bool_):
+            return bool(obj)
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if hasattr(obj, 'to_dict'):
+            # سجل LawRecord: يُحوَّل إلى قاموس عند التصدير فقط
+            return obj.to_dict()
+        if hasattr(obj, '_mpf_'):
+            # mpmath.mpf من وضع الأعداد الكبيرة: رقم إن كان ضمن نطاق float وإلا نص
+            value = float(obj)
+            return str(obj) if math.isinf(value) and abs(obj) != math.inf else value
+        return super().default(obj)
+
+
+class ResultWriter:
+    """
+    مجرى نتائج NDJSON: سطر JSON لكل سجل
+    Incremental JSON-lines sink; compact=True drops all optional whitespace
+    """
+
+    def __init__(self, filename: str, compact: bool = True):
+        self.filename = filename
+        self.compact = compact
+        self.separators = (',', ':') if compact else (', ', ': ')
+        self.records_written = 0
+        self.bytes_written = 0
+        self.file = open(filename, 'w', encoding='utf-8')
+
+    def write(self, record: Dict, record_type: Optional[str] = None):
+        """كتابة سجل واحد (مع نوع السجل في المفتاح 'record' إن أُعطي)"""
+        if record_type is not None:
+            record = {'record': record_type, **record}
+        line = json.dumps(record, cls=NumpyJSONEncoder, ensure_ascii=False,
+                          separators=self.separators) + '\n'
+        self.file.write(line)
+        self.records_written += 1
+        self.bytes_written += len(line.encode('utf-8'))
+
+    def write_many(self, records: Iterable[Dict], record_type: Optional[str] = None):
+        """كتابة مجموعة سجلات بالترتيب"""
+        for record in records:
+            self.write(record, record_type)
+
+    def write_columns(self, columns: Dict[str, np.ndarray], record_type: Optional[str] = None):
+        """كتابة قطعة أعمدة (مصفوفة لكل حقل) كسجل لكل صف"""
+        for row in column_rows(columns):
+            self.write(row, record_type)
+
+    def close(self):
+        """إغلاق الملف"""
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def column_rows(columns: Dict[str, np.ndarray]) -> Iterable[Dict]:
+    """تحويل قاموس أعمدة إلى سجلات (قاموس لكل صف بقيم Python عادية)"""
+    names = list(columns)
+    for row in zip(*(np.asarray(columns[name]).tolist() for name in names)):
+        yield dict(zip(names, row))
+
+
+def dump_json(data, filename: str, compact: bool = False):
+    """حفظ كائن JSON كامل بالمُرمِّز الذي يفهم NumPy (بدون نسخ عميق)"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        if compact:
+            json.dump(data, f, cls=NumpyJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(data, f, cls=NumpyJSONEncoder, ensure_ascii=False, indent=2)
+
+
+def read_records(filename: str, record_type: Optional[str] = None) -> Iterable[Dict]:
+    """قراءة سجلات NDJSON واحداً تلو الآخر (مع تصفية حسب النوع)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record_type is None or record.get('record') == record_type:
+                yield record
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+نقاط استئناف الاختبارات الطويلة - نظرية الفتائل
+Run Checkpoints for Long Tests - Filament Theory
+
+الاختبارات الطويلة (run_ultimate_test و run_comprehensive_test) تحفظ كل نطاق
+مكتمل في ملف JSON مستقل، والتقدم داخل النطاق الجاري (آخر قطعة مكتملة
+وإحصائياتها المدمجة) في ملف فهرس manifest.json. كل كتابة في ملف مؤقت ثم
+os.replace، فالتشغيل المقطوع في أي لحظة لا يترك ملفاً نصف مكتوب.
+
+مجلد التشغيل مشتق من هوية التشغيل (البذرة، وضع الاختبار، إصدار القوانين
+LAW_VERSION)، وكل نطاق مفتاحه حدوده وحجم عينته. التشغيل بلا بذرة يسحب بذرة
+عشوائية تُحفظ في الفهرس (run_seed)، فالتشغيل المستأنف يكمل نفس العينات بدل
+خلط عينتين:
+
+    <checkpoint_dir>/ultimate-<hash>/manifest.json
+    <checkpoint_dir>/ultimate-<hash>/0000.json      # النطاق المكتمل الأول
+
+فإعادة التشغيل بنفس الخيارات تتخطى النطاقات المكتملة وتكمل النطاق الجاري من
+آخر قطعة، وتغيير البذرة أو القوانين يبدأ من جديد. يُحذف المجلد عند اكتمال
+التشغيل.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import shutil
+import time
+from typing import Dict, Iterable, Optional
+
+from result_writer import NumpyJSONEncoder
+
+RUN_CHECKPOINT_FORMAT = 'filament-run-checkpoint'
+RUN_CHECKPOINT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+
+# الفاصل الزمني الافتراضي بين حفظ التقدم داخل نطاق (ثوانٍ)؛ النطاقات المكتملة تُحفظ فوراً
+CHECKPOINT_SECONDS = 60
+
+# متغير البيئة لتحديد مجلد نقاط الاستئناف، والقيم "" أو "off" تعطلها
+CHECKPOINT_ENV_VAR = 'FILAMENT_RUN_CHECKPOINTS'
+
+
+def default_checkpoint_dir() -> Optional[str]:
+    """المجلد الافتراضي لنقاط الاستئناف (None إذا كانت معطلة)"""
+    path = os.environ.get(CHECKPOINT_ENV_VAR)
+    if path is not None:
+        return None if path.strip().lower() in ('', 'off', '0') else path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'filament_theory', 'runs')
+
+
+def run_key(identity: Dict) -> str:
+    """بصمة ثابتة لهوية التشغيل (JSON مرتب المفاتيح)"""
+    canonical = json.dumps(identity, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def values_key(values: Iterable[int]) -> str:
+    """بصمة قائمة أعداد (لربط وحدة محفوظة بالأعداد التي اختبرتها فعلاً)"""
+    return hashlib.sha256(json.dumps(list(values), separators=(',', ':')).encode('ascii')).hexdigest()[:12]
+
+
+def write_json_atomic(path: str, data) -> None:
+    """كتابة JSON في ملف مؤقت ثم استبداله (لا يبقى ملف نصف مكتوب)"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, cls=NumpyJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_json(path: str):
+    """قراءة ملف JSON، أو None إذا كان غير موجود أو تالفاً"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class RunCheckpoint:
+    """
+    نقاط استئناف تشغيل واحد: الوحدات المكتملة والتقدم داخل الوحدة الجارية
+    Completed units (ranges or groups, keyed by their bounds) and the partial
+    progress of unfinished ones, for one run identity
+    """
+
+    def __init__(self, checkpoint_dir: str, kind: str, identity: Dict,
+                 checkpoint_seconds: float = CHECKPOINT_SECONDS):
+        self.kind = kind
+        self.identity = identity
+        self.checkpoint_seconds = checkpoint_seconds
+        self.path = os.path.join(checkpoint_dir, f'{kind}-{run_key(identity)}')
+        self.manifest_path = os.path.join(self.path, MANIFEST_NAME)
+        self.manifest = self.read_manifest()
+        self.last_save = time.perf_counter()
+
+    def read_manifest(self) -> Dict:
+        """فهرس التشغيل المحفوظ إن طابق الهوية، وإلا فهرس فارغ"""
+        manifest = read_json(self.manifest_path)
+        if (not isinstance(manifest, dict)
+                or manifest.get('format') != RUN_CHECKPOINT_FORMAT
+                or manifest.get('version') != RUN_CHECKPOINT_VERSION
+                or manifest.get('kind') != self.kind
+                or manifest.get('identity') != self.identity):
+            return {'format': RUN_CHECKPOINT_FORMAT, 'version': RUN_CHECKPOINT_VERSION,
+                    'kind': self.kind, 'identity': self.identity,
+                    'completed': {}, 'partial': {}}
+        return manifest
+
+    def save_manifest(self) -> None:
+        """حفظ الفهرس (بعد ملف الوحدة، فالفهرس لا يشير أبداً إلى ملف غير موجود)"""
+        os.makedirs(self.path, exist_ok=True)
+        self.manifest['updated'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        write_json_atomic(self.manifest_path, self.manifest)
+        self.last_save = time.perf_counter()
+
+    def run_seed(self, seed: Optional[int] = None) -> int:
+        """
+        بذرة التشغيل: المعطاة، وإلا المحفوظة من التشغيل المقطوع، وإلا بذرة جديدة
+        An unseeded run draws a concrete seed and records it with the next
+        save, so a resumed run continues the same sample
+        """
+        if seed is not None:
+            return seed
+        if not isinstance(self.manifest.get('seed'), int):
+            self.manifest['seed'] = secrets.randbits(128)
+        return self.manifest['seed']
+
+    @property
+    def resumed(self) -> bool:
+        """هل يوجد عمل محفوظ من تشغيل سابق؟"""
+        return bool(self.manifest['completed'] or self.manifest['partial'])
+
+    def completed(self, unit: str) -> Optional[Dict]:
+        """نتيجة وحدة مكتملة من تشغيل سابق، أو None"""
+        filename = self.manifest['completed'].get(unit)
+        if filename is None:
+            return None
+        return read_json(os.path.join(self.path, filename))
+
+    def complete(self, unit: str, data: Dict) -> None:
+        """حفظ نتيجة وحدة مكتملة (وحذف تقدمها الجزئي)"""
+        os.makedirs(self.path, exist_ok=True)
+        filename = self.manifest['completed'].get(unit) or f"{len(self.manifest['completed']):04d}.json"
+        write_json_atomic(os.path.join(self.path, filename), data)
+        self.manifest['completed'][unit] = filename
+        self.manifest['partial'].pop(unit, None)
+        self.save_manifest()
+
+    def partial(self, unit: str) -> Optional[Dict]:
+        """التقدم المحفوظ داخل وحدة غير مكتملة، أو None"""
+        return self.manifest['partial'].get(unit)
+
+    def due(self) -> bool:
+        """هل مر checkpoint_seconds منذ آخر حفظ؟"""
+        return time.perf_counter() - self.last_save >= self.checkpoint_seconds
+
+    def save_partial(self, unit: str, progress: Dict) -> None:
+        """حفظ التقدم داخل وحدة (آخر قطعة مكتملة وما تراكم حتى الآن)"""
+        self.manifest['partial'][unit] = json.loads(json.dumps(progress, cls=NumpyJSONEncoder))
+        self.save_manifest()
+
+    def clear(self) -> None:
+        """حذف نقاط الاستئناف بعد اكتمال التشغيل"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.manifest['completed'].clear()
+        self.manifest['partial'].clear()
@@ -10,10 +10,10 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 🏆 أعظم اكتشاف في تاريخ الرياضيات والفيزياء
 """
 
-import subprocess
-import sys
 import os
 
+from filament_cli import run_module
+
 def print_banner():
     """طباعة البانر الترحيبي"""
     print("=" * 80)
@@ -51,15 +51,13 @@ def run_program(script_name):
             print(f"❌ الملف {script_name} غير موجود!")
             return
         
-        result = subprocess.run([sys.executable, script_name], 
-                              capture_output=False, 
-                              text=True)
-        
-        if result.returncode == 0:
-            print(f"\n✅ انتهى تشغيل {script_name} بنجاح!")
-        else:
-            print(f"\n❌ حدث خطأ في تشغيل {script_name}")
+        # داخل نفس العملية بدلاً من مفسر جديد لكل تشغيل
+        run_module(os.path.splitext(script_name)[0])
+        print(f"\n✅ انتهى تشغيل {script_name} بنجاح!")
             
+    except SystemExit as e:
+        if e.code:
+            print(f"\n❌ حدث خطأ في تشغيل {script_name}")
     except Exception as e:
         print(f"❌ خطأ في التشغيل: {e}")
 
@@ -0,0 +1,13 @@
+"""
+إعداد الاختبارات: وحدات المستودع في المسار، والتخزين على القرص معطل
+Test setup: the flat repo modules on sys.path, disk caches off
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for name in ('FILAMENT_PRIME_CACHE', 'FILAMENT_ZETA_CACHE', 'FILAMENT_LL_CHECKPOINTS',
+             'FILAMENT_RUN_CHECKPOINTS'):
+    os.environ[name] = 'off'
@@ -0,0 +1,58 @@
+"""الملف العمودي: الحفظ ثم التحميل يعيد نفس الأعمدة"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+import columnar_results
+from columnar_results import ColumnarResultWriter, flatten_record, load_columnar
+
+
+def test_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_results, 'FLUSH_ROWS', 3)
+    path = str(tmp_path / 'results.npz')
+    with ColumnarResultWriter(path, metadata={'source': 'test'}) as sink:
+        for p in (2, 3, 5, 7, 11):
+            sink.write({'range_name': 'tiny', 'prime': p, 'valid': p != 9,
+                        'four_d': {'volume': p * 4.0}}, record_type='prime')
+        sink.write_columns({'prime': np.array([13, 17]), 'valid': np.array([True, True]),
+                            'four_d': {'volume': np.array([52.0, 68.0])}}, 'prime', group='tiny')
+        sink.write({'total': 7, 'ranges': ['tiny']}, record_type='overall')
+
+    assert sink.records_written == 8
+    assert sink.bytes_written == os.path.getsize(path)
+
+    metadata, groups = load_columnar(path)
+    assert metadata['source'] == 'test' and metadata['version'] == columnar_results.COLUMNAR_FORMAT_VERSION
+    assert metadata['groups']['prime/tiny']['rows'] == 7
+    tiny = groups['prime/tiny']
+    assert set(tiny) == {'prime', 'valid', 'four_d.volume'}
+    assert tiny['prime'].tolist() == [2, 3, 5, 7, 11, 13, 17]
+    assert tiny['valid'].dtype == bool and tiny['valid'].all()
+    assert tiny['four_d.volume'].tolist() == [8.0, 12.0, 20.0, 28.0, 44.0, 52.0, 68.0]
+    assert json.loads(str(groups['overall']['ranges'][0])) == ['tiny']
+
+
+def test_flatten_record():
+    assert flatten_record({'a': 1, 'b': {'c': 2, 'd': {'e': 3}}, 'f': [1, 2]}) == {
+        'a': 1, 'b.c': 2, 'b.d.e': 3, 'f': '[1, 2]'}
+
+
+def test_mismatched_fields_rejected(tmp_path):
+    sink = ColumnarResultWriter(str(tmp_path / 'results.npz'))
+    sink.write({'prime': 2, 'valid': True}, 'prime')
+    with pytest.raises(ValueError):
+        sink.write({'prime': 3}, 'prime')
+    with pytest.raises(ValueError):
+        sink.write_columns({'prime': np.array([5])}, 'prime')
+
+
+def test_dataframes(tmp_path):
+    pytest.importorskip('pandas')
+    path = str(tmp_path / 'results.npz')
+    with ColumnarResultWriter(path) as sink:
+        sink.write_many([{'prime': 2}, {'prime': 3}], 'prime')
+    _, frames = load_columnar(path, as_dataframe=True)
+    assert frames['prime']['prime'].tolist() == [2, 3]
@@ -0,0 +1,48 @@
+"""حد max_bits في خدمة الحساب: الرفض قبل حساب القوة"""
+
+import asyncio
+import time
+
+import pytest
+
+from filament_cli import integer
+from filament_service import HTTPError, FilamentService
+
+
+def dispatch(service, target):
+    return asyncio.run(service.dispatch('GET', target, b''))
+
+
+@pytest.fixture
+def service():
+    service = FilamentService(max_bits=4423)
+    yield service
+    service.close()
+
+
+@pytest.mark.parametrize('target', ['/is_prime?n=10^30000000', '/is_prime?n=2**4425',
+                                    '/next_prime?n=3^2800-1'])
+def test_huge_power_rejected_before_computing(service, target):
+    start = time.perf_counter()
+    with pytest.raises(HTTPError) as error:
+        dispatch(service, target)
+    assert error.value.status == 400
+    assert time.perf_counter() - start < 1.0
+
+
+def test_limit_applies_to_plain_integers(service):
+    with pytest.raises(HTTPError) as error:
+        dispatch(service, f'/is_prime?n={2 ** 4500}')
+    assert error.value.status == 400
+
+
+def test_values_at_the_limit_are_parsed(service):
+    assert service._parse_integers(('n',), {'n': ['2^4423-1', '2^4422']}, b'') == [2 ** 4423 - 1, 2 ** 4422]
+
+
+def test_integer_bound():
+    assert integer('2^4423-1', max_bits=4423) == 2 ** 4423 - 1
+    with pytest.raises(OverflowError):
+        integer('10^30000000', max_bits=4096)
+    with pytest.raises(ValueError):
+        integer('2^x')
@@ -0,0 +1,74 @@
+"""المؤقتات والعدادات ومقاييس الإنتاجية"""
+
+import os
+
+import pytest
+
+from columnar_results import ColumnarResultWriter
+from instrumentation import NULL_METRICS, Metrics
+from result_writer import ResultWriter
+from ultimate_prime_test import UltimatePrimeFilamentTest
+
+
+def test_timers_counters_and_throughput():
+    metrics = Metrics()
+    with metrics.timer('sieve'):
+        pass
+    metrics.add_time('sieve', 2.0)
+    metrics.add_time('write', 0.5)
+    metrics.count('primes_sieved', 1000)
+    metrics.count('primes_sieved')
+    metrics.throughput('sieve_primes_per_second', 'primes_sieved', 'sieve')
+    metrics.throughput('bytes_per_second', 'bytes_written', 'write')
+    metrics.throughput('missing_timer', 'primes_sieved', 'evaluate')
+
+    data = metrics.to_dict()
+    assert data['timers']['sieve']['calls'] == 2
+    assert 2.0 <= data['timers']['sieve']['seconds'] < 2.5
+    assert data['counters'] == {'primes_sieved': 1001}
+    assert data['throughput']['sieve_primes_per_second'] == pytest.approx(1001 / data['timers']['sieve']['seconds'])
+    # مقاييس بلا عداد أو بلا زمن لا تظهر
+    assert set(data['throughput']) == {'sieve_primes_per_second'}
+
+
+def test_timer_records_on_error():
+    metrics = Metrics()
+    with pytest.raises(RuntimeError):
+        with metrics.timer('evaluate'):
+            raise RuntimeError
+    assert metrics.to_dict()['timers']['evaluate']['calls'] == 1
+
+
+def test_null_metrics_record_nothing():
+    with NULL_METRICS.timer('sieve'):
+        NULL_METRICS.count('primes_sieved', 10)
+    NULL_METRICS.add_time('sieve', 1.0)
+    NULL_METRICS.throughput('rate', 'primes_sieved', 'sieve')
+    assert not NULL_METRICS.enabled
+    assert NULL_METRICS.to_dict() == {}
+
+
+def test_ultimate_run_metrics():
+    metrics = Metrics()
+    tester = UltimatePrimeFilamentTest(metrics=metrics)
+    tester.test_ranges = {'tiny': (2, 100)}
+    results = tester.run_ultimate_test()
+    block = results['metrics']
+    assert block['counters']['primes_tested'] == 25
+    assert {'evaluate', 'total'} <= set(block['timers'])
+    assert 'primes_per_second' in block['throughput']
+
+
+@pytest.mark.parametrize('columnar', [False, True])
+def test_write_metrics_taken_after_close(tmp_path, columnar):
+    path = str(tmp_path / ('results.npz' if columnar else 'results.ndjson'))
+    sink = ColumnarResultWriter(path) if columnar else ResultWriter(path)
+    metrics = Metrics()
+    tester = UltimatePrimeFilamentTest(sink=sink, metrics=metrics, seed=1)
+    tester.test_ranges = {'tiny': (2, 100)}
+    tester.run_ultimate_test()
+    tester.close_sink()
+    block = tester.results['metrics']
+    assert block['counters']['bytes_written'] == os.path.getsize(path) > 0
+    assert block['counters']['records_written'] == sink.records_written
+    assert block['throughput']['bytes_per_second'] > 0
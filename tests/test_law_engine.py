@@ -0,0 +1,72 @@
+"""سجلات القوانين (قراءة فقط ونسخ عند التصدير) ودقة وضع الأعداد الكبيرة"""
+
+import math
+import pickle
+
+import pytest
+
+from filament_core import law_plan
+from law_engine import LawRecord, make_record, record_type
+
+
+def test_record_reads_like_dict():
+    record = make_record({'prime': 7, 'four_dimensional_properties': {'volume': 2.5}})
+    assert record == {'prime': 7, 'four_dimensional_properties': {'volume': 2.5}}
+    assert record['prime'] == 7 and record.prime == 7
+    assert list(record) == ['prime', 'four_dimensional_properties']
+    assert type(record) is record_type(('prime', 'four_dimensional_properties'))
+    assert isinstance(record['four_dimensional_properties'], LawRecord)
+
+
+def test_record_is_read_only():
+    record = make_record({'prime': 7, 'cavity_depth': 1.5})
+    with pytest.raises(TypeError):
+        record['cavity_depth'] = 0
+    with pytest.raises(AttributeError):
+        record.cavity_depth = 0
+    with pytest.raises(AttributeError):
+        del record.cavity_depth
+    with pytest.raises(AttributeError):
+        record.extra = 0
+    assert record == {'prime': 7, 'cavity_depth': 1.5}
+
+
+def test_to_dict_is_a_mutable_copy():
+    record = make_record({'prime': 7, 'nested': {'value': 1}})
+    copy = record.to_dict()
+    copy['prime'] = 0
+    copy['nested']['value'] = 0
+    assert type(copy) is dict and type(copy['nested']) is dict
+    assert record == {'prime': 7, 'nested': {'value': 1}}
+
+
+def test_record_constructors_agree():
+    cls = record_type(('a', 'b'))
+    assert cls(1, 2) == cls._build(1, 2) == {'a': 1, 'b': 2}
+    assert record_type(())() == {}
+
+
+def test_record_pickles_as_dict():
+    record = make_record({'prime': 7, 'nested': {'value': 1}})
+    assert pickle.loads(pickle.dumps(record)) == {'prime': 7, 'nested': {'value': 1}}
+
+
+@pytest.mark.parametrize('precision', [30, 50, 80])
+def test_big_mode_constants_follow_precision(precision):
+    mpmath = pytest.importorskip('mpmath')
+    plan = law_plan(['prime_frequency', 'frequency_error', 'spherical_surface_area', 'smoky_volume'])
+    values = plan.big(97, precision=precision)
+    with mpmath.workdps(precision + 10):
+        tolerance = mpmath.mpf(10) ** (2 - precision)
+        assert abs(values['prime_frequency'] / (mpmath.mpf(97) / mpmath.pi) - 1) < tolerance
+        assert abs(values['spherical_surface_area'] / (4 * mpmath.pi) - 1) < tolerance
+        assert abs(values['smoky_volume'] / (4 * mpmath.pi / 3) - 1) < tolerance
+        assert values['frequency_error'] < tolerance
+    assert isinstance(values['spherical_surface_area'], mpmath.mpf)
+
+
+def test_float_mode_unchanged_by_exact_constants():
+    values = law_plan(['prime_frequency', 'spherical_surface_area', 'fundamental_frequency']).scalar(97)
+    assert values['prime_frequency'] == 97 / math.pi
+    assert values['spherical_surface_area'] == 4 * math.pi * 1.0 ** 2
+    assert type(values['fundamental_frequency']) is float
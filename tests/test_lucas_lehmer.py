@@ -0,0 +1,81 @@
+"""اختبار لوكاس-ليمر: الأسس المعروفة، الاختزال، ونقاط الاستئناف"""
+
+import os
+
+import lucas_lehmer
+from instrumentation import Metrics
+from lucas_lehmer import (KNOWN_MERSENNE_EXPONENTS, checkpoint_file, lucas_lehmer_residue,
+                          read_checkpoint, write_checkpoint)
+
+
+def test_known_mersenne_exponents():
+    exponents = [p for p in range(2, 700)]
+    found = [record['exponent'] for record in lucas_lehmer.check_exponents(exponents) if record['is_prime']]
+    assert found == [p for p in KNOWN_MERSENNE_EXPONENTS if p < 700]
+
+
+def test_residue_matches_plain_modulo():
+    exponent = 89
+    modulus = (1 << exponent) - 1
+    s = 4
+    for _ in range(40):
+        s = (s * s - 2) % modulus
+    assert lucas_lehmer_residue(exponent, 40) == s
+    # المتابعة من منتصف الطريق تعطي النتيجة نفسها
+    assert lucas_lehmer_residue(exponent, 40, lucas_lehmer_residue(exponent, 17), 17) == s
+
+
+def test_composite_exponent_is_not_tested():
+    record = lucas_lehmer.lucas_lehmer(15)
+    assert record['is_prime'] is False and record['iterations'] == 0
+
+
+def test_checkpoint_round_trip_and_rejection(tmp_path):
+    path = checkpoint_file(str(tmp_path), 127)
+    residue = lucas_lehmer_residue(127, 60)
+    write_checkpoint(path, 127, 60, residue)
+    assert read_checkpoint(path, 127) == (60, residue)
+    assert read_checkpoint(path, 131) is None
+    assert read_checkpoint(str(tmp_path / 'missing.npz'), 127) is None
+    with open(path, 'wb') as f:
+        f.write(b'not a checkpoint')
+    assert read_checkpoint(path, 127) is None
+
+
+def test_resume_from_checkpoint(tmp_path):
+    exponent, start = 1279, 512
+    path = checkpoint_file(str(tmp_path), exponent)
+    write_checkpoint(path, exponent, start, lucas_lehmer_residue(exponent, start))
+
+    metrics = Metrics()
+    record = lucas_lehmer.lucas_lehmer(exponent, str(tmp_path), metrics=metrics)
+    fresh = lucas_lehmer.lucas_lehmer(exponent)
+    assert record['resumed_from'] == start
+    assert record['iterations'] == exponent - 2 - start
+    assert record['is_prime'] and record['res64'] == fresh['res64']
+    assert metrics.counters['ll_iterations'] == exponent - 2 - start
+    # نقطة الاستئناف تُحذف بعد اكتمال الاختبار
+    assert not os.path.exists(path)
+
+
+def test_checkpoints_written_during_run(tmp_path, monkeypatch):
+    exponent = 1279
+    saved = []
+    original = lucas_lehmer.write_checkpoint
+
+    def spy(path, p, iteration, residue):
+        saved.append(iteration)
+        original(path, p, iteration, residue)
+
+    monkeypatch.setattr(lucas_lehmer, 'write_checkpoint', spy)
+    record = lucas_lehmer.lucas_lehmer(exponent, str(tmp_path), checkpoint_seconds=0)
+    assert record['is_prime']
+    assert saved == [256, 512, 768, 1024]
+    assert not os.listdir(tmp_path)
+
+
+def test_no_test_named_functions_in_scripts():
+    # challenge_response_test.py يطابق نمط pytest (*_test.py): أي دالة test_* فيه تُجمع كاختبار
+    import challenge_response_test
+    assert not [name for name in vars(challenge_response_test) if name.startswith('test')]
+    assert not [name for name in vars(lucas_lehmer) if name.startswith('test')]
@@ -0,0 +1,33 @@
+"""كل برنامج في قوائم التشغيل يمكن تشغيله داخل نفس العملية"""
+
+import ast
+import importlib
+import os
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def menu_scripts(runner):
+    """أسماء ملفات .py المذكورة في مشغّل القائمة"""
+    with open(os.path.join(ROOT, runner), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return sorted({node.value for node in ast.walk(tree)
+                   if isinstance(node, ast.Constant) and isinstance(node.value, str)
+                   and node.value.endswith('.py') and not node.value.startswith('.')})
+
+
+SCRIPTS = sorted(set(menu_scripts('run_filament_theory.py')) | set(menu_scripts('MASTER_RUNNER.py')))
+
+
+def test_menus_list_scripts():
+    assert 'visualize_results.py' in SCRIPTS and 'حاسبة_القوانين_اليدوية.py' in SCRIPTS
+
+
+@pytest.mark.parametrize('script', SCRIPTS)
+def test_menu_script_has_main(script):
+    # filament_cli.run_module يستدعي main() للوحدة
+    assert os.path.exists(os.path.join(ROOT, script))
+    module = importlib.import_module(script[:-len('.py')])
+    assert callable(getattr(module, 'main', None))
@@ -0,0 +1,64 @@
+"""فحص الأولية: أشباه الأوليات المعروفة وحول 2^64"""
+
+import pytest
+
+import primality
+from primality import is_prime, miller_rabin, strong_lucas
+from prime_sieve import primes_in_range
+
+# أشباه أوليات قوية لأسس ميلر-رابين الأولى، وأعداد كارمايكل
+PSEUDOPRIMES = [
+    561, 1105, 1729, 2047, 41041, 825265, 3215031751, 2152302898747,
+    3474749660383, 341550071728321, 3825123056546413051,
+    318665857834031151167461, 3317044064679887385961981,
+]
+
+# أشباه أوليات لوكاس القوية (معاملات سلفريدج)
+LUCAS_PSEUDOPRIMES = [5459, 5777, 10877, 16109, 18971]
+
+PRIMES_NEAR_2_64 = [2 ** 64 - 59, 2 ** 64 + 13, 2 ** 61 - 1, 2 ** 89 - 1, 2 ** 127 - 1]
+COMPOSITES_NEAR_2_64 = [2 ** 64 - 1, 2 ** 64, 2 ** 64 + 1, 2 ** 64 - 57, 2 ** 64 + 11,
+                        (2 ** 64 + 13) ** 2, (2 ** 31 - 1) * (2 ** 61 - 1),
+                        4611686014132420609, 2 ** 67 - 1]
+
+
+@pytest.fixture(params=['gmpy2', 'python'])
+def bpsw(request, monkeypatch):
+    """BPSW عبر gmpy2 إن كانت مثبتة، وتنفيذ بايثون دائماً"""
+    if request.param == 'python':
+        monkeypatch.setattr(primality, 'gmpy2', None)
+    elif primality.gmpy2 is None:
+        pytest.skip('gmpy2 غير مثبتة')
+    return request.param
+
+
+def test_small_numbers_match_sieve():
+    primes = set(primes_in_range(0, 20000).tolist())
+    assert [n for n in range(-5, 20001) if is_prime(n)] == sorted(primes)
+
+
+@pytest.mark.parametrize('n', PSEUDOPRIMES)
+def test_pseudoprimes_rejected(n, bpsw):
+    assert not is_prime(n)
+
+
+def test_pseudoprimes_fool_weak_tests():
+    assert miller_rabin(3215031751, (2, 3, 5, 7))
+    assert miller_rabin(3825123056546413051, (2, 3, 5, 7, 11, 13, 17, 19, 23))
+    assert miller_rabin(318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37))
+
+
+@pytest.mark.parametrize('n', LUCAS_PSEUDOPRIMES)
+def test_lucas_pseudoprimes(n):
+    assert strong_lucas(n)
+    assert not is_prime(n)
+
+
+@pytest.mark.parametrize('n', PRIMES_NEAR_2_64)
+def test_primes_around_2_64(n, bpsw):
+    assert is_prime(n)
+
+
+@pytest.mark.parametrize('n', COMPOSITES_NEAR_2_64)
+def test_composites_around_2_64(n, bpsw):
+    assert not is_prime(n)
@@ -0,0 +1,77 @@
+"""ملف الأعداد الأولية على القرص: البناء والتمديد والملفات التالفة"""
+
+import struct
+
+import numpy as np
+import pytest
+
+from prime_cache import (HEADER_FORMAT, HEADER_SIZE, default_cache_path, extend_prime_cache,
+                         open_prime_cache, read_header)
+from prime_sieve import primes_in_range
+from prime_table import PrimeTable
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'primes.bin')
+
+
+def test_missing_file(path):
+    assert open_prime_cache(path) is None
+    assert read_header(path) is None
+
+
+def test_build_and_extend(path):
+    limit, primes = extend_prime_cache(path, 1000)
+    assert limit == 1000 and primes.tolist() == primes_in_range(0, 1000).tolist()
+    assert isinstance(primes, np.memmap)
+
+    limit, primes = extend_prime_cache(path, 50000)
+    assert limit == 50000 and primes.tolist() == primes_in_range(0, 50000).tolist()
+    assert read_header(path) == (50000, len(primes))
+
+    # حد أصغر لا يغير الملف
+    assert extend_prime_cache(path, 10)[0] == 50000
+
+
+def test_interrupted_extension_keeps_previous_limit(path):
+    extend_prime_cache(path, 1000)
+    count = read_header(path)[1]
+    # أعداد ملحقة بدون تحديث الترويسة (كما يتركها تمديد مقطوع)
+    with open(path, 'ab') as f:
+        f.write(np.arange(5, dtype='<i8').tobytes())
+    limit, primes = open_prime_cache(path)
+    assert (limit, len(primes)) == (1000, count)
+    assert extend_prime_cache(path, 2000)[1].tolist() == primes_in_range(0, 2000).tolist()
+
+
+@pytest.mark.parametrize('damage', ['magic', 'version', 'short'])
+def test_invalid_file_is_rebuilt(path, damage):
+    extend_prime_cache(path, 1000)
+    with open(path, 'r+b') as f:
+        magic, version, dtype, limit, count = struct.unpack(HEADER_FORMAT, f.read(HEADER_SIZE))
+        if damage == 'magic':
+            magic = b'NOTPRIME'
+        elif damage == 'version':
+            version += 1
+        else:
+            f.truncate(HEADER_SIZE + 8)
+        f.seek(0)
+        f.write(struct.pack(HEADER_FORMAT, magic, version, dtype, limit, count))
+    assert open_prime_cache(path) is None
+    limit, primes = extend_prime_cache(path, 3000)
+    assert primes.tolist() == primes_in_range(0, 3000).tolist()
+
+
+def test_table_reuses_the_file(path):
+    first = PrimeTable(cache_path=path)
+    first.ensure(10 ** 5)
+    second = PrimeTable(cache_path=path)
+    assert second.limit >= 10 ** 5
+    assert second.primes_between(99000, 99100).tolist() == primes_in_range(99000, 99100).tolist()
+
+
+@pytest.mark.parametrize('value', ['off', 'OFF', '', '0'])
+def test_cache_can_be_disabled(monkeypatch, value):
+    monkeypatch.setenv('FILAMENT_PRIME_CACHE', value)
+    assert default_cache_path() is None
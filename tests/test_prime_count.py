@@ -0,0 +1,43 @@
+"""π(x) مقابل القيم المعروفة والغربال"""
+
+import pytest
+
+import prime_count
+from prime_count import count_primes, prime_pi
+from prime_sieve import count_primes_in_range
+
+KNOWN_PI = {
+    10: 4, 100: 25, 1000: 168, 10 ** 4: 1229, 10 ** 5: 9592, 10 ** 6: 78498,
+    10 ** 7: 664579, 10 ** 8: 5761455, 10 ** 9: 50847534, 10 ** 10: 455052511,
+}
+
+
+@pytest.mark.parametrize('x, expected', sorted(KNOWN_PI.items()))
+def test_known_values(x, expected):
+    prime_count.clear_cache()
+    assert prime_pi(x) == expected
+
+
+@pytest.mark.parametrize('x, expected', [(-7, 0), (0, 0), (1, 0), (2, 1), (3, 2), (4, 2), (5, 3)])
+def test_small_values(x, expected):
+    assert prime_pi(x) == expected
+
+
+def test_cached_table_answers_smaller_values():
+    prime_count.clear_cache()
+    assert prime_pi(10 ** 7) == 664579
+    for x in (10 ** 7 // 3, 10 ** 7 // 7, 999, 2):
+        assert prime_pi(x) == count_primes_in_range(0, x)
+
+
+@pytest.mark.parametrize('start, end', [
+    (0, 0), (24, 28), (10, 5), (5, -5), (2, 2), (1, 2), (-100, 100), (97, 97),
+    (10 ** 6, 10 ** 6 + 10 ** 4), (123456, 654321),
+])
+def test_count_primes_matches_sieve(start, end):
+    assert count_primes(start, end) == count_primes_in_range(start, end)
+
+
+@pytest.mark.parametrize('start, end', [(24, 28), (10, 5), (10 ** 9, 10 ** 9 - 1), (-5, 1)])
+def test_empty_and_reversed_ranges(start, end):
+    assert count_primes(start, end) == 0
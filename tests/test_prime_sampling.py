@@ -0,0 +1,72 @@
+"""عينات الأعداد الأولية: صحة العينة، التكرارية بالبذرة، والتوزيع"""
+
+from collections import Counter
+
+import pytest
+
+from prime_sampling import allocate, choose_method, sample_primes
+from prime_sieve import primes_in_range
+
+
+@pytest.mark.parametrize('method', ['table', 'reservoir', 'rejection'])
+def test_sample_is_distinct_primes_in_range(method):
+    primes = set(primes_in_range(50_000, 100_000).tolist())
+    sample = sample_primes(50_000, 100_000, 40, seed=3, method=method)
+    assert len(sample) == 40 and len(set(sample)) == 40
+    assert sample == sorted(sample)
+    assert all(50_000 <= p <= 100_000 and p in primes for p in sample)
+
+
+@pytest.mark.parametrize('method', ['auto', 'table', 'reservoir', 'rejection'])
+def test_same_seed_same_sample(method):
+    first = sample_primes(1_000, 200_000, 25, seed=11, strata=4, method=method)
+    assert first == sample_primes(1_000, 200_000, 25, seed=11, strata=4, method=method)
+    assert first != sample_primes(1_000, 200_000, 25, seed=12, strata=4, method=method)
+
+
+def test_small_range_returns_every_prime():
+    assert sample_primes(10, 30, 100, seed=1, method='table') == [11, 13, 17, 19, 23, 29]
+    assert sample_primes(10, 30, 100, seed=1, method='reservoir') == [11, 13, 17, 19, 23, 29]
+    with pytest.raises(ValueError):
+        sample_primes(10, 30, 100, seed=1, method='rejection')
+
+
+def test_empty_and_invalid_arguments():
+    assert sample_primes(30, 10, 5, seed=1) == []
+    assert sample_primes(2, 100, 0, seed=1) == []
+    with pytest.raises(ValueError):
+        sample_primes(2, 100, 5, method='magic')
+
+
+@pytest.mark.parametrize('method', ['table', 'reservoir'])
+def test_every_prime_equally_likely(method):
+    # 25 عدداً أولياً تحت 100، تُسحب 5 منها 2000 مرة: التكرار المتوقع 400 لكل عدد
+    counts = Counter(p for seed in range(2000) for p in sample_primes(2, 100, 5, seed=seed, method=method))
+    assert len(counts) == 25
+    assert all(300 < count < 500 for count in counts.values())
+
+
+def test_allocate_largest_remainder():
+    assert allocate(10, [1, 1, 1]) == [4, 3, 3]
+    assert allocate(7, [6, 0, 1]) == [6, 0, 1]
+    assert sum(allocate(13, [2.5, 7.1, 0.4])) == 13
+    assert allocate(5, [0, 0]) == [0, 0]
+
+
+def test_choose_method_depends_on_bounds():
+    assert choose_method(2, 1_000) == 'table'
+    assert choose_method(10 ** 15, 10 ** 15 + 10 ** 6) == 'reservoir'
+    assert choose_method(10 ** 15, 10 ** 16) == 'rejection'
+
+
+@pytest.mark.parametrize('method', ['auto', 'table', 'reservoir', 'rejection'])
+@pytest.mark.parametrize('start, width, k, strata', [
+    (1_000, 200_000, 25, 4),
+    (10 ** 12, 600, 11, 10),    # شرائح ضيقة: بعضها بلا أعداد أولية أو أقل من حصتها المقدرة
+])
+def test_stratified_sample_has_k_primes(method, start, width, k, strata):
+    end = start + width
+    primes = set(primes_in_range(start, end).tolist())
+    sample = sample_primes(start, end, k, seed=5, strata=strata, method=method)
+    assert len(sample) == k and len(set(sample)) == k
+    assert all(p in primes for p in sample)
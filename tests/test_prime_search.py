@@ -0,0 +1,40 @@
+"""العدد الأولي التالي والسابق عند الحدود"""
+
+import pytest
+
+from primality import is_prime
+from prime_search import next_prime, next_primes, prev_prime, prev_primes
+from prime_table import get_prime_table
+
+TWO_64_PREV = 2 ** 64 - 59
+TWO_64_NEXT = 2 ** 64 + 13
+
+
+@pytest.mark.parametrize('n, expected', [(-10, 2), (0, 2), (1, 2), (2, 3), (3, 5), (4, 5),
+                                         (13, 17), (TWO_64_PREV, TWO_64_NEXT), (2 ** 64, TWO_64_NEXT)])
+def test_next_prime(n, expected):
+    assert next_prime(n) == expected
+
+
+@pytest.mark.parametrize('n, expected', [(-10, None), (0, None), (1, None), (2, None), (3, 2),
+                                         (4, 3), (17, 13), (TWO_64_NEXT, TWO_64_PREV),
+                                         (2 ** 64, TWO_64_PREV)])
+def test_prev_prime(n, expected):
+    assert prev_prime(n) == expected
+
+
+def test_table_limit_edges():
+    limit = get_prime_table().limit
+    for n in range(limit - 50, limit + 50):
+        after = next_prime(n)
+        assert after > n and is_prime(after)
+        assert not any(is_prime(m) for m in range(n + 1, after))
+        before = prev_prime(n)
+        assert before < n and is_prime(before)
+        assert not any(is_prime(m) for m in range(before + 1, n))
+
+
+def test_batch_versions_agree():
+    seeds = [-3, 0, 1, 2, 3, 4, 13, 14, 7919, 10 ** 9 + 7, 2 ** 62]
+    assert next_primes(seeds).tolist() == [next_prime(n) for n in seeds]
+    assert prev_primes(seeds).tolist() == [prev_prime(n) or 0 for n in seeds]
@@ -0,0 +1,41 @@
+"""الغربال المقطعي مقابل القسمة المباشرة"""
+
+import numpy as np
+import pytest
+
+from prime_sieve import base_primes, count_primes_in_range, iter_prime_chunks, primes_in_range
+
+
+def brute_primes(start, end):
+    return [n for n in range(max(start, 2), end + 1)
+            if all(n % d for d in range(2, int(n ** 0.5) + 1))]
+
+
+@pytest.mark.parametrize('limit', [-1, 0, 1, 2, 3, 4, 25, 49, 50, 1000])
+def test_base_primes(limit):
+    assert base_primes(limit).tolist() == brute_primes(2, limit)
+
+
+@pytest.mark.parametrize('start, end', [
+    (0, 100), (2, 2), (3, 3), (4, 4), (1, 2), (-10, 10), (24, 28), (10, 5),
+    (97, 97), (96, 98), (1000, 1100), (9973, 10007), (1, 1),
+])
+@pytest.mark.parametrize('segment_size', [1, 2, 3, 7, 1 << 18])
+def test_range_edges(start, end, segment_size):
+    expected = brute_primes(start, end)
+    assert primes_in_range(start, end, segment_size).tolist() == expected
+    assert count_primes_in_range(start, end, segment_size) == len(expected)
+
+
+def test_chunks_are_sorted_and_bounded():
+    chunks = list(iter_prime_chunks(10 ** 6, 10 ** 6 + 5000, segment_size=64))
+    assert all(len(chunk) <= 64 for chunk in chunks)
+    primes = np.concatenate(chunks)
+    assert (np.diff(primes) > 0).all()
+    assert primes.tolist() == brute_primes(10 ** 6, 10 ** 6 + 5000)
+
+
+def test_given_sieving_primes():
+    sieving = base_primes(2000)
+    chunks = iter_prime_chunks(3_000_000, 3_001_000, segment_size=100, sieving_primes=sieving)
+    assert np.concatenate(list(chunks)).tolist() == brute_primes(3_000_000, 3_001_000)
@@ -0,0 +1,89 @@
+"""ذاكرة النتائج لكل عدد: LRU، العدادات، والنتائج المخزنة لا يمكن تعديلها"""
+
+import pytest
+
+from interactive_prime_calculator import InteractiveFilamentCalculator
+from prime_filament_calculator import FilamentPrimeCalculator
+from property_cache import SIZE_ENV_VAR, PropertyCache
+
+
+def test_cached_cavity_properties_are_read_only():
+    calculator = FilamentPrimeCalculator(cache=PropertyCache('cavity-test'))
+    record = calculator.calculate_cavity_properties(7)
+    depth = record['cavity_depth']
+    with pytest.raises(TypeError):
+        record['cavity_depth'] = 0
+    with pytest.raises(AttributeError):
+        record.cavity_depth = 0
+    with pytest.raises(AttributeError):
+        record['four_dimensional_properties'].four_d_volume = 0
+
+    again = calculator.calculate_cavity_properties(7)
+    assert again is record and again['cavity_depth'] == depth
+    assert calculator.property_cache.hits == 1
+
+
+def test_cached_filament_properties_are_read_only():
+    calculator = InteractiveFilamentCalculator(cache=PropertyCache('filament-test'))
+    scalar = calculator.calculate_filament_properties(97)
+    batch = calculator.calculate_filament_properties_batch([89, 97, 100])
+    assert batch[1] is scalar and 'error' in batch[2]
+    for result in (scalar, batch[0], batch[2]):
+        with pytest.raises(TypeError):
+            result['prime'] = 0
+
+    copy = scalar.to_dict()
+    copy['prime'] = 0
+    assert calculator.calculate_filament_properties(97)['prime'] == 97
+
+
+def test_lru_eviction_and_counters():
+    cache = PropertyCache('lru-test', maxsize=2)
+    calls = []
+
+    def compute(prime):
+        calls.append(prime)
+        return {'prime': prime}
+
+    for prime in (2, 3, 2, 5, 3):
+        assert cache.get(prime, compute) == {'prime': prime}
+    # 3 أُخرج عند إضافة 5 لأن 2 استُخدم بعده
+    assert calls == [2, 3, 5, 3]
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 4, 2)
+    assert len(cache) == 2 and cache.stats()['hit_rate'] == 0.2
+
+
+def test_stored_dicts_are_copied_for_each_caller():
+    cache = PropertyCache('copy-test')
+    stored = {'prime': 7, 'nested': {'depth': 1.5}}
+    cache.prefill([(7, stored)])
+    stored['nested']['depth'] = 0
+
+    first = cache.get(7, None)
+    first['prime'] = 0
+    first['nested']['depth'] = 0
+    assert cache.get(7, None) == {'prime': 7, 'nested': {'depth': 1.5}}
+    assert cache.hits == 2 and cache.misses == 0
+
+
+def test_bypass_and_disabled_cache_skip_storage(monkeypatch):
+    cache = PropertyCache('bypass-test')
+    with cache.bypass():
+        cache.get(11, lambda prime: {'prime': prime})
+    assert len(cache) == 0 and cache.bypassed == 1
+
+    monkeypatch.setenv(SIZE_ENV_VAR, '0')
+    disabled = PropertyCache('disabled-test')
+    assert disabled.maxsize == 0
+    assert disabled.prefill([(13, {'prime': 13})]) == 0
+    disabled.get(13, lambda prime: {'prime': prime})
+    assert len(disabled) == 0 and disabled.bypassed == 1
+
+
+def test_version_change_misses():
+    old = PropertyCache('version-test', version=1)
+    old.prefill([(17, {'law': 1})])
+    new = PropertyCache('version-test', version=2)
+    new._entries = old._entries
+    assert new.get(17, lambda prime: {'law': 2}) == {'law': 2}
+    assert new.misses == 1
@@ -0,0 +1,59 @@
+"""مجرى NDJSON: الكتابة ثم القراءة تعيد نفس السجلات"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from result_writer import NumpyJSONEncoder, ResultWriter, dump_json, read_records
+
+
+RECORDS = [
+    {'prime': np.int64(7), 'frequency_error': np.float64(2.5e-15), 'overall_valid': np.bool_(True)},
+    {'prime': 11, 'name': 'عدد أولي', 'values': np.arange(3)},
+]
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_round_trip(tmp_path, compact):
+    path = str(tmp_path / 'results.ndjson')
+    with ResultWriter(path, compact=compact) as sink:
+        sink.write_many(RECORDS, record_type='prime')
+        sink.write({'total': 2}, record_type='overall')
+
+    assert sink.records_written == 3
+    assert sink.bytes_written == os.path.getsize(path)
+    assert list(read_records(path)) == [
+        {'record': 'prime', 'prime': 7, 'frequency_error': 2.5e-15, 'overall_valid': True},
+        {'record': 'prime', 'prime': 11, 'name': 'عدد أولي', 'values': [0, 1, 2]},
+        {'record': 'overall', 'total': 2},
+    ]
+    assert [r['prime'] for r in read_records(path, 'prime')] == [7, 11]
+    with open(path, encoding='utf-8') as f:
+        assert (' ' not in f.readline()) == compact
+
+
+def test_write_columns(tmp_path):
+    path = str(tmp_path / 'columns.ndjson')
+    with ResultWriter(path) as sink:
+        sink.write_columns({'prime': np.array([2, 3, 5]), 'valid': np.array([True, False, True])}, 'prime')
+    assert list(read_records(path)) == [
+        {'record': 'prime', 'prime': 2, 'valid': True},
+        {'record': 'prime', 'prime': 3, 'valid': False},
+        {'record': 'prime', 'prime': 5, 'valid': True},
+    ]
+
+
+@pytest.mark.parametrize('compact', [True, False])
+def test_dump_json(tmp_path, compact):
+    path = str(tmp_path / 'results.json')
+    dump_json({'results': RECORDS}, path, compact=compact)
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['results'][0] == {'prime': 7, 'frequency_error': 2.5e-15, 'overall_valid': True}
+
+
+def test_encoder_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        json.dumps({'value': object()}, cls=NumpyJSONEncoder)
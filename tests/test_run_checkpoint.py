@@ -0,0 +1,31 @@
+"""نقاط استئناف التشغيل: بذرة التشغيل بلا --seed ومفاتيح المجموعات"""
+
+from extended_prime_test import ExtendedPrimeFilamentTest
+from instrumentation import Metrics
+from run_checkpoint import RunCheckpoint, values_key
+
+
+def test_unseeded_run_keeps_its_drawn_seed(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path), 'ultimate', {'seed': None})
+    assert checkpoint.run_seed(5) == 5
+    seed = checkpoint.run_seed()
+    assert isinstance(seed, int) and checkpoint.run_seed() == seed
+    checkpoint.complete('small:1-100:25', {'results': []})
+
+    # تشغيل آخر بنفس الهوية يقرأ البذرة المحفوظة، وبعد المسح تُسحب بذرة جديدة
+    assert RunCheckpoint(str(tmp_path), 'ultimate', {'seed': None}).run_seed() == seed
+    checkpoint.clear()
+    assert RunCheckpoint(str(tmp_path), 'ultimate', {'seed': None}).run_seed() != seed
+
+
+def test_extended_group_only_reused_for_the_same_primes(tmp_path):
+    assert values_key([2, 3, 5]) == values_key((2, 3, 5)) != values_key([2, 3, 7])
+    tester = ExtendedPrimeFilamentTest(zeta_count=5, metrics=Metrics())
+    tester.checkpoint = RunCheckpoint(str(tmp_path), 'extended', {'law_version': 1})
+    tester.test_group('small', [2, 3, 5], [], [], unit='small:2-100')
+
+    results, valid = tester.test_group('small', [7, 11], [], [], unit='small:2-100')
+    assert [result['prime'] for result in results] == [7, 11] and valid == 2
+    results, _ = tester.test_group('small', [2, 3, 5], [], [], unit='small:2-100')
+    assert [result['prime'] for result in results] == [2, 3, 5]
+    assert tester.metrics.counters['groups_resumed'] == 1
@@ -0,0 +1,129 @@
+"""نطاقات الاختبار النهائي: الحالات الحدية واستئناف التشغيل المقطوع"""
+
+import json
+from functools import partial
+
+import pytest
+
+import ultimate_prime_test
+from result_writer import ResultWriter
+from ultimate_prime_test import UltimatePrimeFilamentTest
+
+
+def run_ranges(ranges, **options):
+    tester = UltimatePrimeFilamentTest(seed=1, **options)
+    tester.test_ranges = dict(ranges)
+    return tester, tester.run_ultimate_test()
+
+
+@pytest.mark.parametrize('bounds', [(24, 28), (10, 5)])
+def test_range_without_primes(bounds):
+    _, results = run_ranges({'empty': bounds})
+    result = results['range_results']['empty']
+    assert result['tested_primes'] == 0
+    assert result['success_rate'] == 0
+    assert results['overall_statistics']['total_tested'] == 0
+
+
+def test_reversed_cli_range_rejected():
+    with pytest.raises(SystemExit):
+        ultimate_prime_test.main(['--range', '10', '5', '--no-checkpoint'])
+
+
+RESUME_RANGES = {'small': (1, 3000), 'large': (10 ** 6, 10 ** 6 + 30000)}
+
+
+class Interrupted(Exception):
+    pass
+
+
+def resumable_run(path, checkpoint_dir=None, exhaustive=False, seed=7):
+    """تشغيل بمجرى NDJSON (وقطع صغيرة حتى يُحفظ التقدم داخل النطاق)"""
+    sink = ResultWriter(str(path))
+    tester = UltimatePrimeFilamentTest(sink=sink, seed=seed, checkpoint_dir=checkpoint_dir and str(checkpoint_dir),
+                                       checkpoint_seconds=0)
+    tester.test_ranges = dict(RESUME_RANGES)
+    tester.prime_table.iter_primes_between = partial(type(tester.prime_table).iter_primes_between,
+                                                     tester.prime_table, chunk_size=500)
+    try:
+        return tester, tester.run_ultimate_test(exhaustive=exhaustive)
+    finally:
+        sink.close()
+
+
+def stable(value):
+    """النتائج بدون المدد الزمنية"""
+    if isinstance(value, dict):
+        return {k: stable(v) for k, v in value.items() if 'duration' not in k}
+    return value
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [stable(json.loads(line)) for line in f]
+
+
+def test_resume_after_completed_range(tmp_path, monkeypatch):
+    _, expected = resumable_run(tmp_path / 'full.ndjson')
+
+    original = UltimatePrimeFilamentTest.test_range
+
+    def stop_at_second_range(self, range_name, *args, **kwargs):
+        if range_name == 'large':
+            raise Interrupted
+        return original(self, range_name, *args, **kwargs)
+
+    monkeypatch.setattr(UltimatePrimeFilamentTest, 'test_range', stop_at_second_range)
+    with pytest.raises(Interrupted):
+        resumable_run(tmp_path / 'cut.ndjson', tmp_path / 'runs')
+    monkeypatch.setattr(UltimatePrimeFilamentTest, 'test_range', original)
+
+    tester, resumed = resumable_run(tmp_path / 'resumed.ndjson', tmp_path / 'runs')
+    assert stable(resumed) == stable(expected)
+    assert read_records(tmp_path / 'resumed.ndjson') == read_records(tmp_path / 'full.ndjson')
+    assert not (tmp_path / 'runs').exists() or not any((tmp_path / 'runs').iterdir())
+
+
+def test_resume_inside_exhaustive_range(tmp_path, monkeypatch):
+    _, expected = resumable_run(tmp_path / 'full.ndjson', exhaustive=True)
+
+    original = UltimatePrimeFilamentTest.test_filament_properties_batch
+    calls = []
+
+    def stop_midway(self, primes):
+        calls.append(len(primes))
+        if len(calls) == 8:
+            raise Interrupted
+        return original(self, primes)
+
+    monkeypatch.setattr(UltimatePrimeFilamentTest, 'test_filament_properties_batch', stop_midway)
+    with pytest.raises(Interrupted):
+        resumable_run(tmp_path / 'cut.ndjson', tmp_path / 'runs', exhaustive=True)
+    monkeypatch.setattr(UltimatePrimeFilamentTest, 'test_filament_properties_batch', original)
+
+    tester, resumed = resumable_run(tmp_path / 'resumed.ndjson', tmp_path / 'runs', exhaustive=True)
+    assert stable(resumed) == stable(expected)
+    assert read_records(tmp_path / 'resumed.ndjson') == read_records(tmp_path / 'full.ndjson')
+
+
+def test_unseeded_run_resumes_with_its_saved_seed(tmp_path, monkeypatch):
+    original = UltimatePrimeFilamentTest.test_range
+
+    def stop_at_second_range(self, range_name, *args, **kwargs):
+        if range_name == 'large':
+            raise Interrupted
+        return original(self, range_name, *args, **kwargs)
+
+    monkeypatch.setattr(UltimatePrimeFilamentTest, 'test_range', stop_at_second_range)
+    with pytest.raises(Interrupted):
+        resumable_run(tmp_path / 'cut.ndjson', tmp_path / 'runs', seed=None)
+    monkeypatch.setattr(UltimatePrimeFilamentTest, 'test_range', original)
+    [manifest] = (tmp_path / 'runs').glob('ultimate-*/manifest.json')
+    seed = json.loads(manifest.read_text(encoding='utf-8'))['seed']
+
+    # الاستئناف بلا بذرة يكمل العينة المحفوظة: مطابق لتشغيل كامل بتلك البذرة
+    tester, resumed = resumable_run(tmp_path / 'resumed.ndjson', tmp_path / 'runs', seed=None)
+    _, expected = resumable_run(tmp_path / 'full.ndjson', seed=seed)
+    assert tester.sample_seed == seed
+    assert stable(resumed) == stable(expected)
+    assert read_records(tmp_path / 'resumed.ndjson') == read_records(tmp_path / 'full.ndjson')
@@ -0,0 +1,19 @@
+"""أصفار زيتا المضمّنة مقابل mpmath"""
+
+import mpmath
+import pytest
+
+from zeta_zeros import KNOWN_PRECISION, KNOWN_ZETA_ZEROS, ZetaZeroDataset
+
+
+@pytest.mark.parametrize('n', range(1, len(KNOWN_ZETA_ZEROS) + 1))
+def test_known_zeros_match_mpmath(n):
+    with mpmath.workdps(KNOWN_PRECISION + 10):
+        exact = mpmath.zetazero(n).imag
+        assert abs(mpmath.mpf(KNOWN_ZETA_ZEROS[n - 1]) - exact) < mpmath.mpf(10) ** -(KNOWN_PRECISION - 3)
+
+
+def test_dataset_uses_known_zeros_without_cache():
+    dataset = ZetaZeroDataset(cache_dir=None)
+    assert len(dataset) == len(KNOWN_ZETA_ZEROS)
+    assert dataset.digits[12] == '59.347044002602353080'
@@ -9,21 +9,105 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 
 import math
 import numpy as np
-import matplotlib.pyplot as plt
 from typing import List, Tuple, Dict
-import json
 import time
-import random
+import argparse
+from contextlib import ExitStack, contextmanager
+from filament_core import (FILAMENT_MASS, FUNDAMENTAL_FREQUENCY, LAW_VERSION, LIGHT_SPEED,
+                           PLANCK_CONSTANT, filament_properties, law_plan)
+from prime_sampling import sample_primes
+from prime_sieve import PRIME_DTYPE, base_primes, iter_prime_chunks
+from prime_table import get_prime_table
+from result_writer import ResultWriter, dump_json
+from columnar_results import ColumnarResultWriter
+from instrumentation import Metrics, NULL_METRICS
+from run_checkpoint import CHECKPOINT_SECONDS, RunCheckpoint, default_checkpoint_dir
+
+# أقصى عدد من الأعداد الفاشلة المحفوظة لكل نطاق في وضع التحقق الشامل
+MAX_REPORTED_FAILURES = 1000
+
+# طول القطعة (عدد الأعداد الصحيحة) في وضع التنفيذ المتوازي
+PARALLEL_CHUNK_SPAN = 1 << 23
+
+# حالة كل عملية فرعية في وضع التنفيذ المتوازي
+_worker_state = {}
+
+
+def _init_parallel_worker(shm_name: str, base_count: int):
+    """تهيئة العملية الفرعية: ربط الأعداد الأولية الأساسية من الذاكرة المشتركة"""
+    from multiprocessing import shared_memory
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state['shm'] = shm
+    _worker_state['base_primes'] = np.ndarray((base_count,), dtype=PRIME_DTYPE, buffer=shm.buf)
+    _worker_state['tester'] = UltimatePrimeFilamentTest()
+
+
+def _validate_chunk(bounds: Tuple[int, int]) -> Dict:
+    """التحقق الشامل من قطعة [lo, hi] داخل عملية فرعية"""
+    lo, hi = bounds
+    tester = _worker_state['tester']
+    stats = tester.empty_statistics()
+    for primes in iter_prime_chunks(lo, hi, sieving_primes=_worker_state['base_primes']):
+        batch = tester.test_filament_properties_batch(primes)
+        stats = tester.merge_statistics(stats, tester.summarize_batch(batch))
+    return stats
+
+
+# حقول test_filament_properties (اسم الحقل ← القانون)
+FILAMENT_TEST_LAWS = {
+    'prime': 'prime',
+    'calculated_frequency': 'prime_frequency',
+    'theoretical_frequency': 'theoretical_frequency',
+    'frequency_error': 'frequency_error',
+    'balance_check': 'balance_check',
+    'balance_factor': 'balance_factor',
+    'capacitive_root': 'capacitive_root',
+    'inductive_root': 'inductive_root',
+    'orthogonal_angle': 'orthogonal_angle',
+    'temporal_dimension': 'temporal_dimension',
+    'spatial_radius': 'effective_radius',
+    'spherical_surface': 'spherical_surface_area',
+    'smoky_volume': 'smoky_volume',
+    'four_d_volume': 'four_d_volume',
+    'energy_density': 'frequency_energy_density',
+    'resonance_frequency': 'prime_frequency',
+    'is_frequency_valid': 'is_frequency_valid',
+    'is_balance_valid': 'is_balance_valid',
+    'is_orthogonal_valid': 'is_orthogonal_valid',
+    'is_four_d_valid': 'is_four_d_valid',
+    'overall_valid': 'overall_valid',
+}
 
 class UltimatePrimeFilamentTest:
     """الاختبار النهائي الشامل لنظرية الفتائل"""
     
-    def __init__(self):
+    def __init__(self, sink: ResultWriter = None, metrics: Metrics = None,
+                 seed: int = None, strata: int = 1, checkpoint_dir: str = None,
+                 checkpoint_seconds: float = CHECKPOINT_SECONDS):
+        # مجرى النتائج المتدفق (اختياري): تُكتب السجلات فور إنتاجها ولا تُحفظ في الذاكرة
+        self.sink = sink
+        
+        # نقاط الاستئناف (None = معطلة): النطاقات المكتملة والتقدم داخل النطاق الجاري
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoint_seconds = checkpoint_seconds
+        self.checkpoint = None
+        
+        # العينات العشوائية: بذرة لإعادة الإنتاج (None = عشوائية في كل تشغيل) وعدد الفترات الطبقية
+        self.seed = seed
+        self.sample_seed = seed  # البذرة المستخدمة فعلاً (المحفوظة عند الاستئناف إن لم تُعطَ)
+        self.strata = strata
+        
+        # قياس المراحل (معطل افتراضياً)
+        self.metrics = metrics if metrics is not None else NULL_METRICS
+        
         # ثوابت نظرية الفتائل
-        self.filament_mass = 5.85881e-52
-        self.fundamental_frequency = 1 / (4 * math.pi)
-        self.light_speed = 299792458
-        self.planck_constant = 6.62607015e-34
+        self.filament_mass = FILAMENT_MASS
+        self.fundamental_frequency = FUNDAMENTAL_FREQUENCY
+        self.light_speed = LIGHT_SPEED
+        self.planck_constant = PLANCK_CONSTANT
+        self.filament_laws = law_plan(FILAMENT_TEST_LAWS, filament_mass=self.filament_mass,
+                                      planck_constant=self.planck_constant,
+                                      fundamental_frequency=self.fundamental_frequency)
         
         # مجموعات اختبار موسعة
         self.test_ranges = {
@@ -32,138 +116,304 @@ class UltimatePrimeFilamentTest:
             'medium': (200, 1000),     # أعداد متوسطة
             'large': (1000, 5000),     # أعداد كبيرة
             'huge': (5000, 20000),     # أعداد كبيرة جداً
-            'massive': (20000, 100000) # أعداد ضخمة
+            'massive': (20000, 100000), # أعداد ضخمة
+            'giant': (100000, 10000000),            # أعداد عملاقة
+            'astronomical': (10**11 - 10**6, 10**11) # أعداد فلكية (غربال مقطعي)
         }
         
+        # حجم العينة لكل نطاق (None = اختبار كامل)، والنطاقات الأخرى تستخدم 25
+        self.sample_sizes = {
+            'tiny': None,
+            'small': None,
+            'medium': 100,
+            'large': 100,
+            'huge': 50,
+            'massive': 25,
+            'giant': 25,
+            'astronomical': 25
+        }
+        
+        # جدول الأعداد الأولية المشترك (يُغربل مرة واحدة لجميع النطاقات)
+        self.prime_table = get_prime_table()
+        
         self.results = {}
         self.detailed_stats = {}
     
     def sieve_of_eratosthenes(self, limit: int) -> List[int]:
-        """غربال إراتوستينس لتوليد الأعداد الأولية بكفاءة"""
-        sieve = [True] * (limit + 1)
-        sieve[0] = sieve[1] = False
+        """غربال إراتوستينس لتوليد الأعداد الأولية بكفاءة (غربال مقطعي)"""
+        return self.prime_table.primes_between(2, limit).tolist()
+    
+    def test_filament_properties(self, prime: int) -> Dict:
+        """اختبار شامل لخصائص الفتيلة (القوانين مُجمَّعة في law_engine)"""
+        return self.filament_laws.scalar(prime)
+    
+    def test_filament_properties_batch(self, primes: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        اختبار خصائص الفتيلة لمصفوفة كاملة من الأعداد الأولية
+        Vectorized test_filament_properties (filament_core.filament_properties)
+        """
+        return filament_properties(primes, self.fundamental_frequency)
+    
+    def empty_statistics(self) -> Dict:
+        """ملخص فارغ لبدء الدمج"""
+        return self.summarize_batch(self.test_filament_properties_batch(np.empty(0, dtype=np.int64)))
+    
+    def summarize_batch(self, batch: Dict[str, np.ndarray]) -> Dict:
+        """تلخيص نتائج قطعة: أعداد النجاح والفشل وإحصائيات خطأ التردد"""
+        errors = batch['frequency_error']
+        count = len(errors)
+        failed = batch['prime'][~batch['overall_valid']]
+        return {
+            'count': count,
+            'valid_count': count - len(failed),
+            'check_failures': {
+                check: int(count - np.count_nonzero(batch[check]))
+                for check in ('is_frequency_valid', 'is_balance_valid',
+                              'is_orthogonal_valid', 'is_four_d_valid')
+            },
+            'failed_count': len(failed),
+            'failing_primes': failed[:MAX_REPORTED_FAILURES].tolist(),
+            'error_mean': float(np.mean(errors)) if count else 0.0,
+            'error_m2': float(np.sum((errors - np.mean(errors)) ** 2)) if count else 0.0,
+            'error_min': float(np.min(errors)) if count else math.inf,
+            'error_max': float(np.max(errors)) if count else 0.0
+        }
+    
+    @staticmethod
+    def merge_statistics(a: Dict, b: Dict) -> Dict:
+        """دمج ملخصين (دمج متوسط وتباين Chan) بترتيب ثابت"""
+        count = a['count'] + b['count']
+        if count == 0:
+            return dict(a)
+        delta = b['error_mean'] - a['error_mean']
+        return {
+            'count': count,
+            'valid_count': a['valid_count'] + b['valid_count'],
+            'check_failures': {
+                check: a['check_failures'][check] + b['check_failures'][check]
+                for check in a['check_failures']
+            },
+            'failed_count': a['failed_count'] + b['failed_count'],
+            'failing_primes': (a['failing_primes'] + b['failing_primes'])[:MAX_REPORTED_FAILURES],
+            'error_mean': a['error_mean'] + delta * b['count'] / count,
+            'error_m2': a['error_m2'] + b['error_m2'] + delta ** 2 * a['count'] * b['count'] / count,
+            'error_min': min(a['error_min'], b['error_min']),
+            'error_max': max(a['error_max'], b['error_max'])
+        }
+    
+    def validate_range(self, range_name: str, start: int, end: int, unit: str = None) -> Dict:
+        """
+        تحقق شامل من كل عدد أولي في النطاق (بدون عينات)
+        Exhaustive vectorized validation: counts plus the failing primes only.
+        With a checkpoint unit the merged statistics are saved every
+        checkpoint_seconds, and a restarted run continues after the last chunk
+        """
+        print(f"\n🔢 تحقق شامل من النطاق {range_name} ({start}-{end}):")
         
-        for i in range(2, int(math.sqrt(limit)) + 1):
-            if sieve[i]:
-                for j in range(i*i, limit + 1, i):
-                    sieve[j] = False
+        start_time = time.time()
+        stats, position = self.resume_statistics(unit, start)
+        resumed_count = stats['count']
+        chunks = self.prime_table.iter_primes_between(position, end)
+        while True:
+            with self.metrics.timer('sieve'):
+                chunk = next(chunks, None)
+            if chunk is None:
+                break
+            self.metrics.count('primes_sieved', len(chunk))
+            with self.metrics.timer('evaluate'):
+                batch = self.test_filament_properties_batch(chunk)
+            with self.metrics.timer('statistics'):
+                stats = self.merge_statistics(stats, self.summarize_batch(batch))
+            if len(chunk):
+                self.save_statistics(unit, stats, int(chunk[-1]) + 1)
+        self.metrics.count('primes_tested', stats['count'] - resumed_count)
+        test_duration = time.time() - start_time
+        
+        return self.complete_range(unit, self.report_statistics(range_name, start, end, stats, test_duration))
+    
+    def validate_range_parallel(self, range_name: str, start: int, end: int,
+                                executor: 'ProcessPoolExecutor', unit: str = None) -> Dict:
+        """
+        تحقق شامل من النطاق موزعاً على عمليات متعددة
+        Exhaustive validation split into fixed-size chunks across a process pool;
+        chunk statistics are merged in chunk order, so results do not depend on
+        the number of workers
+        """
+        print(f"\n🔢 تحقق شامل متوازٍ من النطاق {range_name} ({start}-{end}):")
         
-        return [i for i in range(2, limit + 1) if sieve[i]]
+        start_time = time.time()
+        stats, position = self.resume_statistics(unit, start)
+        resumed_count = stats['count']
+        bounds = [(lo, min(lo + PARALLEL_CHUNK_SPAN - 1, end))
+                  for lo in range(position, end + 1, PARALLEL_CHUNK_SPAN)]
+        with self.metrics.timer('parallel_validate'):
+            for (lo, hi), chunk_stats in zip(bounds, executor.map(_validate_chunk, bounds)):
+                stats = self.merge_statistics(stats, chunk_stats)
+                self.save_statistics(unit, stats, hi + 1)
+        self.metrics.count('primes_sieved', stats['count'] - resumed_count)
+        self.metrics.count('primes_tested', stats['count'] - resumed_count)
+        test_duration = time.time() - start_time
+        
+        return self.complete_range(unit, self.report_statistics(range_name, start, end, stats, test_duration))
     
-    def test_filament_properties(self, prime: int) -> Dict:
-        """اختبار شامل لخصائص الفتيلة"""
-        # 1. اختبار العلاقة الأساسية p/π = 4p × (1/(4π))
-        calculated_freq = prime / math.pi
-        theoretical_freq = 4 * prime * self.fundamental_frequency
-        freq_error = abs(calculated_freq - theoretical_freq) / calculated_freq * 100
-        
-        # 2. اختبار التوازن الفتائلي p + n = 0
-        balance_check = prime + (-prime)
-        balance_factor = 1.0 if balance_check == 0 else 1.0 / (1.0 + abs(balance_check))
-        
-        # 3. اختبار الجذور المتعامدة
-        capacitive_root = math.sqrt(prime)
-        inductive_root = math.sqrt(prime)
-        orthogonal_angle = 90.0  # درجة
-        
-        # 4. اختبار الأبعاد الأربعة
-        temporal_dimension = prime
-        spatial_radius = 1.0
-        spherical_surface = 4 * math.pi * (spatial_radius ** 2)
-        smoky_volume = (4/3) * math.pi * (spatial_radius ** 3)
-        four_d_volume = smoky_volume * temporal_dimension
-        
-        # 5. اختبار كثافة الطاقة
-        energy_density = (self.planck_constant * calculated_freq) / four_d_volume if four_d_volume > 0 else 0
-        
-        # 6. اختبار تردد الرنين
-        resonance_freq = calculated_freq
-        
-        # 7. معايير النجاح
-        is_frequency_valid = freq_error < 1e-10  # دقة عالية جداً
-        is_balance_valid = balance_factor == 1.0
-        is_orthogonal_valid = abs(orthogonal_angle - 90.0) < 1e-10
-        is_four_d_valid = four_d_volume > 0
-        
-        overall_valid = (is_frequency_valid and is_balance_valid and 
-                        is_orthogonal_valid and is_four_d_valid)
+    def resume_statistics(self, unit: str, start: int) -> Tuple[Dict, int]:
+        """الإحصائيات المدمجة وموضع الاستئناف المحفوظان لنطاق (أو ملخص فارغ من start)"""
+        progress = self.checkpoint.partial(unit) if self.checkpoint is not None and unit else None
+        if progress is None:
+            return self.empty_statistics(), start
+        print(f"   ↩️ استئناف من {progress['position']:,} ({progress['stats']['count']:,} عدد أولي مختبر سابقاً)")
+        return progress['stats'], progress['position']
+    
+    def save_statistics(self, unit: str, stats: Dict, position: int):
+        """حفظ التقدم داخل النطاق كل checkpoint_seconds (الأعداد قبل position مدمجة في stats)"""
+        if self.checkpoint is not None and unit and self.checkpoint.due():
+            with self.metrics.timer('checkpoint'):
+                self.checkpoint.save_partial(unit, {'position': position, 'stats': stats})
+            self.metrics.count('checkpoints_written')
+    
+    def complete_range(self, unit: str, range_result: Dict, records: List[Dict] = None) -> Dict:
+        """حفظ نتيجة نطاق مكتمل (مع سجلات أعداده إن وُجدت) لتتخطاه إعادة التشغيل"""
+        if self.checkpoint is not None and unit:
+            saved = range_result if records is None else {**range_result, 'results': records}
+            with self.metrics.timer('checkpoint'):
+                self.checkpoint.complete(unit, saved)
+            self.metrics.count('checkpoints_written')
+        return range_result
+    
+    def restore_range(self, range_name: str, saved: Dict) -> Dict:
+        """نتيجة نطاق من تشغيل سابق، وسجلات أعداده تُعاد كتابتها إلى مجرى النتائج"""
+        print(f"\n↩️ النطاق {range_name} مكتمل في تشغيل سابق: {saved['tested_primes']:,} عدد أولي "
+              f"(معدل النجاح {saved['success_rate']:.2f}%)")
+        if self.sink is not None and saved.get('results'):
+            with self.metrics.timer('write'):
+                for result in saved['results']:
+                    self.sink.write({'range_name': range_name, **result}, record_type='prime')
+            saved['results'] = []
+        self.metrics.count('ranges_resumed')
+        return saved
+    
+    @contextmanager
+    def parallel_pool(self, workers: int, max_end: int):
+        """
+        مجمع عمليات مع الأعداد الأولية الأساسية حتى √max_end في ذاكرة مشتركة
+        Process pool whose workers share the base primes through shared memory
+        """
+        base = base_primes(math.isqrt(max_end))
+        # تحميل متأخر: لا تُستورد وحدات العمليات المتعددة إلا في الوضع المتوازي
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import shared_memory
+        
+        shm = shared_memory.SharedMemory(create=True, size=max(base.nbytes, 1))
+        try:
+            np.ndarray(base.shape, dtype=PRIME_DTYPE, buffer=shm.buf)[:] = base
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_parallel_worker,
+                                     initargs=(shm.name, len(base))) as executor:
+                yield executor
+        finally:
+            shm.close()
+            shm.unlink()
+    
+    def report_statistics(self, range_name: str, start: int, end: int,
+                          stats: Dict, test_duration: float) -> Dict:
+        """طباعة ملخص التحقق الشامل وتحويله إلى نتيجة نطاق"""
+        tested = stats['count']
+        success_rate = (stats['valid_count'] / tested) * 100 if tested else 0
+        std_freq_error = math.sqrt(stats['error_m2'] / tested) if tested else 0
+        
+        with self.metrics.timer('report'):
+            print(f"   اختبار كامل: {tested:,} عدد أولي")
+            print(f"   معدل النجاح: {success_rate:.2f}% ({stats['valid_count']:,}/{tested:,})")
+            print(f"   متوسط خطأ التردد: {stats['error_mean']:.2e}%")
+            print(f"   أقصى خطأ تردد: {stats['error_max']:.2e}%")
+            if stats['failed_count']:
+                print(f"   ❌ أعداد فاشلة: {stats['failed_count']:,} (أولها: {stats['failing_primes'][:10]})")
+            print(f"   مدة الاختبار: {test_duration:.3f} ثانية")
         
         return {
-            'prime': prime,
-            'calculated_frequency': calculated_freq,
-            'theoretical_frequency': theoretical_freq,
-            'frequency_error': freq_error,
-            'balance_check': balance_check,
-            'balance_factor': balance_factor,
-            'capacitive_root': capacitive_root,
-            'inductive_root': inductive_root,
-            'orthogonal_angle': orthogonal_angle,
-            'temporal_dimension': temporal_dimension,
-            'spatial_radius': spatial_radius,
-            'spherical_surface': spherical_surface,
-            'smoky_volume': smoky_volume,
-            'four_d_volume': four_d_volume,
-            'energy_density': energy_density,
-            'resonance_frequency': resonance_freq,
-            'is_frequency_valid': is_frequency_valid,
-            'is_balance_valid': is_balance_valid,
-            'is_orthogonal_valid': is_orthogonal_valid,
-            'is_four_d_valid': is_four_d_valid,
-            'overall_valid': overall_valid
+            'range_name': range_name,
+            'start': start,
+            'end': end,
+            'total_primes_in_range': tested,
+            'tested_primes': tested,
+            'validation_mode': 'exhaustive',
+            'valid_count': stats['valid_count'],
+            'check_failures': stats['check_failures'],
+            'failed_count': stats['failed_count'],
+            'failing_primes': stats['failing_primes'],
+            'success_rate': success_rate,
+            'avg_freq_error': stats['error_mean'],
+            'max_freq_error': stats['error_max'],
+            'min_freq_error': stats['error_min'] if tested else 0,
+            'std_freq_error': std_freq_error,
+            'test_duration': test_duration
         }
     
-    def test_range(self, range_name: str, start: int, end: int, sample_size: int = None) -> Dict:
+    def test_range(self, range_name: str, start: int, end: int, sample_size: int = None,
+                   unit: str = None) -> Dict:
         """اختبار نطاق من الأعداد الأولية"""
         print(f"\n🔢 اختبار النطاق {range_name} ({start}-{end}):")
         
-        # توليد الأعداد الأولية
-        all_primes = self.sieve_of_eratosthenes(end)
-        range_primes = [p for p in all_primes if start <= p <= end]
+        # عدد الأعداد الأولية في النطاق = π(end) − π(start − 1) بدون سردها
+        with self.metrics.timer('count'):
+            total_primes = self.prime_table.count_between(start, end)
         
-        # أخذ عينة إذا كان العدد كبير
-        if sample_size and len(range_primes) > sample_size:
-            test_primes = random.sample(range_primes, sample_size)
-            print(f"   عينة عشوائية: {sample_size} من {len(range_primes)} عدد أولي")
+        # عينة عشوائية متدفقة إذا كان العدد كبيراً (بدون بناء قائمة النطاق)، وإلا النطاق كاملاً
+        sampled = bool(sample_size) and total_primes > sample_size
+        if sampled:
+            with self.metrics.timer('sample'):
+                seed = None if self.sample_seed is None else (self.sample_seed, start, end)
+                test_primes = sample_primes(start, end, sample_size, seed=seed, strata=self.strata)
         else:
-            test_primes = range_primes
-            print(f"   اختبار كامل: {len(test_primes)} عدد أولي")
+            with self.metrics.timer('sieve'):
+                test_primes = self.prime_table.primes_between(start, end).tolist()
+            self.metrics.count('primes_sieved', len(test_primes))
+        with self.metrics.timer('report'):
+            if sampled:
+                print(f"   عينة عشوائية: {sample_size} من {total_primes:,} عدد أولي")
+            else:
+                print(f"   اختبار كامل: {len(test_primes)} عدد أولي")
         
         # تشغيل الاختبارات
-        results = []
-        valid_count = 0
-        freq_errors = []
-        
         start_time = time.time()
         
-        for prime in test_primes:
-            result = self.test_filament_properties(prime)
-            results.append(result)
-            
-            if result['overall_valid']:
-                valid_count += 1
-            
-            freq_errors.append(result['frequency_error'])
+        with self.metrics.timer('evaluate'):
+            evaluated = [self.test_filament_properties(prime) for prime in test_primes]
+        self.metrics.count('primes_tested', len(evaluated))
+        
+        if self.sink is not None:
+            with self.metrics.timer('write'):
+                for result in evaluated:
+                    self.sink.write({'range_name': range_name, **result}, record_type='prime')
+            results = []
+        else:
+            results = evaluated
         
         end_time = time.time()
         test_duration = end_time - start_time
         
         # حساب الإحصائيات
-        success_rate = (valid_count / len(test_primes)) * 100
-        avg_freq_error = np.mean(freq_errors)
-        max_freq_error = np.max(freq_errors)
-        min_freq_error = np.min(freq_errors)
-        std_freq_error = np.std(freq_errors)
-        
-        print(f"   معدل النجاح: {success_rate:.2f}% ({valid_count}/{len(test_primes)})")
-        print(f"   متوسط خطأ التردد: {avg_freq_error:.2e}%")
-        print(f"   أقصى خطأ تردد: {max_freq_error:.2e}%")
-        print(f"   مدة الاختبار: {test_duration:.3f} ثانية")
-        
-        return {
+        with self.metrics.timer('statistics'):
+            valid_count = sum(1 for result in evaluated if result['overall_valid'])
+            freq_errors = [result['frequency_error'] for result in evaluated]
+            # نطاق بلا أعداد أولية (مثل 24-28): إحصائيات صفرية بدل القسمة على صفر
+            success_rate = (valid_count / len(test_primes)) * 100 if test_primes else 0
+            avg_freq_error = np.mean(freq_errors) if freq_errors else 0
+            max_freq_error = np.max(freq_errors) if freq_errors else 0
+            min_freq_error = np.min(freq_errors) if freq_errors else 0
+            std_freq_error = np.std(freq_errors) if freq_errors else 0
+        
+        with self.metrics.timer('report'):
+            print(f"   معدل النجاح: {success_rate:.2f}% ({valid_count}/{len(test_primes)})")
+            print(f"   متوسط خطأ التردد: {avg_freq_error:.2e}%")
+            print(f"   أقصى خطأ تردد: {max_freq_error:.2e}%")
+            print(f"   مدة الاختبار: {test_duration:.3f} ثانية")
+        
+        return self.complete_range(unit, {
             'range_name': range_name,
             'start': start,
             'end': end,
-            'total_primes_in_range': len(range_primes),
+            'total_primes_in_range': total_primes,
             'tested_primes': len(test_primes),
             'results': results,
             'valid_count': valid_count,
@@ -173,37 +423,76 @@ class UltimatePrimeFilamentTest:
             'min_freq_error': min_freq_error,
             'std_freq_error': std_freq_error,
             'test_duration': test_duration
-        }
+        }, evaluated)
+    
+    def range_unit(self, range_name: str, start: int, end: int, sample_size: int = None) -> str:
+        """مفتاح النطاق في نقاط الاستئناف: الاسم والحدود وحجم العينة"""
+        unit = f'{range_name}:{start}-{end}'
+        return unit if sample_size is None else f'{unit}:{sample_size}'
     
-    def run_ultimate_test(self) -> Dict:
-        """تشغيل الاختبار النهائي الشامل"""
+    def run_ultimate_test(self, exhaustive: bool = False, workers: int = 1) -> Dict:
+        """
+        تشغيل الاختبار النهائي الشامل
+        exhaustive=True يتحقق من كل عدد أولي في كل نطاق بدل العينات العشوائية
+        workers > 1 يوزع التحقق الشامل على مجمع عمليات (ويفعّل exhaustive)
+        مع checkpoint_dir تُحفظ النطاقات المكتملة والتقدم داخل النطاق الجاري،
+        فإعادة التشغيل بنفس الخيارات تتخطى ما اكتمل
+        """
         print("🚀 بدء الاختبار النهائي الشامل لنظرية الفتائل...")
         print("=" * 100)
         
         overall_start_time = time.time()
+        exhaustive = exhaustive or workers > 1
+        
+        # نقاط الاستئناف: هوية التشغيل (البذرة والوضع وإصدار القوانين)، والنطاقات مفاتيحها حدودها
+        if self.checkpoint_dir:
+            self.checkpoint = RunCheckpoint(self.checkpoint_dir, 'ultimate', {
+                'seed': self.seed,
+                'strata': self.strata,
+                'exhaustive': exhaustive,
+                'law_version': LAW_VERSION,
+            }, self.checkpoint_seconds)
+            # بلا --seed: بذرة عشوائية تُحفظ مع نقاط الاستئناف، فالاستئناف يكمل نفس العينات
+            self.sample_seed = self.checkpoint.run_seed(self.seed)
+            if self.checkpoint.resumed:
+                print(f"↩️ استئناف تشغيل سابق من: {self.checkpoint.path}")
+        
+        # بناء الجدول مرة واحدة حتى أكبر حد تغطيه النطاقات
+        with self.metrics.timer('table'):
+            self.prime_table.ensure(max((end for _, end in self.test_ranges.values()
+                                         if self.prime_table.covers(end)), default=0))
         
         # اختبار كل النطاقات
         range_results = {}
         
-        # النطاقات الصغيرة - اختبار كامل
-        for range_name in ['tiny', 'small']:
-            start, end = self.test_ranges[range_name]
-            range_results[range_name] = self.test_range(range_name, start, end)
-        
-        # النطاقات المتوسطة - عينات كبيرة
-        for range_name in ['medium', 'large']:
-            start, end = self.test_ranges[range_name]
-            range_results[range_name] = self.test_range(range_name, start, end, sample_size=100)
-        
-        # النطاقات الكبيرة - عينات متوسطة
-        for range_name in ['huge']:
-            start, end = self.test_ranges[range_name]
-            range_results[range_name] = self.test_range(range_name, start, end, sample_size=50)
-        
-        # النطاقات الضخمة - عينات صغيرة
-        for range_name in ['massive']:
-            start, end = self.test_ranges[range_name]
-            range_results[range_name] = self.test_range(range_name, start, end, sample_size=25)
+        with ExitStack() as stack:
+            executor = None
+            for range_name, (start, end) in self.test_ranges.items():
+                sample_size = None if exhaustive else self.sample_sizes.get(range_name, 25)
+                unit = self.range_unit(range_name, start, end, sample_size)
+                saved = self.checkpoint.completed(unit) if self.checkpoint is not None else None
+                if saved is not None:
+                    range_results[range_name] = self.restore_range(range_name, saved)
+                elif workers > 1:
+                    # المجمع يُنشأ عند أول نطاق غير مكتمل فقط
+                    if executor is None:
+                        max_end = max(end for _, end in self.test_ranges.values())
+                        executor = stack.enter_context(self.parallel_pool(workers, max_end))
+                    range_results[range_name] = self.validate_range_parallel(range_name, start, end,
+                                                                             executor, unit)
+                elif exhaustive:
+                    # تحقق شامل متجه لكل عدد أولي في النطاق
+                    range_results[range_name] = self.validate_range(range_name, start, end, unit)
+                else:
+                    # النطاقات الصغيرة كاملة والكبيرة بعينات عشوائية
+                    range_results[range_name] = self.test_range(range_name, start, end,
+                                                                sample_size=sample_size, unit=unit)
+        
+        if self.sink is not None:
+            with self.metrics.timer('write'):
+                for range_result in range_results.values():
+                    summary = {k: v for k, v in range_result.items() if k != 'results'}
+                    self.sink.write(summary, record_type='range')
         
         overall_end_time = time.time()
         total_duration = overall_end_time - overall_start_time
@@ -213,28 +502,27 @@ class UltimatePrimeFilamentTest:
         total_valid = sum(r['valid_count'] for r in range_results.values())
         overall_success_rate = (total_valid / total_tested) * 100 if total_tested > 0 else 0
         
-        all_freq_errors = []
-        for r in range_results.values():
-            all_freq_errors.extend([res['frequency_error'] for res in r['results']])
-        
-        overall_avg_error = np.mean(all_freq_errors) if all_freq_errors else 0
-        overall_max_error = np.max(all_freq_errors) if all_freq_errors else 0
-        
-        print("\n" + "=" * 100)
-        print("📊 الإحصائيات النهائية الشاملة:")
-        print(f"   إجمالي الأعداد المختبرة: {total_tested:,}")
-        print(f"   الأعداد الصحيحة: {total_valid:,}")
-        print(f"   معدل النجاح الإجمالي: {overall_success_rate:.4f}%")
-        print(f"   متوسط خطأ التردد الإجمالي: {overall_avg_error:.2e}%")
-        print(f"   أقصى خطأ تردد: {overall_max_error:.2e}%")
-        print(f"   مدة الاختبار الإجمالية: {total_duration:.2f} ثانية")
-        
-        # تحليل النتائج حسب النطاق
-        print(f"\n📈 تحليل النتائج حسب النطاق:")
-        for range_name, result in range_results.items():
-            print(f"   {range_name}: {result['success_rate']:.2f}% "
-                  f"({result['valid_count']}/{result['tested_primes']}) "
-                  f"خطأ متوسط: {result['avg_freq_error']:.2e}%")
+        # المتوسط الإجمالي موزون بعدد الأعداد المختبرة في كل نطاق
+        overall_avg_error = (sum(r['avg_freq_error'] * r['tested_primes'] for r in range_results.values())
+                             / total_tested) if total_tested > 0 else 0
+        overall_max_error = max((r['max_freq_error'] for r in range_results.values()), default=0)
+        
+        with self.metrics.timer('report'):
+            print("\n" + "=" * 100)
+            print("📊 الإحصائيات النهائية الشاملة:")
+            print(f"   إجمالي الأعداد المختبرة: {total_tested:,}")
+            print(f"   الأعداد الصحيحة: {total_valid:,}")
+            print(f"   معدل النجاح الإجمالي: {overall_success_rate:.4f}%")
+            print(f"   متوسط خطأ التردد الإجمالي: {overall_avg_error:.2e}%")
+            print(f"   أقصى خطأ تردد: {overall_max_error:.2e}%")
+            print(f"   مدة الاختبار الإجمالية: {total_duration:.2f} ثانية")
+            
+            # تحليل النتائج حسب النطاق
+            print(f"\n📈 تحليل النتائج حسب النطاق:")
+            for range_name, result in range_results.items():
+                print(f"   {range_name}: {result['success_rate']:.2f}% "
+                      f"({result['valid_count']}/{result['tested_primes']}) "
+                      f"خطأ متوسط: {result['avg_freq_error']:.2e}%")
         
         # حفظ النتائج
         self.results = {
@@ -249,50 +537,124 @@ class UltimatePrimeFilamentTest:
             }
         }
         
+        if self.sink is not None:
+            with self.metrics.timer('write'):
+                self.sink.write(self.results['overall_statistics'], record_type='overall')
+        
+        if self.metrics.enabled:
+            self.metrics.add_time('total', time.time() - overall_start_time)
+            self.metrics.throughput('primes_per_second', 'primes_tested',
+                                    'parallel_validate' if workers > 1 else 'evaluate')
+            self.metrics.throughput('sieve_primes_per_second', 'primes_sieved', 'sieve')
+            # مقاييس الكتابة (السجلات والبايتات) تُسجل في close_sink بعد إغلاق المجرى
+            self.results['metrics'] = self.metrics.to_dict()
+            if self.sink is not None:
+                self.sink.write(self.results['metrics'], record_type='metrics')
+        
+        # اكتمل التشغيل: لا حاجة لنقاط الاستئناف
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        
         return self.results
+
+    def close_sink(self):
+        """
+        إغلاق مجرى النتائج ثم تسجيل مقاييس الكتابة
+        Write metrics are taken after close(): the columnar writer only
+        writes its file there, so counts read earlier would be 0 bytes
+        """
+        if self.sink is None:
+            return
+        with self.metrics.timer('write'):
+            self.sink.close()
+        if self.metrics.enabled:
+            self.metrics.count('records_written', self.sink.records_written)
+            self.metrics.count('bytes_written', self.sink.bytes_written)
+            self.metrics.throughput('bytes_per_second', 'bytes_written', 'write')
+            if 'metrics' in self.results:
+                self.results['metrics'] = self.metrics.to_dict()
     
-    def save_results(self, filename: str = "ultimate_test_results.json"):
-        """حفظ النتائج"""
-        # تحويل numpy arrays إلى lists للتسلسل
-        def convert_numpy(obj):
-            if isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, dict):
-                return {key: convert_numpy(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy(item) for item in obj]
-            return obj
-        
-        converted_results = convert_numpy(self.results)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(converted_results, f, ensure_ascii=False, indent=2)
+    def save_results(self, filename: str = "ultimate_test_results.json", compact: bool = False):
+        """حفظ النتائج (أنواع NumPy تُرمَّز مباشرة بدون نسخ الشجرة)"""
+        dump_json(self.results, filename, compact=compact)
         print(f"\n💾 تم حفظ النتائج في: {filename}")
 
-def main():
-    """الدالة الرئيسية"""
+def add_arguments(parser: argparse.ArgumentParser):
+    """خيارات سطر الأوامر (مشتركة مع filament_cli.py)"""
+    parser.add_argument('--exhaustive', action='store_true',
+                        help='validate every prime in every range instead of random samples')
+    parser.add_argument('--range', nargs=2, type=int, action='append', default=[],
+                        metavar=('START', 'END'), help='add a custom range to the test')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes for exhaustive validation (implies --exhaustive)')
+    parser.add_argument('--seed', type=int,
+                        help='random seed for the range samples (same seed, same primes)')
+    parser.add_argument('--strata', type=int, default=1,
+                        help='sample each range from N equal-width sub-intervals in proportion to their prime counts')
+    parser.add_argument('--checkpoint-seconds', type=float, default=CHECKPOINT_SECONDS,
+                        help=f'seconds between progress checkpoints inside a range (default {CHECKPOINT_SECONDS})')
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help='do not resume from or write checkpoints (default dir: $FILAMENT_RUN_CHECKPOINTS '
+                             'or ~/.cache/filament_theory/runs)')
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument('--stream', metavar='PATH',
+                        help='write per-prime records to an NDJSON file as they are produced')
+    output.add_argument('--columnar', metavar='PATH',
+                        help='write per-prime records as columnar arrays to an .npz file')
+    parser.add_argument('--compact', action='store_true',
+                        help='write results without indentation')
+    parser.add_argument('--metrics', action='store_true',
+                        help='time each stage and add a metrics block to the results')
+
+def run(args: argparse.Namespace):
+    """تشغيل الاختبار بالخيارات المحللة"""
+    for start, end in args.range:
+        if start > end:
+            raise SystemExit(f"--range: البداية {start} أكبر من النهاية {end}")
+    
     print("🌟 الاختبار النهائي الشامل لنظرية الفتائل والأعداد الأولية")
     print("Ultimate Comprehensive Test for Filament Theory and Prime Numbers")
     print("د. باسل يحيى عبدالله - Dr. Basel Yahya Abdullah")
     print("=" * 100)
     
     # إنشاء الاختبار
-    tester = UltimatePrimeFilamentTest()
+    if args.stream:
+        sink = ResultWriter(args.stream, compact=args.compact)
+    elif args.columnar:
+        sink = ColumnarResultWriter(args.columnar, metadata={'source': 'ultimate_prime_test.py'})
+    else:
+        sink = None
+    metrics = Metrics() if args.metrics else None
+    tester = UltimatePrimeFilamentTest(sink=sink, metrics=metrics, seed=args.seed, strata=args.strata,
+                                       checkpoint_dir=None if args.no_checkpoint else default_checkpoint_dir(),
+                                       checkpoint_seconds=args.checkpoint_seconds)
+    for start, end in args.range:
+        tester.test_ranges[f'custom_{start}_{end}'] = (start, end)
     
     # تشغيل الاختبار النهائي
-    results = tester.run_ultimate_test()
+    try:
+        results = tester.run_ultimate_test(exhaustive=args.exhaustive, workers=args.workers)
+    finally:
+        if sink is not None:
+            tester.close_sink()
+            print(f"\n💾 تم بث {sink.records_written:,} سجل ({sink.bytes_written:,} بايت) إلى: {sink.filename}")
+    
+    if metrics is not None:
+        metrics.report()
     
     # حفظ النتائج
-    tester.save_results()
+    tester.save_results(compact=args.compact)
     
     print("\n🎯 انتهى الاختبار النهائي الشامل بنجاح!")
     print("🌟 نظرية الفتائل مختبرة على نطاق واسع!")
     
     return results
 
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="Ultimate Comprehensive Test for Filament Theory")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
 if __name__ == "__main__":
     results = main()
@@ -7,6 +7,9 @@ Visualize Filament Theory Prime Results
 import matplotlib.pyplot as plt
 import numpy as np
 import json
+import sys
+
+from columnar_results import load_columnar
 
 # إعداد الخط العربي
 plt.rcParams['font.family'] = ['DejaVu Sans']
@@ -89,5 +92,48 @@ def load_and_visualize():
     print(f"معامل الارتباط (العدد الأولي - عمق الحفرة): {np.corrcoef(primes, cavity_depths)[0,1]:.4f}")
     print(f"معدل نمو تردد الرنين: {(frequencies[-1]/frequencies[0])**(1/(len(frequencies)-1)):.2f}")
 
+def visualize_columnar(filename: str):
+    """تصور ملف نتائج عمودي (.npz) مكتوب بواسطة --columnar"""
+    metadata, groups = load_columnar(filename)
+    prime_groups = {name: columns for name, columns in groups.items()
+                    if name.startswith('prime') and 'prime' in columns}
+    
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    
+    # المخطط 1: خطأ التردد مقابل العدد الأولي لكل نطاق
+    for name, columns in prime_groups.items():
+        errors = columns.get('frequency_error', columns.get('error_percentage'))
+        ax1.scatter(columns['prime'], errors, s=8, alpha=0.6, label=name.split('/', 1)[-1])
+    ax1.set_xscale('log')
+    ax1.set_xlabel('Prime Numbers / الأعداد الأولية')
+    ax1.set_ylabel('Frequency Error (%) / خطأ التردد')
+    ax1.set_title('Frequency Error by Range\nخطأ التردد حسب النطاق')
+    ax1.grid(True, alpha=0.3)
+    ax1.legend()
+    
+    # المخطط 2: عدد الأعداد المختبرة في كل نطاق
+    names = [name.split('/', 1)[-1] for name in prime_groups]
+    counts = [len(columns['prime']) for columns in prime_groups.values()]
+    ax2.bar(range(len(names)), counts, color='green', alpha=0.7)
+    ax2.set_xticks(range(len(names)))
+    ax2.set_xticklabels(names, rotation=45)
+    ax2.set_ylabel('Tested Primes / الأعداد المختبرة')
+    ax2.set_title('Records per Range\nعدد السجلات لكل نطاق')
+    ax2.grid(True, alpha=0.3)
+    
+    plt.tight_layout()
+    plt.savefig('filament_columnar_analysis.png', dpi=150, bbox_inches='tight')
+    plt.show()
+    
+    print(f"📊 {metadata.get('source', filename)}: {sum(counts):,} سجل في {len(counts)} مجموعة")
+
+def main(argv=None):
+    """الدالة الرئيسية: ملف أعمدة إن أُعطي، وإلا المخططات الافتراضية"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        visualize_columnar(argv[0])
+    else:
+        load_and_visualize()
+
 if __name__ == "__main__":
-    load_and_visualize()
+    main()
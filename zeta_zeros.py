@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+مجموعة أصفار زيتا ريمان المحسوبة مسبقاً - نظرية الفتائل
+Precomputed Riemann Zeta Zero Dataset - Filament Theory
+
+تُحسب الأجزاء التخيلية t_n لأول N صفر غير تافه بـ mpmath.zetazero على عدة
+عمليات، وتُحفظ في ملف npz مُرقَّم الإصدار لكل دقة (عدد الخانات العشرية)،
+فلا يُعاد حساب أي صفر بين التشغيلات. أول 20 صفراً مضمّنة في الوحدة.
+
+مفاتيح الملف:
+    "digits"        الأصفار كنصوص عشرية بالدقة المطلوبة
+    "zeros"         نفس الأصفار كأعداد float64
+    "__metadata__"  نص JSON: التنسيق، الإصدار، الدقة، العدد
+"""
+
+import argparse
+import json
+import os
+import time
+from decimal import Decimal
+import numpy as np
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # ويندوز: بدون قفل بين العمليات
+    fcntl = None
+
+ZETA_CACHE_FORMAT = 'filament-zeta-zeros'
+ZETA_CACHE_VERSION = 1
+METADATA_KEY = '__metadata__'
+
+# الدقة الافتراضية (خانات عشرية معنوية) - تكفي float64 بهامش
+DEFAULT_PRECISION = 20
+
+# عدد الأصفار في كل مهمة عند التوزيع على العمليات
+ZETA_CHUNK = 16
+
+# حفظ التقدم على القرص كل هذا العدد من الأصفار المحسوبة
+SAVE_EVERY = 1024
+
+# متغير البيئة لتحديد مجلد التخزين، والقيم "" أو "off" تعطل التخزين
+CACHE_ENV_VAR = 'FILAMENT_ZETA_CACHE'
+
+# أول 20 صفراً (20 خانة معنوية) - لا تحتاج mpmath؛ مولَّدة بـ _compute_chunk((1, 21, 20))
+# ومتحقق منها مقابل mpmath.zetazero بدقة 40 خانة
+KNOWN_ZETA_ZEROS = (
+    '14.134725141734693790', '21.022039638771554993', '25.010857580145688763',
+    '30.424876125859513210', '32.935061587739189691', '37.586178158825671257',
+    '40.918719012147495187', '43.327073280914999519', '48.005150881167159728',
+    '49.773832477672302182', '52.970321477714460644', '56.446247697063394804',
+    '59.347044002602353080', '60.831778524609809844', '65.112544048081606661',
+    '67.079810529494173714', '69.546401711173979253', '72.067157674481907583',
+    '75.704690699083933168', '77.144840068874805373',
+)
+KNOWN_PRECISION = 20
+
+
+def default_cache_dir() -> Optional[str]:
+    """المجلد الافتراضي لملفات الأصفار (None إذا كان التخزين معطلاً)"""
+    path = os.environ.get(CACHE_ENV_VAR)
+    if path is not None:
+        return None if path.strip().lower() in ('', 'off', '0') else path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'filament_theory')
+
+
+def cache_file(cache_dir: str, precision: int) -> str:
+    """ملف مستقل لكل دقة"""
+    return os.path.join(cache_dir, f'zeta-zeros-v{ZETA_CACHE_VERSION}-dps{precision}.npz')
+
+
+def read_zeta_cache(path: str, precision: int) -> List[str]:
+    """
+    قراءة الأصفار المخزنة كنصوص عشرية
+    Return the cached zeros as decimal strings ([] if absent, invalid or stale)
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data[METADATA_KEY]))
+            if (metadata.get('format') != ZETA_CACHE_FORMAT
+                    or metadata.get('version') != ZETA_CACHE_VERSION
+                    or metadata.get('precision') != precision):
+                return []
+            digits = data['digits'].tolist()
+    except (OSError, KeyError, ValueError):
+        return []
+    return digits[:metadata.get('count', len(digits))]
+
+
+def write_zeta_cache(path: str, precision: int, digits: List[str]) -> None:
+    """كتابة الملف كاملاً في ملف مؤقت ثم استبداله (لا يبقى ملف نصف مكتوب)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    metadata = {
+        'format': ZETA_CACHE_FORMAT,
+        'version': ZETA_CACHE_VERSION,
+        'precision': precision,
+        'count': len(digits),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, digits=np.array(digits, dtype=str),
+                 zeros=np.array(digits, dtype=np.float64),
+                 **{METADATA_KEY: np.array(json.dumps(metadata))})
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _compute_chunk(task) -> List[str]:
+    """حساب أصفار [start, stop) بدقة معينة (في عملية فرعية)"""
+    start, stop, precision = task
+    import mpmath
+    mpmath.mp.dps = precision + 5
+    return [mpmath.nstr(mpmath.zetazero(n).imag, precision, strip_zeros=False)
+            for n in range(start, stop)]
+
+
+def compute_zeta_zeros(start: int, stop: int, precision: int = DEFAULT_PRECISION,
+                       workers: Optional[int] = None) -> List[str]:
+    """
+    حساب الأصفار من رقم start حتى stop (بدون stop، الترقيم يبدأ من 1)
+    Compute zeros start..stop-1 with mpmath.zetazero across a process pool
+    """
+    tasks = [(n, min(n + ZETA_CHUNK, stop), precision) for n in range(start, stop, ZETA_CHUNK)]
+    if not tasks:
+        return []
+    if workers == 1 or len(tasks) == 1:
+        chunks = map(_compute_chunk, tasks)
+        return [zero for chunk in chunks for zero in chunk]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [zero for chunk in pool.map(_compute_chunk, tasks) for zero in chunk]
+
+
+class ZetaZeroDataset:
+    """أصفار زيتا بدقة معينة: مضمّنة ثم مخزنة ثم محسوبة عند الحاجة فقط"""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, cache_dir: Optional[str] = None,
+                 workers: Optional[int] = None):
+        self.precision = precision
+        self.workers = workers
+        self.path = cache_file(cache_dir, precision) if cache_dir else None
+        self.digits: List[str] = []
+        self._floats = np.empty(0, dtype=np.float64)
+
+        if self.path:
+            self.digits = read_zeta_cache(self.path, precision)
+        if not self.digits and precision <= KNOWN_PRECISION:
+            self.digits = [format(Decimal(z), f'.{precision}g') for z in KNOWN_ZETA_ZEROS]
+
+    def __len__(self) -> int:
+        return len(self.digits)
+
+    def ensure(self, count: int) -> None:
+        """
+        ضمان توفر أول count صفر
+        Compute (and persist) only the zeros beyond those already known
+        """
+        if count <= len(self.digits):
+            return
+        if self.path and fcntl is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(f'{self.path}.lock', 'w') as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                try:
+                    self._extend(count)
+                finally:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        else:
+            self._extend(count)
+
+    def _extend(self, count: int) -> None:
+        if self.path:
+            # عملية أخرى ربما حسبت أصفاراً أكثر أثناء الانتظار
+            cached = read_zeta_cache(self.path, self.precision)
+            if len(cached) > len(self.digits):
+                self.digits = cached
+
+        while len(self.digits) < count:
+            start = len(self.digits) + 1
+            stop = min(count, len(self.digits) + SAVE_EVERY) + 1
+            print(f"🧮 حساب أصفار زيتا {start:,}–{stop - 1:,} بدقة {self.precision} خانة...")
+            self.digits.extend(compute_zeta_zeros(start, stop, self.precision, self.workers))
+            if self.path:
+                try:
+                    write_zeta_cache(self.path, self.precision, self.digits)
+                except OSError as e:
+                    print(f"⚠️ تعذر حفظ أصفار زيتا في {self.path}: {e}")
+                    self.path = None
+
+    def zeros(self, count: int) -> np.ndarray:
+        """أول count صفر كمصفوفة float64"""
+        self.ensure(count)
+        if len(self._floats) < count:
+            self._floats = np.array(self.digits, dtype=np.float64)
+        return self._floats[:count]
+
+    def decimal_zeros(self, count: int) -> List[str]:
+        """أول count صفر كنصوص عشرية بالدقة الكاملة"""
+        self.ensure(count)
+        return self.digits[:count]
+
+
+_datasets: Dict[int, ZetaZeroDataset] = {}
+
+
+def get_zeta_dataset(precision: int = DEFAULT_PRECISION) -> ZetaZeroDataset:
+    """مجموعة الأصفار المشتركة على مستوى العملية لدقة معينة"""
+    if precision not in _datasets:
+        _datasets[precision] = ZetaZeroDataset(precision, cache_dir=default_cache_dir())
+    return _datasets[precision]
+
+
+def first_zeta_zeros(count: int, precision: int = DEFAULT_PRECISION) -> List[float]:
+    """أول count صفر لزيتا ريمان (الأجزاء التخيلية) كقائمة أعداد عشرية"""
+    return get_zeta_dataset(precision).zeros(count).tolist()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute Riemann zeta zeros into the on-disk cache")
+    parser.add_argument('count', type=int, help='number of zeros to make available')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help=f'significant decimal digits (default {DEFAULT_PRECISION})')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes for mpmath.zetazero (default: CPU count)')
+    args = parser.parse_args()
+
+    dataset = get_zeta_dataset(args.precision)
+    dataset.workers = args.workers
+    start = time.time()
+    dataset.ensure(args.count)
+    print(f"✅ {len(dataset):,} صفر متاح بدقة {args.precision} خانة ({time.time() - start:.1f} ثانية)")
+    if dataset.path:
+        print(f"💾 الملف: {dataset.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,11 +10,36 @@ Dr. Basel Yahya Abdullah - In collaboration with ChatGPT
 """
 
 import math
+from filament_core import law_plan
+from primality import is_prime
+from prime_search import next_prime, primes_in_window
+from property_cache import PropertyCache, get_property_cache
+
+# القيم المعروضة في الفحص اليدوي (اسم الحقل ← القانون)
+MANUAL_CHECK_LAWS = {
+    'balance_check': 'balance_check',
+    'balance_factor': 'balance_factor',
+    'calculated_frequency': 'prime_frequency',
+    'theoretical_frequency': 'theoretical_frequency',
+    'frequency_error': 'frequency_error',
+    'freq_valid': 'is_frequency_valid',
+    'temporal_dimension': 'temporal_dimension',
+    'spatial_radius': 'effective_radius',
+    'spherical_surface': 'spherical_surface_area',
+    'smoky_volume': 'smoky_volume',
+    'four_d_volume': 'four_d_volume',
+    'capacitive_root': 'capacitive_root',
+    'inductive_root': 'inductive_root',
+    'orthogonal_angle': 'orthogonal_angle',
+}
 
 class ManualFilamentCalculator:
     """حاسبة القوانين اليدوية مع شرح كل خطوة"""
     
-    def __init__(self):
+    def __init__(self, cache: PropertyCache = None):
+        # ذاكرة LRU مشتركة لقيم الفحص (الشرح يُطبع في كل مرة)
+        self.property_cache = cache if cache is not None else get_property_cache('manual_check')
+        
         # الثوابت الأساسية
         self.pi = math.pi  # 3.14159265359...
         self.e = math.e    # 2.71828182846...
@@ -22,6 +47,7 @@ class ManualFilamentCalculator:
         self.planck_constant = 6.62607015e-34  # J⋅s
         self.light_speed = 299792458  # m/s
         self.filament_mass = 5.867e-52  # kg
+        self.laws = law_plan(MANUAL_CHECK_LAWS, fundamental_frequency=self.fundamental_frequency)
         
         print("🌟 حاسبة القوانين اليدوية - نظرية الفتائل")
         print("=" * 60)
@@ -39,71 +65,75 @@ class ManualFilamentCalculator:
         print(f"سرعة الضوء c = {self.light_speed:,} m/s")
         print(f"كتلة الفتيلة m₀ = {self.filament_mass:.3e} kg")
     
+    def manual_check_values(self, p):
+        """قيم الفحص اليدوي للعدد p (من الذاكرة المؤقتة إن وُجدت)"""
+        return self.property_cache.get(p, self._compute_manual_check_values)
+    
+    def _compute_manual_check_values(self, p):
+        return self.laws.scalar(p)
+    
     def check_prime_step_by_step(self, p):
         """فحص العدد الأولي خطوة بخطوة"""
+        values = self.manual_check_values(p)
+        
         print(f"\n🔍 فحص العدد الأولي: {p}")
         print("=" * 50)
         
         # الخطوة 1: التوازن الفتائلي
         print("الخطوة 1: فحص التوازن الفتائلي")
-        print(f"   p + n = {p} + (-{p}) = {p + (-p)}")
-        balance_check = p + (-p)
-        if balance_check == 0:
+        print(f"   p + n = {p} + (-{p}) = {values['balance_check']}")
+        if values['balance_check'] == 0:
             print("   ✅ التوازن الفتائلي محقق")
-            balance_factor = 1.0
         else:
             print("   ❌ التوازن الفتائلي غير محقق")
-            balance_factor = 1.0 / (1.0 + abs(balance_check))
+        balance_factor = values['balance_factor']
         print(f"   معامل التوازن = {balance_factor:.6f}")
         
         # الخطوة 2: تردد الرنين
         print("\nالخطوة 2: حساب تردد الرنين")
-        calculated_freq = p / self.pi
+        calculated_freq = values['calculated_frequency']
         print(f"   f = p/π = {p}/{self.pi:.6f} = {calculated_freq:.6f} Hz")
         
         # الخطوة 3: التردد النظري
         print("\nالخطوة 3: حساب التردد النظري")
-        theoretical_freq = 4 * p * self.fundamental_frequency
+        theoretical_freq = values['theoretical_frequency']
         print(f"   f_theory = 4 × p × (1/(4π))")
         print(f"   f_theory = 4 × {p} × {self.fundamental_frequency:.6f}")
         print(f"   f_theory = {theoretical_freq:.6f} Hz")
         
         # الخطوة 4: مقارنة الترددات
         print("\nالخطوة 4: مقارنة الترددات")
-        freq_error = abs(calculated_freq - theoretical_freq) / calculated_freq * 100
+        freq_error = values['frequency_error']
         print(f"   الخطأ = |{calculated_freq:.6f} - {theoretical_freq:.6f}| / {calculated_freq:.6f} × 100")
         print(f"   الخطأ = {freq_error:.2e}%")
         
-        if freq_error < 1e-10:
+        freq_valid = values['freq_valid']
+        if freq_valid:
             print("   ✅ الترددات متطابقة (خطأ < 1e-10%)")
-            freq_valid = True
         else:
             print("   ❌ الترددات غير متطابقة")
-            freq_valid = False
         
         # الخطوة 5: الأبعاد الأربعة
         print("\nالخطوة 5: حساب الأبعاد الأربعة")
-        temporal_dimension = p
-        spatial_radius = 1.0
-        spherical_surface = 4 * self.pi * (spatial_radius ** 2)
-        smoky_volume = (4/3) * self.pi * (spatial_radius ** 3)
-        four_d_volume = smoky_volume * temporal_dimension
+        temporal_dimension = values['temporal_dimension']
+        spatial_radius = values['spatial_radius']
+        smoky_volume = values['smoky_volume']
+        four_d_volume = values['four_d_volume']
         
         print(f"   البعد الزمني = {temporal_dimension}")
         print(f"   نصف القطر المكاني = {spatial_radius} وحدة")
-        print(f"   مساحة السطح = 4π × {spatial_radius}² = {spherical_surface:.6f}")
+        print(f"   مساحة السطح = 4π × {spatial_radius}² = {values['spherical_surface']:.6f}")
         print(f"   حجم الحالة الدخانية = (4/3)π × {spatial_radius}³ = {smoky_volume:.6f}")
         print(f"   الحجم رباعي الأبعاد = {smoky_volume:.6f} × {temporal_dimension} = {four_d_volume:.6f}")
         
         # الخطوة 6: الجذور المتعامدة
         print("\nالخطوة 6: حساب الجذور المتعامدة")
-        capacitive_root = math.sqrt(p)
-        inductive_root = math.sqrt(p)
-        orthogonal_angle = 90.0
+        capacitive_root = values['capacitive_root']
+        inductive_root = values['inductive_root']
         
         print(f"   الجذر السعوي = √{p} = {capacitive_root:.6f}")
         print(f"   الجذر الحثي = √{p} = {inductive_root:.6f}")
-        print(f"   زاوية التعامد = {orthogonal_angle}°")
+        print(f"   زاوية التعامد = {values['orthogonal_angle']}°")
         print(f"   التحقق: {capacitive_root:.6f} × {inductive_root:.6f} = {capacitive_root * inductive_root:.6f}")
         
         # النتيجة النهائية
@@ -149,21 +179,10 @@ class ManualFilamentCalculator:
         
         # الخطوة 3: البحث عن أول عدد أولي
         print("\nالخطوة 3: البحث عن أول عدد أولي")
-        candidates = []
-        for candidate in range(search_start, search_end + 1):
-            if self.is_prime(candidate):
-                candidates.append(candidate)
-                if len(candidates) == 1:  # أول عدد أولي
-                    predicted = candidate
-                    break
-        
-        if candidates:
-            print(f"   أول عدد أولي موجود: {predicted}")
-            print(f"   الفجوة الفعلية: {predicted - current_prime}")
-        else:
-            predicted = current_prime + int(estimated_gap)
-            print(f"   لم يوجد عدد أولي في النطاق!")
-            print(f"   استخدام التقدير: {predicted}")
+        predicted = next_prime(current_prime)
+        candidates = primes_in_window(search_start, max(search_end, predicted))
+        print(f"   أول عدد أولي موجود: {predicted}")
+        print(f"   الفجوة الفعلية: {predicted - current_prime}")
         
         # الخطوة 4: التحقق من نظرية الفتائل
         print("\nالخطوة 4: التحقق من نظرية الفتائل للعدد المتوقع")
@@ -201,17 +220,8 @@ class ManualFilamentCalculator:
         }
     
     def is_prime(self, n):
-        """فحص الأولية"""
-        if n < 2:
-            return False
-        if n == 2:
-            return True
-        if n % 2 == 0:
-            return False
-        for i in range(3, int(math.sqrt(n)) + 1, 2):
-            if n % i == 0:
-                return False
-        return True
+        """فحص الأولية (ميلر-رابين الحتمي / BPSW)"""
+        return is_prime(n)
     
     def interactive_menu(self):
         """القائمة التفاعلية"""